@@ -0,0 +1,89 @@
+# intent_matcher_bench.py — 의도 분석 키워드 매칭 비용: 키워드마다 `in` 검사 vs 컴파일된 자동자(keyword_matcher)
+# 사전 크기를 늘려도 자동자의 질의당 비용이 거의 일정한지 확인
+#   python benchmarks/intent_matcher_bench.py [--sizes 100,1000,5000,20000] [--max-growth 3]
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from keyword_matcher import KeywordMatcher  # noqa: E402
+import region_registry  # noqa: E402
+
+QUERIES = [
+    "강릉시 IT 일자리와 아파트 매물, 정책 알려줘",
+    "영월군 의료 분야 채용공고와 실거래가 보여줘",
+    "강원 고성 정규직 개발 일자리",
+    "서울 중구 청년 인턴 모집",
+    "충남 예산군 주거 지원 정책",
+    "김제시 아파트 실거래가만 보여줘",
+]
+
+
+def synthetic_keywords(count: int, seed: int = 7):
+    """한글 2~4글자 임의 키워드 (실제 사전보다 접두가 덜 겹쳐 자동자에 불리한 쪽)."""
+    rng = random.Random(seed)
+    words = set()
+    while len(words) < count:
+        words.add("".join(chr(rng.randint(0xAC00, 0xD7A3)) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+
+class _KeywordList(list):
+    """add_aliases가 넣는 별칭을 그냥 목록으로 모음 (기존 방식 비교용)."""
+
+    def add(self, keyword, payload):
+        self.append(keyword)
+
+
+def per_query_us(fn, texts, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for text in texts:
+            fn(text)
+    return (time.perf_counter() - start) / (rounds * len(texts)) * 1e6
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="의도 분석 키워드 매칭 벤치마크")
+    parser.add_argument("--sizes", default="100,1000,5000,20000", help="추가 키워드 수 (쉼표 구분)")
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--max-growth", type=float, default=0.0,
+                        help="0보다 크면, 가장 큰 사전의 자동자 질의 비용이 가장 작은 사전의 이 배수를 넘을 때 실패(종료 코드 1)")
+    args = parser.parse_args()
+
+    registry = region_registry.get_registry()
+    texts = [region_registry.normalize(q) for q in QUERIES]
+    print(f"지역 별칭 포함, 질의 {len(texts)}개 × {args.rounds}회")
+    print(f"{'추가 키워드':>10} {'사전 크기':>10} {'in 검사(µs)':>12} {'자동자(µs)':>12} {'컴파일(ms)':>11}")
+
+    compiled_costs = []
+    for size in (int(s) for s in args.sizes.split(",") if s.strip()):
+        matcher = KeywordMatcher()
+        registry.add_aliases(matcher)
+        vocabulary = synthetic_keywords(size)
+        matcher.add_many(vocabulary, ("extra", None))
+        started = time.perf_counter()
+        matcher.compile()
+        compile_ms = (time.perf_counter() - started) * 1000
+
+        # 기존 방식: 키워드마다 부분 문자열 검사
+        all_keywords = _KeywordList(vocabulary)
+        registry.add_aliases(all_keywords)
+        naive = per_query_us(lambda t: [k for k in all_keywords if k in t], texts, max(1, args.rounds // 10))
+        compiled = per_query_us(matcher.find_all, texts, args.rounds)
+        compiled_costs.append(compiled)
+        print(f"{size:>10} {len(matcher):>10} {naive:>12.1f} {compiled:>12.1f} {compile_ms:>11.1f}")
+
+    if args.max_growth > 0 and len(compiled_costs) > 1:
+        growth = compiled_costs[-1] / compiled_costs[0]
+        print(f"자동자 비용 증가: {growth:.2f}배 (허용 {args.max_growth}배)")
+        if growth > args.max_growth:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
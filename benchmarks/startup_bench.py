@@ -0,0 +1,103 @@
+# startup_bench.py — 모듈별 import 시간(python -X importtime)과 프로세스 기동 시간을 재고 예산을 넘으면 실패
+# CLI·컨테이너 콜드 스타트가 느려지는 변경(무거운 의존성을 모듈 최상단에서 import 등)을 잡기 위함
+#   python benchmarks/startup_bench.py [--modules final_chatbot,server] [--budget final_chatbot=300,server=2000]
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+DEFAULT_MODULES = "final_chatbot,enhanced_orchestrator,server,realestate_server,youth_policy_server"
+# 모듈별 기본 import 예산(ms). 채팅 진입점·오케스트레이터는 mcp·httpx·numpy 없이 떠야 하고,
+# 서버는 FastMCP(mcp·pydantic) import가 대부분. --budget으로 모듈별로 덮어씀
+DEFAULT_BUDGET = {
+    "final_chatbot": 250.0,
+    "enhanced_orchestrator": 250.0,
+    "server": 1500.0,
+    "realestate_server": 1500.0,
+    "youth_policy_server": 1500.0,
+}
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)\s*$")
+
+
+def run_importtime(module: str) -> Tuple[float, List[Tuple[int, str, int, int]]]:
+    """새 인터프리터에서 module을 import. 반환: (프로세스 전체 ms, [(깊이, 이름, self µs, 누적 µs)])"""
+    env = dict(os.environ, PYTHONPATH=SRC + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=SRC, env=env, capture_output=True, text=True,
+    )
+    wall_ms = (time.perf_counter() - started) * 1000
+    if proc.returncode != 0:
+        raise RuntimeError(f"{module} import 실패:\n{proc.stderr[-2000:]}")
+    rows = []
+    for line in proc.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            rows.append((len(indent) // 2, name, int(self_us), int(cumulative_us)))
+    return wall_ms, rows
+
+
+def heaviest_packages(rows: List[Tuple[int, str, int, int]], top: int) -> List[Tuple[str, float]]:
+    """최상위 패키지별 self 시간 합계 (ms, 큰 순)."""
+    totals: Dict[str, int] = {}
+    for _, name, self_us, _ in rows:
+        package = name.split(".", 1)[0]
+        totals[package] = totals.get(package, 0) + self_us
+    return [(name, us / 1000) for name, us in sorted(totals.items(), key=lambda kv: -kv[1])[:top]]
+
+
+def parse_budget(text: str) -> Dict[str, float]:
+    budget = {}
+    for part in (p.strip() for p in text.split(",") if p.strip()):
+        module, _, ms = part.partition("=")
+        budget[module.strip()] = float(ms)
+    return budget
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="모듈 import·기동 시간 벤치마크")
+    parser.add_argument("--modules", default=DEFAULT_MODULES, help="잴 모듈 (쉼표 구분)")
+    parser.add_argument("--rounds", type=int, default=5, help="모듈마다 새 프로세스로 잴 횟수 (중앙값 사용)")
+    parser.add_argument("--top", type=int, default=5, help="모듈마다 보여 줄 무거운 패키지 수")
+    parser.add_argument("--budget", default="",
+                        help="모듈=ms 목록 (기본 예산 DEFAULT_BUDGET을 모듈별로 덮어씀, 0이면 그 모듈은 검사 안 함). "
+                             "import 시간 중앙값이 예산을 넘으면 실패(종료 코드 1)")
+    args = parser.parse_args()
+
+    budget = {**DEFAULT_BUDGET, **parse_budget(args.budget)}
+    baseline = statistics.median(run_importtime("sys")[0] for _ in range(args.rounds))
+    print(f"인터프리터 기동 {baseline:.0f}ms (빈 import 기준), 모듈마다 {args.rounds}회 중앙값")
+    print(f"{'모듈':<24} {'import(ms)':>10} {'기동(ms)':>9} {'예산(ms)':>9}  무거운 패키지(self ms)")
+
+    over = []
+    for module in (m.strip() for m in args.modules.split(",") if m.strip()):
+        walls, imports, last_rows = [], [], []
+        for _ in range(args.rounds):
+            wall_ms, rows = run_importtime(module)
+            walls.append(wall_ms)
+            imports.append(next((cum for depth, name, _, cum in rows if depth == 0 and name == module), 0) / 1000)
+            last_rows = rows
+        import_ms = statistics.median(imports)
+        limit = budget.get(module)
+        heavy = ", ".join(f"{name} {ms:.0f}" for name, ms in heaviest_packages(last_rows, args.top))
+        print(f"{module:<24} {import_ms:>10.0f} {statistics.median(walls):>9.0f} "
+              f"{(f'{limit:.0f}' if limit else '-'):>9}  {heavy}")
+        if limit and import_ms > limit:
+            over.append(f"{module} {import_ms:.0f}ms > {limit:.0f}ms")
+
+    if over:
+        print("예산 초과: " + "; ".join(over))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+# deadline.py — 사용자 질의 하나에 주어진 전체 시간 예산을 하위 호출까지 전달
+# (contextvar로 전달하므로 오케스트레이터 → 서버 함수 → HTTP 전송 계층 시그니처를 바꾸지 않아도 됨)
+import contextlib
+import contextvars
+import os
+import time
+from typing import Any, Dict, Iterator, Mapping, Optional
+
+QUERY_BUDGET = float(os.getenv("QUERY_BUDGET_SEC") or 30)
+# MCP 요청 _meta에 남은 시간(초)을 실어 보내는 키 (워커 프로세스의 하위 호출도 같은 데드라인으로 자름)
+META_KEY = "deadlineSec"
+
+
+class DeadlineExceeded(Exception):
+    """질의 시간 예산을 다 써서 하위 호출을 더 진행하지 않음."""
+
+
+class Deadline:
+    """monotonic 기준 만료 시각. 하위 호출은 remaining()만큼만 기다림."""
+
+    def __init__(self, seconds: float = QUERY_BUDGET):
+        self.budget = seconds
+        self.expires_at = time.monotonic() + seconds
+        self.cancelled = False
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def check(self, what: str = "") -> float:
+        """남은 시간(초). 이미 지났으면 DeadlineExceeded."""
+        remaining = self.remaining()
+        if remaining <= 0:
+            suffix = f" ({what})" if what else ""
+            if self.cancelled:
+                raise DeadlineExceeded(f"취소된 질의입니다{suffix}")
+            raise DeadlineExceeded(f"질의 시간 예산 {self.budget:.0f}초를 초과했습니다{suffix}")
+        return remaining
+
+    def cap(self, seconds: float) -> float:
+        """seconds와 남은 시간 중 짧은 쪽."""
+        return min(seconds, self.remaining())
+
+    def cancel(self) -> None:
+        """
+        바로 만료시킴. 작업 스레드에서 도는 하위 호출은 asyncio 작업 취소로 멈추지 않으므로,
+        이 데드라인을 보는 쪽(페이지 순회, 재시도, 키 대기 등)이 다음 확인 때 스스로 멈추게 함.
+        """
+        self.cancelled = True
+        self.expires_at = time.monotonic()
+
+
+_current: "contextvars.ContextVar[Optional[Deadline]]" = contextvars.ContextVar("deadline", default=None)
+
+
+def current() -> Optional[Deadline]:
+    return _current.get()
+
+
+def remaining(default: Optional[float] = None) -> Optional[float]:
+    """현재 컨텍스트의 남은 시간. 데드라인이 없으면 default."""
+    dl = _current.get()
+    return default if dl is None else dl.remaining()
+
+
+def check(what: str = "") -> None:
+    dl = _current.get()
+    if dl is not None:
+        dl.check(what)
+
+
+@contextlib.contextmanager
+def scope(dl: Optional[Deadline]) -> Iterator[Optional[Deadline]]:
+    """with 블록 안의 호출(같은 스레드·태스크)에 dl을 적용. None이면 기존 값 유지."""
+    if dl is None:
+        yield _current.get()
+        return
+    token = _current.set(dl)
+    try:
+        yield dl
+    finally:
+        _current.reset(token)
+
+
+def to_meta(seconds: float) -> Dict[str, Any]:
+    """남은 시간을 MCP 요청 _meta로."""
+    return {META_KEY: round(max(0.0, seconds), 3)}
+
+
+def from_meta(meta: Optional[Mapping[str, Any]]) -> Optional[Deadline]:
+    """MCP 요청 _meta의 남은 시간 → 이 프로세스의 Deadline. 없거나 형식이 틀리면 None."""
+    try:
+        seconds = float((meta or {})[META_KEY])
+    except (KeyError, TypeError, ValueError):
+        return None
+    return Deadline(seconds)
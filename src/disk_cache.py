@@ -0,0 +1,152 @@
+# disk_cache.py — 응답 캐시의 선택적 디스크 계층 (SQLite WAL, 여러 서버 프로세스가 공유)
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES") or 256 * 1024 * 1024)
+# 크기 검사는 쓰기 N번마다 한 번만 (매번 SUM을 돌리지 않도록)
+EVICT_CHECK_EVERY = 64
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key         TEXT PRIMARY KEY,
+    value       BLOB NOT NULL,
+    expires_at  REAL,
+    size        INTEGER NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries(accessed_at);
+CREATE INDEX IF NOT EXISTS idx_entries_expires ON entries(expires_at);
+"""
+
+
+class DiskCache:
+    """
+    요청 지문 → zlib 압축 JSON을 저장하는 SQLite 캐시.
+    WAL 모드 + busy_timeout으로 세 서버 프로세스가 같은 파일을 동시에 읽고 쓸 수 있음.
+    전체 크기가 max_bytes를 넘으면 가장 오래 안 쓰인 항목부터 지움.
+    """
+
+    def __init__(self, path: str, max_bytes: int = MAX_BYTES):
+        self.path = os.path.expanduser(path)
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._writes = 0
+        self._lock = threading.Lock()
+        self.evictions = 0
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn().executescript(_SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        # sqlite3 연결은 스레드 간 공유하지 않고 스레드마다 하나씩
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _encode(value: Dict[str, Any]) -> bytes:
+        return zlib.compress(json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+    @staticmethod
+    def _decode(blob: bytes) -> Dict[str, Any]:
+        return json.loads(zlib.decompress(blob).decode("utf-8"))
+
+    def get(self, key: str) -> Optional[Tuple[Optional[float], Dict[str, Any]]]:
+        """(expires_at, value) 반환. 없거나 만료됐으면 None."""
+        now = time.time()
+        conn = self._conn()
+        row = conn.execute("SELECT value, expires_at FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        blob, expires_at = row
+        if expires_at is not None and expires_at <= now:
+            conn.execute("DELETE FROM entries WHERE key = ? AND expires_at <= ?", (key, now))
+            return None
+        conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+        try:
+            return expires_at, self._decode(blob)
+        except Exception:
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            return None
+
+    def set(self, key: str, value: Dict[str, Any], expires_at: Optional[float]) -> None:
+        blob = self._encode(value)
+        self._conn().execute(
+            "INSERT OR REPLACE INTO entries (key, value, expires_at, size, accessed_at) VALUES (?, ?, ?, ?, ?)",
+            (key, blob, expires_at, len(blob), time.time()),
+        )
+        with self._lock:
+            self._writes += 1
+            check = self._writes % EVICT_CHECK_EVERY == 0
+        if check:
+            self.evict()
+
+    def delete(self, key: str) -> None:
+        self._conn().execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def total_bytes(self) -> int:
+        return self._conn().execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def evict(self) -> int:
+        """만료 항목을 지우고, 그래도 크기 상한을 넘으면 LRU 순으로 90%까지 줄임."""
+        conn = self._conn()
+        removed = 0
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            removed += conn.execute(
+                "DELETE FROM entries WHERE expires_at IS NOT NULL AND expires_at <= ?", (time.time(),)
+            ).rowcount
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            if total > self.max_bytes:
+                target = int(self.max_bytes * 0.9)
+                victims = []
+                for key, size in conn.execute("SELECT key, size FROM entries ORDER BY accessed_at"):
+                    if total <= target:
+                        break
+                    victims.append((key,))
+                    total -= size
+                conn.executemany("DELETE FROM entries WHERE key = ?", victims)
+                removed += len(victims)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        with self._lock:
+            self.evictions += removed
+        return removed
+
+    def recent(self, limit: int) -> Iterator[Tuple[str, Optional[float], Dict[str, Any]]]:
+        """만료되지 않은 항목을 최근 사용 순으로 (key, expires_at, value) 반환 — 웜 스타트용."""
+        rows = self._conn().execute(
+            "SELECT key, expires_at, value FROM entries "
+            "WHERE expires_at IS NULL OR expires_at > ? ORDER BY accessed_at DESC LIMIT ?",
+            (time.time(), limit),
+        ).fetchall()
+        for key, expires_at, blob in rows:
+            try:
+                yield key, expires_at, self._decode(blob)
+            except Exception:
+                continue
+
+    def stats(self) -> Dict[str, Any]:
+        count, total = self._conn().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()
+        return {
+            "path": self.path,
+            "entries": count,
+            "bytes": total,
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions,
+        }
@@ -1,288 +1,532 @@
 # enhanced_orchestrator.py — 청소년정책 포함 확장 오케스트레이터
 import asyncio
+import contextvars
+import functools
+import importlib
+import inspect
 import json
-from typing import Dict, Any, Optional
+import os
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from datetime import date
+from typing import Callable, Dict, Any, List, Optional, Tuple, Union
 
-# 서버 모듈 직접 import
-import server
-import realestate_server
-import youth_policy_server
+from deadline import Deadline, DeadlineExceeded, scope as deadline_scope
+
+# 오케스트레이터 서버 이름 → 서버 모듈. 모듈은 그 서버를 처음 쓸 때 import함
+# (서버 모듈마다 mcp·httpx를 읽고 FastMCP를 만들므로, 부동산만 묻는 사용자는 부동산 서버 비용만 냄)
+SERVER_MODULES = {
+    'recruitment': 'server',
+    'realestate': 'realestate_server',
+    'youth_policy': 'youth_policy_server',
+}
+
+
+# inprocess: 서버 모듈 함수를 이 프로세스에서 직접 호출 / workers: 서버마다 MCP stdio 워커 프로세스를 띄워 호출
+ORCHESTRATOR_MODE = (os.getenv("ORCHESTRATOR_MODE") or "inprocess").strip().lower()
+MODES = ("inprocess", "workers")
+
+# 종합 분석에서 동시에 실행할 하위 조회 수와 조회 하나의 시간 상한(초, 질의 전체 예산보다 길게 잡히지는 않음)
+FANOUT_WORKERS = int(os.getenv("ORCHESTRATOR_FANOUT_WORKERS") or 4)
+CALL_TIMEOUT = float(os.getenv("ORCHESTRATOR_CALL_TIMEOUT") or 15)
+# 하위 조회가 자기 데드라인을 보고 스스로 끝날 때까지 더 기다려 주는 시간
+FANOUT_GRACE = 1.0
+
+# 한도 소진 여부를 볼 때 쓰는 부동산 서버의 상위 엔드포인트 이름
+# (workers 모드에서도 서버 모듈을 이 프로세스에 읽어 오지 않도록 값만 둠)
+APT_TRADE_ENDPOINT = "getRTMSDataSvcAptTrade"
+
+# (call_*_tool 메서드, 도구 이름, 인자) 또는 미리 정해진 결과(한도 소진으로 건너뜀 등)
+SubQuery = Union[Tuple[Callable[..., Dict[str, Any]], str, Dict[str, Any]], Dict[str, Any]]
+
+# call_many의 호출 하나: {'server', 'tool', 'arguments'} 또는 (server, tool, arguments)
+ToolCall = Union[Dict[str, Any], Tuple[Optional[str], str, Optional[Dict[str, Any]]]]
+
+_fanout_pool: Optional[ThreadPoolExecutor] = None
+_fanout_lock = threading.Lock()
+
+
+def _fanout_executor() -> ThreadPoolExecutor:
+    global _fanout_pool
+    if _fanout_pool is None:
+        with _fanout_lock:
+            if _fanout_pool is None:
+                _fanout_pool = ThreadPoolExecutor(max_workers=max(1, FANOUT_WORKERS), thread_name_prefix="fanout")
+    return _fanout_pool
+
+
+def call_key(server_name: Optional[str], tool_name: str, arguments: Optional[Dict[str, Any]]) -> str:
+    """같은 서버·도구·인자면 같은 문자열 (인자 키 순서 무관). 배치 중복 제거와 미리 받아 두기에 씀"""
+    return json.dumps([server_name, tool_name, arguments or {}], sort_keys=True, ensure_ascii=False, default=str)
+
+
+def _timeout_result(tool_name: str, sub_deadline: Deadline) -> Dict[str, Any]:
+    return {
+        "status": "timeout",
+        "tool": tool_name,
+        "message": f"{sub_deadline.budget:.0f}초 안에 끝나지 않아 결과에서 제외했습니다"
+    }
+
+
+class _SubCall:
+    """
+    팬아웃 풀에 넣은 하위 조회 하나. 시간 상한(call_timeout)은 작업 스레드가 집어 든 때부터 잼
+    (풀이 차서 앞선 조회를 기다린 시간까지 빼면 뒤에 넣은 조회일수록 실제로 쓸 수 있는 시간이 줄어듦).
+    """
+
+    def __init__(self, method: Callable[..., Dict[str, Any]], tool_name: str, arguments: Dict[str, Any],
+                 deadline: Optional[Deadline], call_timeout: float):
+        self.method = method
+        self.tool_name = tool_name
+        self.arguments = arguments
+        self.deadline = deadline
+        self.call_timeout = call_timeout
+        self.started = threading.Event()
+        self.sub_deadline: Optional[Deadline] = None
+
+    def run(self) -> Dict[str, Any]:
+        self.sub_deadline = Deadline(self.call_timeout if self.deadline is None else self.deadline.cap(self.call_timeout))
+        self.started.set()
+        return self.method(self.tool_name, self.arguments, self.sub_deadline)
+
+    def wait(self, future) -> Dict[str, Any]:
+        """결과를 기다림. 질의 전체 남은 시간(없으면 call_timeout) 안에 시작하지도 못하면 timeout"""
+        if not self.started.wait(self.call_timeout if self.deadline is None else self.deadline.remaining()):
+            future.cancel()
+            return {
+                "status": "timeout",
+                "tool": self.tool_name,
+                "message": "다른 조회가 끝나기를 기다리다 시간 예산을 넘겨 결과에서 제외했습니다"
+            }
+        try:
+            return future.result(timeout=self.sub_deadline.remaining() + FANOUT_GRACE)
+        except FutureTimeout:
+            return _timeout_result(self.tool_name, self.sub_deadline)
+        except Exception as e:
+            return {"status": "error", "tool": self.tool_name, "message": str(e)}
+
+
+class ToolEntry:
+    """디스패치 표의 도구 하나. 동기 함수가 있으면 그것을, 없으면 비동기 도구를 이 스레드의 이벤트 루프로 실행."""
+
+    __slots__ = ("fn", "is_async", "description")
+
+    def __init__(self, fn: Callable[..., Any], is_async: bool, description: str):
+        self.fn = fn
+        self.is_async = is_async
+        self.description = description
+
+    def __call__(self, **arguments):
+        if self.is_async:
+            return asyncio.run(self.fn(**arguments))
+        return self.fn(**arguments)
+
+
+def build_dispatch(module) -> Dict[str, ToolEntry]:
+    """
+    서버 모듈이 mcp_common으로 mcp에 등록한 도구(등록한 이름) → ToolEntry.
+    mcp_common으로 만든 비동기 도구는 짝인 동기 버전(sync_twin)을 씀 (이미 작업 스레드에서 호출되므로).
+    """
+    import mcp_common  # 서버 모듈을 읽은 뒤에만 부르므로 이미 로드돼 있음
+    dispatch: Dict[str, ToolEntry] = {}
+    for tool_name, tool_fn in mcp_common.registered_tools(module.mcp).items():
+        twin = getattr(tool_fn, "sync_twin", None)
+        if twin is not None:
+            fn, is_async = twin, False
+        else:
+            fn, is_async = tool_fn, asyncio.iscoroutinefunction(tool_fn)
+        lines = (inspect.getdoc(tool_fn) or "").strip().splitlines()
+        dispatch[tool_name] = ToolEntry(fn, is_async, lines[0].strip() if lines else tool_name)
+    return dispatch
+
+
+def _call_remote(pool, server_name: str, tool_name: str, /, **arguments):
+    return pool.call(server_name, tool_name, arguments)
+
+
+def build_remote_dispatch(pool, server_name: str) -> Dict[str, ToolEntry]:
+    """워커 풀이 알려 준 서버 도구 목록 → 워커로 호출을 보내는 ToolEntry."""
+    dispatch: Dict[str, ToolEntry] = {}
+    for tool_name, description in pool.list_tools(server_name):
+        lines = description.strip().splitlines()
+        dispatch[tool_name] = ToolEntry(
+            functools.partial(_call_remote, pool, server_name, tool_name),
+            False,
+            lines[0].strip() if lines else tool_name
+        )
+    return dispatch
+
+
+def recent_months(count: int, today: Optional[date] = None) -> list:
+    """이번 달을 포함한 최근 count개월의 YYYYMM 목록 (오래된 순)"""
+    today = today or date.today()
+    year, month = today.year, today.month
+    months = []
+    for _ in range(count):
+        months.append(f"{year:04d}{month:02d}")
+        year, month = (year - 1, 12) if month == 1 else (year, month - 1)
+    return months[::-1]
 
 
 class EnhancedOrchestrator:
     """채용정보 + 부동산 + 청소년정책을 통합하는 확장된 오케스트레이터"""
     
-    def __init__(self):
-        self.recruitment_server = server
-        self.realestate_server = realestate_server
-        self.youth_policy_server = youth_policy_server
+    def __init__(self, mode: Optional[str] = None, workers: Optional[int] = None):
+        """
+        mode: 'inprocess'(기본) 또는 'workers' (없으면 ORCHESTRATOR_MODE).
+        workers 모드에서는 서버마다 워커 프로세스 workers개(없으면 MCP_WORKERS_PER_SERVER)를 띄워 여러 코어에서 처리.
+        """
+        self.mode = (mode or ORCHESTRATOR_MODE).strip().lower()
+        if self.mode not in MODES:
+            raise ValueError(f"알 수 없는 오케스트레이터 모드: {self.mode} ({', '.join(MODES)} 중 하나)")
+        self.servers = tuple(SERVER_MODULES)
+        self.workers = workers
+        self._worker_pool = None
+        # 서버 이름 → 디스패치 표 (그 서버를 처음 호출할 때 생성)
+        self._tools: Dict[str, Dict[str, ToolEntry]] = {}
+        self._tools_lock = threading.Lock()
+        self._tool_servers: Optional[Dict[str, str]] = None
+    
+    def server_module(self, server_name: str):
+        """서버 모듈 (처음 접근할 때 import)"""
+        return importlib.import_module(SERVER_MODULES[server_name])
+    
+    @property
+    def recruitment_server(self):
+        return self.server_module('recruitment')
+    
+    @property
+    def realestate_server(self):
+        return self.server_module('realestate')
+    
+    @property
+    def youth_policy_server(self):
+        return self.server_module('youth_policy')
+    
+    @property
+    def worker_pool(self):
+        """workers 모드의 워커 풀 (첫 호출 때 워커 프로세스를 띄움). inprocess 모드면 None"""
+        if self.mode != 'workers':
+            return None
+        if self._worker_pool is None:
+            import mcp_worker_pool  # workers 모드에서만 mcp 클라이언트를 읽음
+            self._worker_pool = mcp_worker_pool.get_pool(self.workers)
+        return self._worker_pool
+    
+    def dispatch(self, server_name: Optional[str]) -> Dict[str, ToolEntry]:
+        """서버의 도구 이름 → ToolEntry (처음 쓸 때 서버 모듈 또는 워커의 도구 등록부에서 만듦). 모르는 서버면 빈 표"""
+        tools = self._tools.get(server_name)
+        if tools is None and server_name in SERVER_MODULES:
+            with self._tools_lock:
+                tools = self._tools.get(server_name)
+                if tools is None:
+                    if self.mode == 'workers':
+                        tools = build_remote_dispatch(self.worker_pool, server_name)
+                    else:
+                        tools = build_dispatch(self.server_module(server_name))
+                    self._tools[server_name] = tools
+        return tools or {}
+    
+    @property
+    def tools(self) -> Dict[str, Dict[str, ToolEntry]]:
+        """모든 서버의 디스패치 표 (아직 읽지 않은 서버도 모두 읽음)"""
+        return {server_name: self.dispatch(server_name) for server_name in self.servers}
+    
+    @property
+    def tool_servers(self) -> Dict[str, str]:
+        """한 서버에만 있는 도구 → 서버 이름. 서버 이름 없이 호출할 때 씀 (ping처럼 여러 서버에 있는 도구는 제외)"""
+        if self._tool_servers is None:
+            owners: Dict[str, list] = {}
+            for server_name, tools in self.tools.items():
+                for tool_name in tools:
+                    owners.setdefault(tool_name, []).append(server_name)
+            self._tool_servers = {tool_name: names[0] for tool_name, names in owners.items() if len(names) == 1}
+        return self._tool_servers
     
     def get_available_tools(self) -> Dict[str, list]:
-        """사용 가능한 모든 도구 목록"""
+        """사용 가능한 모든 도구 목록 (각 서버의 FastMCP 도구 등록부에서 생성)"""
         return {
-            'recruitment': [
-                {'name': 'listRecruitments', 'description': '공공기관 채용정보 목록 조회'},
-                {'name': 'getRecruitmentDetail', 'description': '채용정보 상세 조회'},
-                {'name': 'ping', 'description': '헬스체크'}
-            ],
-            'realestate': [
-                {'name': 'getApartmentTrades', 'description': '아파트 실거래가 조회'},
-                {'name': 'getOfficeTrades', 'description': '오피스텔 실거래가 조회'},
-                {'name': 'getHouseTrades', 'description': '단독/다가구 실거래가 조회'},
-                {'name': 'ping', 'description': '헬스체크'}
-            ],
-            'youth_policy': [
-                {'name': 'searchYouthPolicies', 'description': '청소년정책 검색'},
-                {'name': 'getYouthPolicyDetail', 'description': '청소년정책 상세 조회'},
-                {'name': 'searchPoliciesByRegion', 'description': '지역별 청소년정책 검색'},
-                {'name': 'searchPoliciesByKeywords', 'description': '키워드 기반 청소년정책 검색'},
-                {'name': 'ping', 'description': '헬스체크'}
-            ]
+            server_name: [{'name': tool_name, 'description': entry.description} for tool_name, entry in tools.items()]
+            for server_name, tools in self.tools.items()
         }
     
-    def call_recruitment_tool(self, tool_name: str, arguments: Dict[str, Any]):
-        """채용정보 서버 도구 호출"""
-        try:
-            if tool_name == 'listRecruitments':
-                return {
-                    "status": "success",
-                    "server": "recruitment",
-                    "tool": tool_name,
-                    "result": self.recruitment_server.listRecruitments(**arguments)
-                }
-            elif tool_name == 'getRecruitmentDetail':
-                return {
-                    "status": "success", 
-                    "server": "recruitment",
-                    "tool": tool_name,
-                    "result": self.recruitment_server.getRecruitmentDetail(**arguments)
-                }
-            elif tool_name == 'ping':
-                return {
-                    "status": "success",
-                    "server": "recruitment", 
-                    "tool": tool_name,
-                    "result": self.recruitment_server.ping()
-                }
-            else:
-                return {
-                    "status": "error",
-                    "server": "recruitment",
-                    "tool": tool_name,
-                    "message": f"알 수 없는 도구: {tool_name}"
-                }
-        except Exception as e:
+    def call_tool(self, server_name: str, tool_name: str, arguments: Optional[Dict[str, Any]] = None,
+                  deadline: Optional[Deadline] = None) -> Dict[str, Any]:
+        """서버 도구 호출 (server_name이 None이면 도구 이름으로 서버를 찾음)"""
+        arguments = arguments or {}
+        server_name = server_name or self.tool_servers.get(tool_name)
+        if deadline is not None:
+            return self._call_with_deadline(
+                server_name, tool_name, arguments, deadline, functools.partial(self.call_tool, server_name)
+            )
+        entry = self.dispatch(server_name).get(tool_name)
+        if entry is None:
+            ambiguous = server_name is None and any(tool_name in tools for tools in self.tools.values())
             return {
                 "status": "error",
-                "server": "recruitment",
+                "server": server_name,
                 "tool": tool_name,
-                "message": str(e)
+                "message": f"여러 서버에 있는 도구라 서버를 지정해야 합니다: {tool_name}" if ambiguous
+                else f"알 수 없는 도구: {tool_name}"
             }
-    
-    def call_realestate_tool(self, tool_name: str, arguments: Dict[str, Any]):
-        """부동산 서버 도구 호출"""
         try:
-            if tool_name == 'getApartmentTrades':
-                return {
-                    "status": "success",
-                    "server": "realestate",
-                    "tool": tool_name,
-                    "result": self.realestate_server.getApartmentTrades(**arguments)
-                }
-            elif tool_name == 'getOfficeTrades':
-                return {
-                    "status": "success",
-                    "server": "realestate", 
-                    "tool": tool_name,
-                    "result": self.realestate_server.getOfficeTrades(**arguments)
-                }
-            elif tool_name == 'getHouseTrades':
-                return {
-                    "status": "success",
-                    "server": "realestate",
-                    "tool": tool_name, 
-                    "result": self.realestate_server.getHouseTrades(**arguments)
-                }
-            elif tool_name == 'ping':
-                return {
-                    "status": "success",
-                    "server": "realestate",
-                    "tool": tool_name,
-                    "result": self.realestate_server.ping()
-                }
-            else:
-                return {
-                    "status": "error",
-                    "server": "realestate",
-                    "tool": tool_name,
-                    "message": f"알 수 없는 도구: {tool_name}"
-                }
-        except Exception as e:
             return {
-                "status": "error",
-                "server": "realestate",
+                "status": "success",
+                "server": server_name,
+                "tool": tool_name,
+                "result": entry(**arguments)
+            }
+        except DeadlineExceeded as e:
+            # 워커 모드에서 응답을 기다리다 질의 데드라인을 넘긴 경우 (in-process 도구는 결과 안에 timeout을 담아 돌려줌)
+            return {
+                "status": "timeout",
+                "server": server_name,
                 "tool": tool_name,
                 "message": str(e)
             }
-    
-    def call_youth_policy_tool(self, tool_name: str, arguments: Dict[str, Any]):
-        """청소년정책 서버 도구 호출"""
-        try:
-            if tool_name == 'searchYouthPolicies':
-                return {
-                    "status": "success",
-                    "server": "youth_policy",
-                    "tool": tool_name,
-                    "result": self.youth_policy_server.searchYouthPolicies(**arguments)
-                }
-            elif tool_name == 'getYouthPolicyDetail':
-                return {
-                    "status": "success",
-                    "server": "youth_policy",
-                    "tool": tool_name,
-                    "result": self.youth_policy_server.getYouthPolicyDetail(**arguments)
-                }
-            elif tool_name == 'searchPoliciesByRegion':
-                return {
-                    "status": "success",
-                    "server": "youth_policy",
-                    "tool": tool_name,
-                    "result": self.youth_policy_server.searchPoliciesByRegion(**arguments)
-                }
-            elif tool_name == 'searchPoliciesByKeywords':
-                return {
-                    "status": "success",
-                    "server": "youth_policy",
-                    "tool": tool_name,
-                    "result": self.youth_policy_server.searchPoliciesByKeywords(**arguments)
-                }
-            elif tool_name == 'ping':
-                return {
-                    "status": "success",
-                    "server": "youth_policy",
-                    "tool": tool_name,
-                    "result": self.youth_policy_server.ping()
-                }
-            else:
-                return {
-                    "status": "error",
-                    "server": "youth_policy",
-                    "tool": tool_name,
-                    "message": f"알 수 없는 도구: {tool_name}"
-                }
         except Exception as e:
             return {
                 "status": "error",
-                "server": "youth_policy",
+                "server": server_name,
                 "tool": tool_name,
                 "message": str(e)
             }
     
-    def comprehensive_region_analysis(self, region_code: str, deal_ymd: str = "202506"):
-        """지역 종합 분석 - 채용정보 + 부동산 + 청소년정책"""
-        print(f"🔍 지역 종합 분석 시작: {region_code}")
-        
-        results = {}
+    async def call_tool_async(self, server_name: str, tool_name: str, arguments: Optional[Dict[str, Any]] = None,
+                              deadline: Optional[Deadline] = None, executor: Optional[Executor] = None) -> Dict[str, Any]:
+        """
+        call_tool을 작업 스레드에서 실행 (이벤트 루프를 막지 않음).
+        executor: 실행할 스레드 풀 (없으면 asyncio 기본 풀). 백그라운드 조회를 검색과 다른 풀로 돌릴 때 씀
+        """
+        if executor is None:
+            return await asyncio.to_thread(self.call_tool, server_name, tool_name, arguments, deadline)
+        call = functools.partial(contextvars.copy_context().run, self.call_tool, server_name, tool_name, arguments, deadline)
+        return await asyncio.get_running_loop().run_in_executor(executor, call)
+    
+    def call_recruitment_tool(self, tool_name: str, arguments: Dict[str, Any], deadline: Optional[Deadline] = None):
+        """채용정보 서버 도구 호출"""
+        return self.call_tool('recruitment', tool_name, arguments, deadline)
+    
+    def call_realestate_tool(self, tool_name: str, arguments: Dict[str, Any], deadline: Optional[Deadline] = None):
+        """부동산 서버 도구 호출"""
+        return self.call_tool('realestate', tool_name, arguments, deadline)
+    
+    def call_youth_policy_tool(self, tool_name: str, arguments: Dict[str, Any], deadline: Optional[Deadline] = None):
+        """청소년정책 서버 도구 호출"""
+        return self.call_tool('youth_policy', tool_name, arguments, deadline)
+    
+    def _batch(self, calls: List[ToolCall]) -> Tuple[List[str], Dict[str, Any]]:
+        """호출 목록 → (입력 순서대로의 중복 제거 키, 키별 하위 조회). 같은 서버·도구·인자는 한 번만 실행"""
+        keys: List[str] = []
+        queries: Dict[str, Any] = {}
+        for call in calls:
+            if isinstance(call, dict):
+                server_name, tool_name, arguments = call.get('server'), call.get('tool'), call.get('arguments')
+            else:
+                server_name, tool_name, arguments = call
+            arguments = arguments or {}
+            server_name = server_name or self.tool_servers.get(tool_name)
+            key = call_key(server_name, tool_name, arguments)
+            keys.append(key)
+            if key not in queries:
+                queries[key] = (functools.partial(self.call_tool, server_name), tool_name, arguments)
+        return keys, queries
+    
+    def call_many(self, calls: List[ToolCall], deadline: Optional[Deadline] = None,
+                  call_timeout: float = CALL_TIMEOUT) -> List[Dict[str, Any]]:
+        """
+        여러 서버의 도구 호출을 한 번에 동시 실행하고 입력 순서대로 결과를 반환.
+        calls: {'server', 'tool', 'arguments'} 딕셔너리 또는 (server, tool, arguments) 튜플 (server는 None 가능).
+        같은 호출이 여러 번 있으면 한 번만 실행해 결과를 나눠 씀. 시간 초과·오류는 해당 항목에만 표시.
+        """
+        keys, queries = self._batch(calls)
+        results = self._fan_out(queries, deadline=deadline, call_timeout=call_timeout)
+        return [results[key] for key in keys]
+    
+    async def call_many_async(self, calls: List[ToolCall], deadline: Optional[Deadline] = None,
+                              call_timeout: float = CALL_TIMEOUT) -> List[Dict[str, Any]]:
+        """call_many의 비동기 버전 (호출마다 작업 스레드 하나, 이벤트 루프에서 함께 기다림)"""
+        keys, queries = self._batch(calls)
         
-        # 1. 채용정보 조회
-        print("  📋 채용정보 조회 중...")
-        recruitment_result = self.call_recruitment_tool(
-            'listRecruitments',
-            {'pageNo': 1, 'numOfRows': 10}
-        )
-        results['recruitment'] = recruitment_result
+        async def run(query):
+            method, tool_name, arguments = query
+            sub_deadline = Deadline(call_timeout if deadline is None else deadline.cap(call_timeout))
+            try:
+                return await asyncio.wait_for(
+                    asyncio.to_thread(method, tool_name, arguments, sub_deadline),
+                    timeout=sub_deadline.remaining() + FANOUT_GRACE
+                )
+            except asyncio.TimeoutError:
+                return _timeout_result(tool_name, sub_deadline)
+            except Exception as e:
+                return {"status": "error", "tool": tool_name, "message": str(e)}
         
-        # 2. 부동산 아파트 실거래가 조회
-        print("  🏠 아파트 실거래가 조회 중...")
-        apt_result = self.call_realestate_tool(
-            'getApartmentTrades',
-            {
-                'lawdcd': region_code,
-                'deal_ymd': deal_ymd,
-                'pageNo': 1,
-                'numOfRows': 5
+        done = await asyncio.gather(*(run(query) for query in queries.values()))
+        results = dict(zip(queries, done))
+        return [results[key] for key in keys]
+    
+    def _call_with_deadline(self, server_name: str, tool_name: str, arguments: Dict[str, Any], deadline: Deadline, method):
+        """질의 데드라인 안에서 도구 호출. 시작 전에 이미 지났거나 하위 호출이 시간 초과로 끝나면 status=timeout"""
+        if deadline.expired:
+            return {
+                "status": "timeout",
+                "server": server_name,
+                "tool": tool_name,
+                "message": "질의 시간 예산이 남지 않아 호출하지 않았습니다"
             }
-        )
-        results['apartment_trades'] = apt_result
-        
-        # 3. 지역별 청소년정책 조회 (새로 추가!)
-        print("  🎯 지역별 청소년정책 조회 중...")
-        policy_result = self.call_youth_policy_tool(
-            'searchPoliciesByRegion',
-            {
-                'regionCode': region_code,
-                'pageNum': 1,
-                'pageSize': 10,
-                'categories': "일자리,주거,교육,복지"  # 주요 관심 분야
+        with deadline_scope(deadline):
+            result = method(tool_name, arguments)
+        inner = result.get("result")
+        if result["status"] == "success" and isinstance(inner, dict) and inner.get("status") == "timeout":
+            return {
+                "status": "timeout",
+                "server": server_name,
+                "tool": tool_name,
+                "message": inner.get("message", "질의 시간 예산을 초과했습니다")
             }
-        )
-        results['youth_policies'] = policy_result
-        
-        # 4. 청년 특화 정책 검색
-        print("  🚀 청년 특화 정책 검색 중...")
-        youth_specific_result = self.call_youth_policy_tool(
-            'searchPoliciesByKeywords',
-            {
-                'keywords': "청년,취업,창업,주거지원,생활비지원",
-                'regionCode': region_code,
-                'pageNum': 1,
-                'pageSize': 8
+        return result
+    
+    def get_quota_status(self, deadline: Optional[Deadline] = None) -> Dict[str, Any]:
+        """
+        서버별 API 키 일일 호출 한도 현황. 세 서버에 동시에 물음
+        (deadline: 호출한 질의의 시간 예산. 못 받은 서버는 빈 값)
+        """
+        results = self.call_many([(server_name, 'quotaStatus', {}) for server_name in self.servers], deadline=deadline)
+        return {
+            server_name: result.get('result', {}).get('quota', {}) if result['status'] == 'success' else {}
+            for server_name, result in zip(self.servers, results)
+        }
+    
+    def _quota_skip(self, quota_status: Dict[str, Any], server_name: str, endpoint: str, tool_name: str):
+        """한도가 소진된 엔드포인트면 호출 대신 건너뜀 결과를 반환 (아니면 None)"""
+        if endpoint in quota_status.get(server_name, {}).get('exhausted_endpoints', []):
+            return {
+                "status": "skipped",
+                "server": server_name,
+                "tool": tool_name,
+                "message": "오늘 API 호출 한도가 소진되어 조회를 건너뛰었습니다"
             }
-        )
-        results['youth_specific_policies'] = youth_specific_result
-        
-        print("✅ 지역 종합 분석 완료")
-        return results
+        return None
+    
+    def _fan_out(self, queries: Dict[str, SubQuery], deadline: Optional[Deadline] = None,
+                 call_timeout: float = CALL_TIMEOUT) -> Dict[str, Any]:
+        """
+        서로 독립인 하위 조회를 제한된 스레드 풀에서 동시에 실행 (전체 시간 ≈ 가장 느린 조회 하나).
+        조회마다 작업 스레드가 집어 든 때부터 call_timeout과 질의 전체 남은 시간 중 짧은 쪽의 데드라인을 주고,
+        그 안에 끝나지 않거나 예외가 난 도메인만 timeout/error 결과로 채워 나머지 결과는 그대로 돌려줌.
+        """
+        results: Dict[str, Any] = {}
+        pending = {}
+        for key, query in queries.items():
+            if isinstance(query, dict):
+                results[key] = query
+                continue
+            sub_call = _SubCall(*query, deadline, call_timeout)
+            # 호출한 쪽의 contextvar(데드라인 등)가 작업 스레드에도 보이도록 컨텍스트를 복사해 실행
+            pending[key] = (_fanout_executor().submit(contextvars.copy_context().run, sub_call.run), sub_call)
+        for key, (future, sub_call) in pending.items():
+            results[key] = sub_call.wait(future)
+        return {key: results[key] for key in queries}
 
-    def analyze_living_feasibility(self, region_code: str, age_group: str = "청년"):
-        """거주 타당성 분석 - 일자리, 주거비, 정책 지원 종합"""
-        print(f"📊 {age_group} 거주 타당성 분석: {region_code}")
-        
-        results = {}
-        
-        # 1. 일자리 현황
-        recruitment_result = self.call_recruitment_tool(
-            'listRecruitments',
-            {'pageNo': 1, 'numOfRows': 20}
-        )
-        results['job_market'] = recruitment_result
+    def comprehensive_region_analysis(self, region_code: str, deal_ymd: str = "202506", deadline: Optional[Deadline] = None):
+        """지역 종합 분석 - 채용정보 + 부동산 + 청소년정책 (deadline: 전체 시간 예산, 네 조회를 동시에 실행)"""
+        print(f"🔍 지역 종합 분석 시작: {region_code}")
         
-        # 2. 주거비 현황 (최근 6개월)
-        months = ["202501", "202502", "202503", "202504", "202505", "202506"]
-        housing_costs = []
+        quota_status = self.get_quota_status(deadline)
+        policy_skip = self._quota_skip(quota_status, 'youth_policy', 'getPlcy', 'searchPoliciesByRegion')
         
-        for month in months[-3:]:  # 최근 3개월만
-            apt_result = self.call_realestate_tool(
+        print("  📋 채용정보 · 🏠 아파트 실거래가 · 🎯 지역별 청소년정책 · 🚀 청년 특화 정책 동시 조회 중...")
+        results = self._fan_out({
+            # 1. 채용정보 조회
+            'recruitment': self._quota_skip(quota_status, 'recruitment', 'list', 'listRecruitments') or (
+                self.call_recruitment_tool,
+                'listRecruitments',
+                {'pageNo': 1, 'numOfRows': 10}
+            ),
+            # 2. 부동산 아파트 실거래가 조회
+            'apartment_trades': self._quota_skip(
+                quota_status, 'realestate', APT_TRADE_ENDPOINT, 'getApartmentTrades'
+            ) or (
+                self.call_realestate_tool,
                 'getApartmentTrades',
                 {
                     'lawdcd': region_code,
-                    'deal_ymd': month,
+                    'deal_ymd': deal_ymd,
+                    'pageNo': 1,
+                    'numOfRows': 5
+                }
+            ),
+            # 3. 지역별 청소년정책 조회
+            'youth_policies': policy_skip or (
+                self.call_youth_policy_tool,
+                'searchPoliciesByRegion',
+                {
+                    'regionCode': region_code,
                     'pageNum': 1,
-                    'numOfRows': 10
+                    'pageSize': 10,
+                    'categories': "일자리,주거,교육,복지"  # 주요 관심 분야
                 }
-            )
-            housing_costs.append({month: apt_result})
+            ),
+            # 4. 청년 특화 정책 검색
+            'youth_specific_policies': policy_skip or (
+                self.call_youth_policy_tool,
+                'searchPoliciesByKeywords',
+                {
+                    'keywords': "청년,취업,창업,주거지원,생활비지원",
+                    'regionCode': region_code,
+                    'pageNum': 1,
+                    'pageSize': 8
+                }
+            ),
+        }, deadline=deadline)
         
-        results['housing_trends'] = housing_costs
+        failed = [key for key, result in results.items() if result.get("status") in ("timeout", "error")]
+        if failed:
+            print(f"⚠️ 일부 조회 실패/시간 초과 (나머지 결과만 사용): {', '.join(failed)}")
+        print("✅ 지역 종합 분석 완료")
+        return results
+
+    def analyze_living_feasibility(self, region_code: str, age_group: str = "청년", deadline: Optional[Deadline] = None):
+        """거주 타당성 분석 - 일자리, 주거비, 정책 지원 종합 (deadline: 전체 시간 예산, 조회를 동시에 실행)"""
+        print(f"📊 {age_group} 거주 타당성 분석: {region_code}")
         
-        # 3. 정책 지원 현황
+        months = recent_months(6)
         if age_group == "청년":
             policy_keywords = "청년,취업지원,주거지원,창업지원,생활비지원"
         else:
             policy_keywords = "일자리,주거,복지,교육"
         
-        policy_result = self.call_youth_policy_tool(
-            'searchPoliciesByKeywords',
-            {
-                'keywords': policy_keywords,
-                'regionCode': region_code,
-                'pageNum': 1,
-                'pageSize': 15
-            }
-        )
-        results['policy_support'] = policy_result
-        
-        return results
+        return self._fan_out({
+            # 1. 일자리 현황
+            'job_market': (
+                self.call_recruitment_tool,
+                'listRecruitments',
+                {'pageNo': 1, 'numOfRows': 20}
+            ),
+            # 2. 주거비 현황 (최근 6개월): 거래 행은 쓰지 않으므로 통계만 받음
+            #    (월별 추이 trend와 면적대별 가격이 함께 오고, 행 목록을 따로 받으면 같은 상위 요청을 두 번 보냄)
+            'housing_trends': (
+                self.call_realestate_tool,
+                'getTradeStatistics',
+                {
+                    'lawdcds': [region_code],
+                    'start_ymd': months[0],
+                    'end_ymd': months[-1],
+                    'groupBy': 'area_bucket'
+                }
+            ),
+            # 3. 정책 지원 현황
+            'policy_support': (
+                self.call_youth_policy_tool,
+                'searchPoliciesByKeywords',
+                {
+                    'keywords': policy_keywords,
+                    'regionCode': region_code,
+                    'pageNum': 1,
+                    'pageSize': 15
+                }
+            ),
+        }, deadline=deadline)
 
 
 def test_all_servers():
@@ -1,34 +1,49 @@
-# perfect_chatbot.py — 완벽한 통합 챗봇 (정책 조회 + 날짜 필터링 + 5개 지역 한정)
+# perfect_chatbot.py — 완벽한 통합 챗봇 (정책 조회 + 날짜 필터링 + 전국 시군구)
 import asyncio
 import json
+import os
 import re
-from typing import Dict, Any, List, Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Any, List, Optional, Tuple
 from datetime import datetime
 
 # 확장된 오케스트레이터 import
-from enhanced_orchestrator import EnhancedOrchestrator
+from enhanced_orchestrator import EnhancedOrchestrator, call_key
+from deadline import Deadline
+import region_registry
+from keyword_matcher import KeywordMatcher
+
+# /region, /date, /field로 조건이 바뀌면 다음 검색이 보낼 조회를 미리 시작 (0이면 끔)
+PREFETCH = (os.getenv("CHATBOT_PREFETCH") or "1").strip() != "0"
+# 미리 받아 둔 결과를 검색에 쓸 수 있는 시간(초). 지나면 버리고 새로 조회
+PREFETCH_TTL = float(os.getenv("CHATBOT_PREFETCH_TTL") or 300)
+# 미리 받아 두기 전용 작업 스레드 수. 검색이 쓰는 기본 스레드 풀·팬아웃 풀과 따로, 작게 둬서 검색을 밀어내지 않음
+PREFETCH_WORKERS = int(os.getenv("CHATBOT_PREFETCH_WORKERS") or 2)
+# 채용공고 미러 동기화에 주는 시간(초). 검색 데드라인과 별개로 백그라운드에서 돌림
+MIRROR_SYNC_BUDGET = float(os.getenv("CHATBOT_MIRROR_SYNC_BUDGET") or 120)
 
 
 class PerfectChatbot:
+    # 검색 유형 키워드
+    DOMAIN_KEYWORDS = {
+        "job": ["채용", "구인", "일자리", "취업", "인턴", "공채", "모집", "구직", "직장"],
+        # 부동산 + 거주 관련 표현
+        "realestate": ["아파트", "부동산", "실거래가", "매매", "집", "주택", "오피스텔", "매물",
+                       "살곳", "살", "거주", "이사", "정착", "생활"],
+        "policy": ["정책", "지원", "혜택", "복지", "청년정책"],
+        "all": ["통합", "전체", "모든", "다"],
+    }
+    # 고용형태/학력 키워드 → 필터 판단에 쓰는 대표값
+    HIRE_KEYWORDS = {"청년": "청년", "인턴": "인턴", "정규직": "정규직", "계약직": "계약직", "비정규": "계약직"}
+    EDUCATION_KEYWORDS = {"학력무관": "학력무관", "대졸": "대졸", "4년제": "대졸"}
+
     def __init__(self):
         self.orchestrator = EnhancedOrchestrator()
 
-        # ✅ 이 챗봇은 아래 5개 지역만 지원합니다.
-        # 정선군(51770), 영월군(51750), 청양군(44790), 강릉시(51150), 김제시(52210)
-        self.allowed_regions_code_to_name = {
-            "51770": "정선군",
-            "51750": "영월군",
-            "44790": "청양군",
-            "51150": "강릉시",
-            "52210": "김제시",
-        }
-        self.allowed_regions_name_to_code = {
-            "정선": "51770", "정선군": "51770",
-            "영월": "51750", "영월군": "51750",
-            "청양": "44790", "청양군": "44790",
-            "강릉": "51150", "강릉시": "51150",
-            "김제": "52210", "김제시": "52210",
-        }
+        # ✅ 전국 시군구 지원 (법정동 코드표 data/lawd_sigungu.csv)
+        self.regions = region_registry.get_registry()
 
         self.state = {
             "raw": False,
@@ -77,9 +92,36 @@ class PerfectChatbot:
             "연구": "연구"
         }
 
+        self.intent_matcher = self._compile_intent_matcher()
+
+        # 미리 시작한 조회: call_key(서버, 도구, 인자) → (asyncio 작업, 시작 시각, 데드라인)
+        # 작업을 취소할 때 데드라인도 만료시켜 작업 스레드에서 도는 조회가 다음 페이지·재시도 전에 멈추게 함
+        self._prefetched: Dict[str, Tuple[asyncio.Task, float, Deadline]] = {}
+        self._prefetch_pool = ThreadPoolExecutor(max_workers=max(1, PREFETCH_WORKERS), thread_name_prefix="prefetch")
+        # 백그라운드 채용공고 미러 동기화 (작업, 데드라인)
+        self._mirror_sync: Optional[Tuple[asyncio.Task, Deadline]] = None
+
+    def _compile_intent_matcher(self) -> KeywordMatcher:
+        """의도 분석용 키워드 사전(지역 별칭 포함)을 자동자 하나로 컴파일. payload: (종류, 값)."""
+        matcher = KeywordMatcher()
+        self.regions.add_aliases(matcher)
+        for kind, keywords in self.DOMAIN_KEYWORDS.items():
+            matcher.add_many(keywords, (kind, kind))
+        for keyword, value in self.HIRE_KEYWORDS.items():
+            matcher.add(keyword, ("hire", value))
+        for keyword, value in self.EDUCATION_KEYWORDS.items():
+            matcher.add(keyword, ("education", value))
+        # 직무 분야: (우선순위, 코드). 분야명 전체 → 자연어 키워드 순
+        for order, (field_name, code) in enumerate(self.job_fields.items()):
+            matcher.add(field_name.lower(), ("ncs", (order, code)))
+        for order, (keyword, field_name) in enumerate(self.job_keywords.items(), start=len(self.job_fields)):
+            if field_name in self.job_fields:
+                matcher.add(keyword.lower(), ("ncs", (order, self.job_fields[field_name])))
+        return matcher.compile()
+
     def print_help(self):
         print("""
-🤖 통합 챗봇 명령어 가이드  (지원 지역: 정선·영월·청양·강릉·김제)
+🤖 통합 챗봇 명령어 가이드  (지원 지역: 전국 시군구)
 
 [자연어 검색]
   "강릉시 IT 일자리와 아파트 매물, 정책 알려줘"
@@ -88,7 +130,7 @@ class PerfectChatbot:
   "김제시 아파트 실거래가만 보여줘"
 
 [설정 명령어]
-  /region <코드|이름>              → 지역 설정 (예: /region 42150 또는 /region 강릉시)
+  /region <코드|이름>              → 지역 설정 (예: /region 51150, /region 강릉시, /region 강원 고성)
   /date <YYYYMM>                   → 부동산 거래 년월 설정
   /jobs <숫자>                     → 채용정보 결과 개수 설정
   /field <분야명>                  → 직무 분야 설정
@@ -98,12 +140,12 @@ class PerfectChatbot:
 
 [지역 코드 참고]
   51770: 정선군    51750: 영월군    44790: 청양군
-  51150: 강릉시    52210: 김제시
+  51150: 강릉시    52210: 김제시    (같은 이름이 여럿이면 "강원 고성"처럼 시도를 붙여 주세요)
 """.strip())
 
     def analyze_user_intent(self, user_input: str) -> Dict[str, Any]:
-        """사용자 입력을 분석해서 의도 파악 (정책 검색 추가 + 지역 5개 한정)"""
-        text = user_input.lower().replace(" ", "")
+        """사용자 입력을 분석해서 의도 파악 (정책 검색 추가 + 전국 시군구)"""
+        text = region_registry.normalize(user_input)
 
         intent = {
             "type": "unknown",
@@ -114,28 +156,23 @@ class PerfectChatbot:
             "region_mentioned": None
         }
 
-        # ✅ 지역 감지: 5개 지역만
-        region_mapping = {
-            "정선": "51770", "정선군": "51770",
-            "영월": "51750", "영월군": "51750",
-            "청양": "44790", "청양군": "44790",
-            "강릉": "51150", "강릉시": "51150",
-            "김제": "52210", "김제시": "52210",
-        }
-        for region_name, code in region_mapping.items():
-            if region_name in text:
-                intent["region_mentioned"] = code
-                break
+        # 지역·검색 유형·고용형태·학력·직무 키워드를 컴파일된 자동자로 한 번에 찾음
+        hits = self.intent_matcher.find_all(text)
+        found = {}
+        region_hits = []
+        for start, end, (kind, value) in hits:
+            if kind in ("sigungu", "sido"):
+                region_hits.append((start, end, (kind, value)))
+            else:
+                found.setdefault(kind, []).append(value)
 
-        # 검색 유형 감지
-        job_keywords = ["채용", "구인", "일자리", "취업", "인턴", "공채", "모집", "구직", "직장"]
-        realestate_keywords = ["아파트", "부동산", "실거래가", "매매", "집", "주택", "오피스텔", "매물"]
-        policy_keywords = ["정책", "지원", "혜택", "복지", "청년정책"]
-        living_keywords = ["살곳", "살", "거주", "이사", "정착", "생활"]
+        # ✅ 지역 감지: 전국 시군구 (동명 지역은 함께 쓴 시도로 구분)
+        intent["region_mentioned"] = self.regions.choose(region_hits)
 
-        has_job = any(keyword in text for keyword in job_keywords)
-        has_realestate = any(keyword in text for keyword in realestate_keywords + living_keywords)
-        has_policy = any(keyword in text for keyword in policy_keywords)
+        # 검색 유형 감지
+        has_job = "job" in found
+        has_realestate = "realestate" in found
+        has_policy = "policy" in found
 
         # 검색 유형 결정
         search_count = sum([has_job, has_realestate, has_policy])
@@ -153,44 +190,36 @@ class PerfectChatbot:
         elif has_policy:
             intent["type"] = "policies_only"
             intent["search_policies"] = True
-        elif any(keyword in text for keyword in ["통합", "전체", "모든", "다"]):
+        elif "all" in found:
             intent["type"] = "comprehensive"
             intent["search_jobs"] = True
             intent["search_realestate"] = True
             intent["search_policies"] = True
 
-        # 채용 필터 감지 (기존과 동일)
-        if "청년" in text and "인턴" in text:
+        # 채용 필터 감지 (기존과 동일한 우선순위)
+        hire = set(found.get("hire", ()))
+        if "청년" in hire and "인턴" in hire:
             intent["filters"]["hireTypeLst"] = "R1050,R1060,R1070"
-        elif "정규직" in text:
+        elif "정규직" in hire:
             intent["filters"]["hireTypeLst"] = "R1010"
-        elif "계약직" in text or "비정규" in text:
+        elif "계약직" in hire:
             intent["filters"]["hireTypeLst"] = "R1040"
 
-        if "학력무관" in text:
+        education = set(found.get("education", ()))
+        if "학력무관" in education:
             intent["filters"]["acbgCondLst"] = "R7010"
-        elif "대졸" in text or "4년제" in text:
+        elif "대졸" in education:
             intent["filters"]["acbgCondLst"] = "R7050"
 
-        # 직무 분야 필터 감지 (키워드 매핑 추가)
-        detected_field = None
-        for field_name, code in self.job_fields.items():
-            if field_name in text:
-                detected_field = code
-                break
-        if not detected_field:
-            for keyword, field_name in self.job_keywords.items():
-                if keyword in text and field_name in self.job_fields:
-                    detected_field = self.job_fields[field_name]
-                    break
-        if detected_field:
-            intent["filters"]["ncsCdLst"] = detected_field
+        # 직무 분야 필터 감지: 분야명이 키워드보다, 같은 종류끼리는 사전 순서가 앞선 것이 우선
+        if "ncs" in found:
+            intent["filters"]["ncsCdLst"] = min(found["ncs"])[1]
 
         return intent
 
     def get_region_name(self, region_code: str) -> str:
-        """지역 코드를 지역명으로 변환(5개 한정)"""
-        return self.allowed_regions_code_to_name.get(region_code, f"지원하지 않는 지역({region_code})")
+        """지역 코드를 지역명으로 변환"""
+        return self.regions.name(region_code) or f"지원하지 않는 지역({region_code})"
 
     def filter_active_policies(self, policies: List[Dict]) -> List[Dict]:
         """현재 날짜 기준으로 유효한 정책만 필터링"""
@@ -281,14 +310,17 @@ class PerfectChatbot:
 
         for i, apt in enumerate(apt_data[:limit], 1):
             name = apt.get("aptNm", "아파트명 없음")
-            price = apt.get("dealAmount", "가격정보없음")
+            price = apt.get("dealAmount") or "가격정보없음"
             area = apt.get("excluUseAr", "면적정보없음")
             floor = apt.get("floor", "층수정보없음")
             year = apt.get("buildYear", "건축년도없음")
             dong = apt.get("umdNm", "동정보없음")
 
-            if price and price.replace(",", "").isdigit():
-                price_int = int(price.replace(",", ""))
+            # 서버가 dealAmount를 만원 단위 정수로 돌려줌 (예전 문자열 형식도 허용)
+            if isinstance(price, str) and price.replace(",", "").strip().isdigit():
+                price = int(price.replace(",", ""))
+            if isinstance(price, int):
+                price_int = price
                 if price_int >= 10000:
                     eok = price_int // 10000
                     man = price_int % 10000
@@ -417,31 +449,15 @@ class PerfectChatbot:
         return "\n".join(output)
 
     def filter_and_sort_jobs_by_region(self, jobs: List[Dict], target_region_code: str) -> List[Dict]:
-        """채용정보를 지역 관련성에 따라 정렬 (5개 지역 전용)"""
-        region_mapping = {
-            "51770": ["정선", "강원"],
-            "51750": ["영월", "강원"],
-            "44790": ["청양", "충남", "충청"],
-            "51150": ["강릉", "강원"],
-            "52210": ["김제", "전북", "전라"],
-        }
-
-        if target_region_code not in region_mapping:
+        """채용정보를 지역 관련성에 따라 정렬 (근무지역 이름을 지역 표에서 바로 조회)"""
+        if self.regions.get(target_region_code) is None:
             return jobs[:10]
 
-        target_keywords = region_mapping[target_region_code]
-
         def calculate_job_score(job):
-            work_region = job.get("workRgnNmLst", "").replace(" ", "")
-            if not work_region:
-                return (999, 0)
-            region_count = work_region.count(',') + 1 if work_region else 0
-            relevance_score = 999
-            for i, keyword in enumerate(target_keywords):
-                if keyword in work_region:
-                    relevance_score = i
-                    break
-            return (relevance_score, region_count)
+            names = region_registry.split_names(job.get("workRgnNmLst", ""))
+            if not names:
+                return (region_registry.NO_MATCH, 0)
+            return (self.regions.relevance(target_region_code, names), len(names))
 
         scored_jobs = [(job, calculate_job_score(job)) for job in jobs]
         sorted_jobs = sorted(scored_jobs, key=lambda x: x[1])
@@ -449,32 +465,19 @@ class PerfectChatbot:
         return result_jobs
 
     def filter_and_sort_policies_by_region(self, policies: List[Dict], target_region_code: str) -> List[Dict]:
-        """청년정책 지역 관련성 정렬 (5개 지역 전용)"""
-        region_mapping = {
-            "51770": ["정선", "강원"],
-            "51750": ["영월", "강원"],
-            "44790": ["청양", "충남", "충청"],
-            "51150": ["강릉", "강원"],
-            "52210": ["김제", "전북", "전라"],
-        }
-
-        if target_region_code not in region_mapping:
+        """청년정책 지역 관련성 정렬 (담당기관 이름 → 지역 표, 없으면 zipCd에 대상 코드가 있는지)"""
+        if self.regions.get(target_region_code) is None:
             return policies[:10]
-
-        target_keywords = region_mapping[target_region_code]
+        target_codes = {target_region_code, *self.regions.children(target_region_code)}
 
         def calculate_policy_score(policy):
-            institution = policy.get("sprvsnInstCdNm", "").replace(" ", "")
-            zip_codes = policy.get('zipCd', '')
-            region_count = len(zip_codes.split(',')) if zip_codes and ',' in zip_codes else 1
-            relevance_score = 999
-            for i, keyword in enumerate(target_keywords):
-                if keyword in institution:
-                    relevance_score = i
-                    break
-            if relevance_score == 999 and zip_codes:
-                if target_region_code in zip_codes:
-                    relevance_score = len(target_keywords)
+            zip_codes = [z.strip() for z in policy.get('zipCd', '').split(',') if z.strip()]
+            region_count = max(1, len(zip_codes))
+            relevance_score = self.regions.relevance(
+                target_region_code, region_registry.split_names(policy.get("sprvsnInstCdNm", ""))
+            )
+            if relevance_score == region_registry.NO_MATCH and not target_codes.isdisjoint(zip_codes):
+                relevance_score = region_registry.RANK_CODE_LISTED
             return (relevance_score, region_count)
 
         scored_policies = [(policy, calculate_policy_score(policy)) for policy in policies]
@@ -482,110 +485,259 @@ class PerfectChatbot:
         result_policies = [policy for policy, score in sorted_policies[:15]]
         return result_policies
 
-    async def handle_search(self, intent: Dict[str, Any]) -> str:
-        """검색 의도에 따라 적절한 검색 수행 (정책 검색 + 날짜 필터링)"""
-        region_code = intent.get("region_mentioned") or self.state["region_code"]
-
-        # ✅ 지역 제한 검증
-        if region_code not in self.allowed_regions_code_to_name:
-            allowed_list = ", ".join([f"{name}({code})" for code, name in self.allowed_regions_code_to_name.items()])
-            return f"❌ 지원하지 않는 지역입니다. 사용 가능 지역: {allowed_list}"
+    # ---- 검색에 쓰는 조회 (미리 받아 두기와 같은 인자를 쓰도록 한곳에서 만듦) ----
+    def _job_filters(self, intent_filters: Dict[str, Any]) -> Dict[str, Any]:
+        return {**intent_filters,
+                **({} if self.state["job_field"] is None else {"ncsCdLst": self.state["job_field"]})}
+
+    def _realestate_call(self, region_code: str) -> Tuple[str, Dict[str, Any]]:
+        trade_codes = self.regions.trade_codes(region_code)
+        if len(trade_codes) > 1:
+            # 일반구가 있는 시(수원시 등)는 구 단위로만 조회되므로 구들을 한 번에 조회
+            return 'getBulkTrades', {
+                'lawdcds': trade_codes,
+                'start_ymd': self.state["deal_ymd"],
+                'end_ymd': self.state["deal_ymd"]
+            }
+        return 'getApartmentTrades', {
+            'lawdcd': region_code,
+            'deal_ymd': self.state["deal_ymd"],
+            'pageNo': 1,
+            'numOfRows': 10
+        }
 
-        region_name = self.get_region_name(region_code)
-        results = []
+    @staticmethod
+    def _policy_args(region_code: str) -> Dict[str, Any]:
+        return {
+            'regionCode': region_code,
+            'pageSize': 100,
+            'maxRecords': 300
+        }
 
+    def start_mirror_sync(self) -> None:
+        """
+        채용공고 로컬 미러를 백그라운드에서 증분 동기화 (이미 도는 중이면 그대로, 최근에 했으면 서버가 건너뜀).
+        검색은 기다리지 않고 지금 미러에 있는 공고로 답함 (미러가 비어 있으면 목록 API로 대신 조회).
+        """
+        if self._mirror_sync is None or self._mirror_sync[0].done():
+            sync_deadline = Deadline(MIRROR_SYNC_BUDGET)
+            task = asyncio.create_task(self.orchestrator.call_tool_async(
+                'recruitment', 'syncRecruitmentMirror', {}, deadline=sync_deadline, executor=self._prefetch_pool
+            ))
+            self._mirror_sync = (task, sync_deadline)
+
+    async def _query_jobs(self, job_filters: Dict[str, Any], deadline: Deadline,
+                          executor: Optional[ThreadPoolExecutor] = None) -> Dict[str, Any]:
+        # 진행 중인 공고 전체가 담긴 로컬 미러에서 조건 조회 (동기화는 검색 데드라인 밖에서 따로 진행)
+        self.start_mirror_sync()
+        return await self.orchestrator.call_tool_async(
+            'recruitment',
+            'queryRecruitments',
+            {'filters': job_filters, 'limit': 5000},
+            deadline=deadline,
+            executor=executor
+        )
+
+    # ---- 미리 받아 두기 ----
+    def start_prefetch(self) -> None:
+        """
+        현재 지역·거래년월·직무 분야로 다음 검색이 보낼 조회를 백그라운드에서 시작.
+        새 조건과 맞지 않는 이전 작업은 취소하고, 그대로 쓸 수 있는 작업(예: /date만 바뀐 경우의 채용·정책)은 유지.
+        """
+        if not PREFETCH:
+            return
+        region_code = self.state["region_code"]
+        region = self.regions.get(region_code)
+        if region is None or region.is_sido:
+            return
+        job_filters = self._job_filters({})
+        apt_tool, apt_args = self._realestate_call(region_code)
+        policy_args = self._policy_args(region_code)
+        pool = self._prefetch_pool
+        plan = {
+            call_key('recruitment', 'queryRecruitments', {'filters': job_filters, 'limit': 5000}):
+                lambda dl: self._query_jobs(job_filters, dl, executor=pool),
+            call_key('realestate', apt_tool, apt_args):
+                lambda dl: self.orchestrator.call_tool_async('realestate', apt_tool, apt_args, deadline=dl, executor=pool),
+            call_key('youth_policy', 'searchAllYouthPolicies', policy_args):
+                lambda dl: self.orchestrator.call_tool_async(
+                    'youth_policy', 'searchAllYouthPolicies', policy_args, deadline=dl, executor=pool
+                ),
+        }
+        for key in [key for key in self._prefetched if key not in plan]:
+            self._cancel_entry(self._prefetched.pop(key))
+        now = time.monotonic()
+        for key, start in plan.items():
+            if key not in self._prefetched:
+                prefetch_deadline = Deadline()
+                self._prefetched[key] = (asyncio.create_task(start(prefetch_deadline)), now, prefetch_deadline)
+
+    @staticmethod
+    def _cancel_entry(entry: Tuple[asyncio.Task, float, Deadline]) -> None:
+        task, _, prefetch_deadline = entry
+        prefetch_deadline.cancel()
+        task.cancel()
+
+    def cancel_prefetch(self) -> None:
+        for entry in self._prefetched.values():
+            self._cancel_entry(entry)
+        self._prefetched.clear()
+
+    def shutdown(self) -> None:
+        """종료 전에 백그라운드 조회(미리 받아 두기, 미러 동기화)를 멈추고 전용 스레드 풀을 정리."""
+        self.cancel_prefetch()
+        if self._mirror_sync is not None:
+            task, sync_deadline = self._mirror_sync
+            sync_deadline.cancel()
+            task.cancel()
+            self._mirror_sync = None
+        self._prefetch_pool.shutdown(wait=False, cancel_futures=True)
+
+    async def _take_prefetched(self, server_name: str, tool_name: str, arguments: Dict[str, Any],
+                               deadline: Deadline) -> Optional[Dict[str, Any]]:
+        """미리 시작한 같은 조회가 있으면 그 결과 (진행 중이면 남은 시간 안에서 기다림). 없거나 실패했으면 None"""
+        entry = self._prefetched.pop(call_key(server_name, tool_name, arguments), None)
+        if entry is None:
+            return None
+        task, started, _ = entry
+        if time.monotonic() - started > PREFETCH_TTL:
+            self._cancel_entry(entry)
+            return None
         try:
-            # 1) 채용정보
-            if intent["search_jobs"]:
-                print("📋 채용정보 검색 중...")
-                job_result = self.orchestrator.call_recruitment_tool(
-                    'listRecruitments',
-                    {
-                        'pageNo': 1,
-                        'numOfRows': 100,
-                        'filters': {**intent.get("filters", {}),
-                                    **({} if self.state["job_field"] is None else {"ncsCdLst": self.state["job_field"]})}
-                    }
-                )
-                if job_result["status"] == "success":
-                    job_data = job_result["result"].get("data", {}).get("result", [])
-                    job_data = self.filter_and_sort_jobs_by_region(job_data, region_code)
-                    results.append(self.format_job_results(job_data, limit=5, region_name=region_name))
-                else:
-                    results.append(f"📋 채용정보 검색 실패: {job_result.get('message', '알 수 없는 오류')}")
-
-            # 2) 부동산
-            if intent["search_realestate"]:
-                print("🏠 부동산 검색 중...")
-                apt_result = self.orchestrator.call_realestate_tool(
-                    'getApartmentTrades',
-                    {
-                        'lawdcd': region_code,
-                        'deal_ymd': self.state["deal_ymd"],
-                        'pageNo': 1,
-                        'numOfRows': 10
-                    }
-                )
-                if apt_result["status"] == "success":
-                    apt_text = apt_result["result"].get("text", "")
-                    apt_data = self.parse_apartment_xml(apt_text)
-                    results.append(self.format_realestate_results(apt_data, limit=5))
-                else:
-                    results.append(f"🏠 부동산 검색 실패: {apt_result.get('message', '알 수 없는 오류')}")
-
-            # 3) 청년정책
-            if intent["search_policies"]:
-                print("📋 청년정책 검색 중...")
-                policy_result = self.orchestrator.call_youth_policy_tool(
-                    'searchPoliciesByRegion',
-                    {
-                        'regionCode': region_code,
-                        'pageNum': 1,
-                        'pageSize': 30
-                    }
-                )
-                if policy_result["status"] == "success":
-                    policies = policy_result["result"].get("policies", [])
-                    active_policies = self.filter_active_policies(policies)
-                    active_policies = self.filter_and_sort_policies_by_region(active_policies, region_code)
-                    active_policies = active_policies[:5]
-                    results.append(self.format_policy_results(active_policies, limit=5, region_name=region_name))
-                    if len(policies) > len(active_policies):
-                        results.append(f"ℹ️ 총 {len(policies)}개 중 현재 신청 가능한 {len(active_policies)}개 정책을 표시했습니다.")
-                else:
-                    results.append(f"📋 청년정책 검색 실패: {policy_result.get('message', '알 수 없는 오류')}")
+            # shield: 이 검색이 취소돼도 이미 보낸 조회는 끝까지 받아 응답 캐시에 남김
+            result = await asyncio.wait_for(asyncio.shield(task), timeout=deadline.remaining())
+        except asyncio.TimeoutError:
+            return {
+                "status": "timeout",
+                "server": server_name,
+                "tool": tool_name,
+                "message": "질의 시간 예산을 초과했습니다"
+            }
+        except Exception:
+            return None
+        return result if result.get("status") == "success" else None
+
+    async def _search_jobs(self, intent: Dict[str, Any], region_code: str, region_name: str, deadline: Deadline) -> Optional[List[str]]:
+        """채용정보 섹션 (시간 초과면 None)"""
+        job_filters = self._job_filters(intent.get("filters", {}))
+        job_result = await self._take_prefetched(
+            'recruitment', 'queryRecruitments', {'filters': job_filters, 'limit': 5000}, deadline
+        ) or await self._query_jobs(job_filters, deadline)
+        if job_result["status"] == "success" and job_result["result"].get("status") != "ok":
+            # 미러를 쓸 수 없으면(첫 동기화 실패 등) 목록 API 전체 페이지를 받아 거름
+            job_result = await self.orchestrator.call_tool_async(
+                'recruitment',
+                'listAllRecruitments',
+                {'numOfRows': 100, 'maxRecords': 1000, 'filters': job_filters},
+                deadline=deadline
+            )
+        if job_result["status"] == "timeout":
+            return None
+        if job_result["status"] != "success":
+            return [f"📋 채용정보 검색 실패: {job_result.get('message', '알 수 없는 오류')}"]
+        job_data = job_result["result"].get("items", [])
+        job_data = self.filter_and_sort_jobs_by_region(job_data, region_code)
+        return [self.format_job_results(job_data, limit=5, region_name=region_name)]
+
+    async def _search_realestate(self, intent: Dict[str, Any], region_code: str, region_name: str, deadline: Deadline) -> Optional[List[str]]:
+        """부동산 섹션 (시간 초과면 None)"""
+        apt_tool, apt_args = self._realestate_call(region_code)
+        apt_result = await self._take_prefetched('realestate', apt_tool, apt_args, deadline) \
+            or await self.orchestrator.call_tool_async('realestate', apt_tool, apt_args, deadline=deadline)
+        if apt_result["status"] == "timeout":
+            return None
+        if apt_result["status"] != "success":
+            return [f"🏠 부동산 검색 실패: {apt_result.get('message', '알 수 없는 오류')}"]
+        apt_data = apt_result["result"].get("items", [])
+        return [self.format_realestate_results(apt_data, limit=5)]
+
+    async def _search_policies(self, intent: Dict[str, Any], region_code: str, region_name: str, deadline: Deadline) -> Optional[List[str]]:
+        """청년정책 섹션 (시간 초과면 None)"""
+        policy_args = self._policy_args(region_code)
+        policy_result = await self._take_prefetched('youth_policy', 'searchAllYouthPolicies', policy_args, deadline) \
+            or await self.orchestrator.call_tool_async('youth_policy', 'searchAllYouthPolicies', policy_args, deadline=deadline)
+        if policy_result["status"] == "timeout":
+            return None
+        if policy_result["status"] != "success":
+            return [f"📋 청년정책 검색 실패: {policy_result.get('message', '알 수 없는 오류')}"]
+        policies = policy_result["result"].get("items", [])
+        active_policies = self.filter_active_policies(policies)
+        active_policies = self.filter_and_sort_policies_by_region(active_policies, region_code)
+        active_policies = active_policies[:5]
+        texts = [self.format_policy_results(active_policies, limit=5, region_name=region_name)]
+        if len(policies) > len(active_policies):
+            texts.append(f"ℹ️ 총 {len(policies)}개 중 현재 신청 가능한 {len(active_policies)}개 정책을 표시했습니다.")
+        return texts
+
+    async def handle_search(self, intent: Dict[str, Any], on_section: Optional[Callable[[str], None]] = None) -> str:
+        """
+        검색 의도에 따라 적절한 검색 수행 (정책 검색 + 날짜 필터링).
+        채용정보·부동산·청년정책 검색을 동시에 실행하고, on_section이 있으면 끝나는 순서대로 섹션을 바로 넘김
+        (이때 반환값에는 시간 초과 안내처럼 마지막에 붙일 내용만 담김). 없으면 전체 결과를 정해진 순서로 합쳐 반환.
+        """
+        region_code = intent.get("region_mentioned") or self.state["region_code"]
 
-        except Exception as e:
-            return f"❌ 검색 중 오류가 발생했습니다: {str(e)}"
+        # ✅ 시군구 코드 검증
+        region = self.regions.get(region_code)
+        if region is None or region.is_sido:
+            return f"❌ 지원하지 않는 지역입니다: {region_code} (시군구 이름이나 5자리 법정동 코드로 지정해 주세요)"
 
-        if results:
-            return f"\n🔍 **{region_name} 검색 결과**\n\n" + "\n\n".join(results)
-        else:
-            return "❌ 검색 결과를 찾을 수 없습니다."
-
-    def parse_apartment_xml(self, xml_text: str) -> List[Dict]:
-        """XML 형태의 아파트 데이터를 파싱"""
-        import xml.etree.ElementTree as ET
+        region_name = self.get_region_name(region_code)
+        header = f"\n🔍 **{region_name} 검색 결과**\n"
+        # 질의 하나에 전체 시간 예산(QUERY_BUDGET_SEC)을 두고, 각 하위 호출은 남은 시간만 씀
+        deadline = Deadline()
+
+        sections = [
+            ("채용정보", "📋", intent["search_jobs"], self._search_jobs),
+            ("부동산", "🏠", intent["search_realestate"], self._search_realestate),
+            ("청년정책", "📋", intent["search_policies"], self._search_policies),
+        ]
+        sections = [(label, icon, search) for label, icon, enabled, search in sections if enabled]
+        if sections:
+            print(" · ".join(f"{icon} {label}" for label, icon, _ in sections) + " 검색 중...")
+
+        async def run_section(index: int, label: str, search):
+            try:
+                return index, label, await search(intent, region_code, region_name, deadline)
+            except Exception as e:
+                return index, label, [f"❌ {label} 검색 중 오류가 발생했습니다: {str(e)}"]
+
+        tasks = [asyncio.create_task(run_section(i, label, search)) for i, (label, _, search) in enumerate(sections)]
+        finished: Dict[int, List[str]] = {}
+        timed_out = []
+        shown = False
         try:
-            root = ET.fromstring(xml_text)
-            items = root.findall('.//item')
-            apt_list = []
-            for item in items:
-                apt_data = {}
-                for child in item:
-                    apt_data[child.tag] = child.text.strip() if child.text else ""
-                apt_list.append(apt_data)
-            return apt_list
-        except Exception as e:
-            print(f"XML 파싱 오류: {e}")
-            return []
+            for next_done in asyncio.as_completed(tasks):
+                index, label, texts = await next_done
+                if texts is None:
+                    timed_out.append(label)
+                    continue
+                finished[index] = texts
+                if on_section is not None:
+                    on_section(("" if shown else header + "\n") + "\n\n".join(texts))
+                    shown = True
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        results = [] if on_section is not None else [text for index in sorted(finished) for text in finished[index]]
+        if timed_out:
+            results.append(
+                f"⏱️ **시간 초과**: {', '.join(timed_out)} 조회가 {deadline.budget:.0f}초 안에 끝나지 않아 제외했습니다. 잠시 후 다시 시도해 주세요."
+            )
+
+        if shown:
+            return "\n\n".join(results)
+        if results:
+            return header + "\n" + "\n\n".join(results)
+        return "❌ 검색 결과를 찾을 수 없습니다."
 
     async def run(self):
         """챗봇 메인 실행 루프"""
         print("🤖 통합 정보 조회 플랫폼이 시작되었습니다!")
         print("💼 채용정보 + 🏠 부동산 + 📋 청년정책을 통합 검색할 수 있습니다.")
         print("⏰ 현재 신청 가능한 정책만 표시됩니다.\n")
-        print("📍 지원 지역: 정선군(51770), 영월군(51750), 청양군(44790), 강릉시(51150), 김제시(52210)\n")
+        print(f"📍 지원 지역: 전국 {len(self.regions)}개 시군구 (현재: {self.get_region_name(self.state['region_code'])})\n")
 
         # 직무 분야 안내
         print("📋 **검색 가능한 직무 분야:**")
@@ -598,12 +750,15 @@ class PerfectChatbot:
         print("💡 예: '강릉시 통신 일자리', '영월군 의료 분야 채용' 등\n")
 
         self.print_help()
+        self.start_mirror_sync()
 
         while True:
             try:
-                user_input = input("\n💬 > ").strip()
-            except (EOFError, KeyboardInterrupt):
+                # 입력을 기다리는 동안에도 이벤트 루프의 백그라운드 작업이 계속 돌도록 비동기로 읽음
+                user_input = (await read_line("\n💬 > ")).strip()
+            except (EOFError, KeyboardInterrupt, asyncio.CancelledError):
                 print("\n👋 플랫폼을 종료합니다. 좋은 하루 되세요!")
+                self.shutdown()
                 break
 
             if not user_input:
@@ -612,6 +767,7 @@ class PerfectChatbot:
             # 명령어 처리
             if user_input.lower() in ["/exit", "exit", "quit", "종료"]:
                 print("👋 플랫폼을 종료합니다. 좋은 하루 되세요!")
+                self.shutdown()
                 break
 
             elif user_input.lower() in ["/help", "help", "도움말"]:
@@ -631,21 +787,20 @@ class PerfectChatbot:
 
             elif user_input.startswith("/region "):
                 raw = user_input.split(" ", 1)[1].strip()
-                new_code = None
-                # 코드로 입력
-                if raw in self.allowed_regions_code_to_name:
-                    new_code = raw
-                # 이름으로 입력
-                elif raw in self.allowed_regions_name_to_code:
-                    new_code = self.allowed_regions_name_to_code[raw]
-
-                if new_code:
-                    self.state["region_code"] = new_code
-                    region_name = self.get_region_name(new_code)
-                    print(f"📍 지역이 {region_name}({new_code})로 설정되었습니다.")
+                # 코드 또는 이름 (별칭, "강원 고성"처럼 시도를 붙인 이름 포함)
+                region = self.regions.resolve(raw)
+
+                if region:
+                    self.state["region_code"] = region.code
+                    print(f"📍 지역이 {region.label}({region.code})로 설정되었습니다.")
+                    self.start_prefetch()
                 else:
-                    allowed = ", ".join([f"{name}({code})" for code, name in self.allowed_regions_code_to_name.items()])
-                    print(f"❌ 지원하지 않는 지역입니다. 사용 가능 지역: {allowed}")
+                    candidates = self.regions.candidates(raw)
+                    if candidates:
+                        listed = ", ".join(f"{r.label}({r.code})" for r in candidates[:10])
+                        print(f"❓ 여러 지역이 해당됩니다: {listed} — 시도를 붙이거나 코드로 지정해 주세요.")
+                    else:
+                        print(f"❌ 지역을 찾을 수 없습니다: {raw}")
                 continue
 
             elif user_input.startswith("/date "):
@@ -653,6 +808,7 @@ class PerfectChatbot:
                 if len(date) == 6 and date.isdigit():
                     self.state["deal_ymd"] = date
                     print(f"📅 거래 년월이 {date}로 설정되었습니다.")
+                    self.start_prefetch()
                 else:
                     print("❌ 날짜 형식: YYYYMM (예: 202506)")
                 continue
@@ -671,9 +827,11 @@ class PerfectChatbot:
                 if field_name in self.job_fields:
                     self.state["job_field"] = self.job_fields[field_name]
                     print(f"🔧 직무 분야가 '{field_name}'로 설정되었습니다.")
+                    self.start_prefetch()
                 elif field_name == "전체":
                     self.state["job_field"] = None
                     print("🔧 직무 분야 필터가 해제되었습니다.")
+                    self.start_prefetch()
                 else:
                     print("❌ 사용 가능한 분야 일부:")
                     fields = list(self.job_fields.keys())[:12]
@@ -691,9 +849,31 @@ class PerfectChatbot:
                 print("🤔 무엇을 도와드릴까요? 예: '강릉시에서 통신 일자리와 아파트 매물, 정책 알려줘'")
                 continue
 
-            # 검색 실행
-            result = await self.handle_search(intent)
-            print(result)
+            # 검색 실행 (도메인별 결과는 도착하는 대로 출력)
+            result = await self.handle_search(intent, on_section=print)
+            if result:
+                print(result)
+
+
+async def read_line(prompt: str = "") -> str:
+    """
+    input()을 데몬 스레드에서 실행해 이벤트 루프를 막지 않고 한 줄을 읽음.
+    (asyncio.to_thread는 종료 시 입력 대기 중인 스레드를 기다리므로 Ctrl-C로 바로 끝나지 않음)
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def read():
+        try:
+            line = input(prompt)
+        except BaseException as e:  # EOFError 등
+            error = e
+            loop.call_soon_threadsafe(lambda: future.done() or future.set_exception(error))
+        else:
+            loop.call_soon_threadsafe(lambda: future.done() or future.set_result(line))
+
+    threading.Thread(target=read, name="stdin", daemon=True).start()
+    return await future
 
 
 async def main():
@@ -702,4 +882,7 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,701 @@
+# http_transport.py — 세 MCP 서버가 공유하는 HTTP 전송 계층
+# (keep-alive 연결 풀 + 호스트별로 성공한 TLS 모드 기억 + 시작 시 연결 예열)
+import asyncio
+import atexit
+import contextlib
+import contextvars
+import os
+import ssl
+import threading
+import time
+import weakref
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+
+import deadline
+import latency
+import resilience
+
+# 시도 순서: default → TLS1.2+SECLEVEL1 → verify=False
+TLS_MODES: Tuple[str, ...] = ("default", "tls12_seclevel1", "insecure")
+
+TIMEOUT = float(os.getenv("HTTP_TIMEOUT") or 20)
+# 기억한 모드가 더 안전한 모드보다 뒤에 있으면 이 주기마다 default부터 다시 탐색
+REPROBE_INTERVAL = float(os.getenv("HTTP_TLS_REPROBE_SEC") or 600)
+# 인증서 검증 없는 'insecure' 모드 허용 여부 (0이면 보안 모드만 사용)
+ALLOW_INSECURE = (os.getenv("HTTP_ALLOW_INSECURE") or "1").strip().lower() not in ("0", "false", "no")
+ENABLED_MODES: Tuple[str, ...] = tuple(m for m in TLS_MODES if m != "insecure" or ALLOW_INSECURE)
+# 경주(race) 모드: 모드를 모를 때 보안 모드들을 동시에(또는 STAGGER초 간격으로) 시도해 먼저 성공한 것을 사용
+RACE = (os.getenv("HTTP_TLS_RACE") or "0").strip().lower() in ("1", "true", "yes")
+RACE_STAGGER = float(os.getenv("HTTP_TLS_RACE_STAGGER") or 0.25)
+
+# 이 예외들은 TLS 모드 폴백 대상이 아님 (ConnectTimeout/ConnectError는 핸드셰이크 문제일 수 있어 폴백)
+_NOT_TLS_RELATED = (httpx.ReadTimeout, httpx.WriteTimeout, httpx.PoolTimeout)
+
+# 실제로 상위 API에 보낸 요청 수 (재시도·헤지 포함). 키 풀이 일일 한도에 그만큼 반영하도록 세어 둠
+_sent: contextvars.ContextVar[Optional[List[int]]] = contextvars.ContextVar("http_sent", default=None)
+
+
+@contextlib.contextmanager
+def count_sent() -> Iterator[List[int]]:
+    """이 블록 안에서 _attempt가 보낸 요청 수를 [n]으로 셈."""
+    counter = [0]
+    token = _sent.set(counter)
+    try:
+        yield counter
+    finally:
+        _sent.reset(token)
+
+
+def _note_sent() -> None:
+    counter = _sent.get()
+    if counter is not None:
+        counter[0] += 1
+
+
+LIMITS = httpx.Limits(
+    max_connections=int(os.getenv("HTTP_MAX_CONNECTIONS") or 100),
+    max_keepalive_connections=int(os.getenv("HTTP_MAX_KEEPALIVE") or 20),
+    keepalive_expiry=float(os.getenv("HTTP_KEEPALIVE_EXPIRY") or 60),
+)
+
+
+def _tls12_seclevel1_context() -> ssl.SSLContext:
+    """TLS 1.2 이상 + 낮은 보안 레벨(일부 구형 서버/프록시 대응)"""
+    tls = ssl.create_default_context()
+    tls.minimum_version = ssl.TLSVersion.TLSv1_2
+    # 일부 공공/기관망 장비가 오래된 cipher만 허용 → OpenSSL3 기본 보안레벨과 충돌
+    try:
+        tls.set_ciphers("DEFAULT:@SECLEVEL=1")
+    except Exception:
+        pass
+    return tls
+
+
+def _verify_for(mode: str) -> Any:
+    if mode == "default":
+        return True
+    if mode == "tls12_seclevel1":
+        return _tls12_seclevel1_context()
+    # 최후 수단: 인증서 검증 비활성화 (성공 시에도 ssl_mode로 'insecure'가 내려갑니다)
+    return False
+
+
+def _within_deadline(timeout: httpx.Timeout) -> httpx.Timeout:
+    """질의 데드라인이 있으면 각 단계 타임아웃을 남은 시간으로 줄임. 이미 지났으면 DeadlineExceeded."""
+    dl = deadline.current()
+    if dl is None:
+        return timeout
+    remaining = dl.check("HTTP 요청")
+
+    def _cap(value: Optional[float]) -> float:
+        return remaining if value is None else min(value, remaining)
+
+    return httpx.Timeout(
+        connect=_cap(timeout.connect), read=_cap(timeout.read), write=_cap(timeout.write), pool=_cap(timeout.pool)
+    )
+
+
+def _retry_delay(attempt: int) -> Optional[float]:
+    """다음 재시도까지 쉴 시간. 데드라인 안에 재시도할 여유가 없으면 None."""
+    delay = resilience.backoff_delay(attempt)
+    left = deadline.remaining()
+    if left is not None and delay >= left:
+        return None
+    return delay
+
+
+def _deadline_error(err: BaseException) -> Optional[deadline.DeadlineExceeded]:
+    """데드라인 때문에 끊긴 실패면 DeadlineExceeded로 바꿈 (서킷 실패로 세지 않기 위해)."""
+    if isinstance(err, deadline.DeadlineExceeded):
+        return err
+    dl = deadline.current()
+    if dl is not None and dl.expired and isinstance(err, httpx.TimeoutException):
+        return deadline.DeadlineExceeded(f"질의 시간 예산 {dl.budget:.0f}초를 초과했습니다 (HTTP 요청)")
+    return None
+
+
+def _close_loser(future: Future) -> None:
+    """경쟁에서 진 요청의 응답을 닫음 (실패했거나 취소됐으면 할 일 없음)."""
+    if future.cancelled() or future.exception() is not None:
+        return
+    try:
+        future.result().close()
+    except Exception:
+        pass
+
+
+class TlsModeMemory:
+    """호스트별로 마지막에 성공한 TLS 모드를 기억."""
+
+    def __init__(self, reprobe_interval: float = REPROBE_INTERVAL):
+        self.reprobe_interval = reprobe_interval
+        self._modes: Dict[str, Tuple[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def plan(self, host: str) -> Tuple[List[str], bool]:
+        """
+        이번 요청에서 시도할 모드 순서와 재탐색 여부를 반환.
+        기억한 모드가 있으면 그것부터, 재탐색 주기가 지났으면 default부터 시도.
+        """
+        with self._lock:
+            entry = self._modes.get(host)
+        if entry is None or entry[0] not in ENABLED_MODES:
+            return list(ENABLED_MODES), True
+        mode, learned_at = entry
+        if mode != ENABLED_MODES[0] and time.monotonic() - learned_at >= self.reprobe_interval:
+            return list(ENABLED_MODES), True
+        return [mode] + [m for m in ENABLED_MODES if m != mode], False
+
+    def remember(self, host: str, mode: str, probed: bool) -> None:
+        with self._lock:
+            entry = self._modes.get(host)
+            # 같은 모드가 계속 성공하는 동안에는 시각을 갱신하지 않아야 주기적 재탐색이 일어남
+            if probed or entry is None or entry[0] != mode:
+                self._modes[host] = (mode, time.monotonic())
+
+    def forget(self, host: str) -> None:
+        with self._lock:
+            self._modes.pop(host, None)
+
+    def snapshot(self) -> Dict[str, str]:
+        with self._lock:
+            return {host: mode for host, (mode, _) in self._modes.items()}
+
+
+class HttpTransport:
+    """TLS 모드별로 장수(long-lived) httpx.Client를 하나씩 두고 재사용하는 전송 계층."""
+
+    def __init__(
+        self,
+        timeout: float = TIMEOUT,
+        memory: Optional[TlsModeMemory] = None,
+        breakers: Optional[resilience.BreakerRegistry] = None,
+        retries: int = resilience.RETRIES,
+        tracker: Optional[latency.LatencyTracker] = None,
+    ):
+        self.timeout = timeout
+        self.memory = memory or TlsModeMemory()
+        self.breakers = breakers or resilience.BreakerRegistry()
+        self.retries = retries
+        self.latency = tracker or latency.LatencyTracker()
+        self._clients: Dict[str, httpx.Client] = {}
+        self._unavailable: set = set()
+        self._lock = threading.Lock()
+
+    def _client(self, mode: str) -> Optional[httpx.Client]:
+        client = self._clients.get(mode)
+        if client is not None:
+            return client
+        with self._lock:
+            client = self._clients.get(mode)
+            if client is None and mode not in self._unavailable:
+                try:
+                    client = httpx.Client(
+                        verify=_verify_for(mode),
+                        http2=False,
+                        timeout=self.timeout,
+                        limits=LIMITS,
+                        trust_env=True,
+                    )
+                except Exception:
+                    # 이 환경에서 만들 수 없는 모드(예: SSLContext 생성 실패)는 건너뜀
+                    self._unavailable.add(mode)
+                    return None
+                self._clients[mode] = client
+            return client
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: Any = httpx.USE_CLIENT_DEFAULT,
+    ) -> Tuple[str, httpx.Response]:
+        """
+        호스트별 계획된 순서로 TLS 모드를 시도. 성공하면 (mode, response) 반환.
+        전부 실패하면 마지막 예외를 다시 던짐.
+        """
+        host = urlsplit(url).netloc
+        modes, probing = self.memory.plan(host)
+        if RACE and probing:
+            return self._race(method, url, params, host, modes, timeout)
+        last_err: Optional[Exception] = None
+        for mode in modes:
+            client = self._client(mode)
+            if client is None:
+                continue
+            try:
+                resp = client.request(method, url, params=params, timeout=timeout)
+            except _NOT_TLS_RELATED:
+                # 연결·핸드셰이크는 이미 끝났으므로 다른 TLS 모드로 바꿔도 소용없음
+                raise
+            except Exception as e:
+                last_err = e
+                continue
+            self.memory.remember(host, mode, probing)
+            return mode, resp
+        self.memory.forget(host)
+        if last_err:
+            raise last_err
+        raise RuntimeError("No HTTP client candidates available")
+
+    def _race(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]],
+        host: str,
+        modes: List[str],
+        timeout: Any = httpx.USE_CLIENT_DEFAULT,
+    ) -> Tuple[str, httpx.Response]:
+        """
+        보안 모드들을 RACE_STAGGER초 간격(0이면 동시에)으로 시작해 먼저 성공한 응답을 사용.
+        앞선 시도가 실패하면 다음 모드를 바로 시작하고, 'insecure'는 보안 모드가 모두 실패했을 때만 시도.
+        """
+        remaining = [m for m in modes if m != "insecure"]
+        pending: Dict[Future, str] = {}
+        last_err: Optional[Exception] = None
+        while remaining or pending:
+            while remaining:
+                mode = remaining.pop(0)
+                client = self._client(mode)
+                if client is not None:
+                    pending[_race_executor().submit(client.request, method, url, params=params, timeout=timeout)] = mode
+                    break
+            if not pending:
+                break
+            done, _ = wait(list(pending), timeout=RACE_STAGGER if remaining else None, return_when=FIRST_COMPLETED)
+            # 동시에 끝났으면 더 안전한 모드를 우선
+            for future in sorted(done, key=lambda f: TLS_MODES.index(pending[f])):
+                mode = pending.pop(future)
+                try:
+                    resp = future.result()
+                except Exception as e:
+                    last_err = e
+                    continue
+                # 아직 시작 전인 시도는 취소하고, 이미 진행 중인 요청은 끝나는 대로 응답을 닫아 연결을 돌려줌
+                for other in pending:
+                    if not other.cancel():
+                        other.add_done_callback(_close_loser)
+                self.memory.remember(host, mode, True)
+                return mode, resp
+        if "insecure" in modes:
+            client = self._client("insecure")
+            if client is not None:
+                try:
+                    resp = client.request(method, url, params=params, timeout=timeout)
+                except Exception as e:
+                    last_err = e
+                else:
+                    self.memory.remember(host, "insecure", True)
+                    return "insecure", resp
+        self.memory.forget(host)
+        if last_err:
+            raise last_err
+        raise RuntimeError("No HTTP client candidates available")
+
+    def _timed(self, url: str, params: Optional[Dict[str, Any]], timeout: httpx.Timeout) -> Tuple[str, httpx.Response]:
+        start = time.monotonic()
+        try:
+            result = self.request("GET", url, params, timeout)
+        except httpx.TimeoutException:
+            self.latency.record(url, time.monotonic() - start)
+            raise
+        self.latency.record(url, time.monotonic() - start)
+        return result
+
+    def _attempt(self, url: str, params: Optional[Dict[str, Any]]) -> Tuple[str, httpx.Response]:
+        """
+        관측된 지연 분포로 정한 타임아웃으로 한 번 시도. p95가 지나도 응답이 없으면
+        같은 요청을 한 번 더(헤지) 보내 먼저 성공한 응답을 사용.
+        """
+        timeout = _within_deadline(self.latency.timeout_for(url))
+        hedge_after = self.latency.hedge_delay(url)
+        _note_sent()
+        if hedge_after is None:
+            return self._timed(url, params, timeout)
+        primary = _hedge_executor().submit(self._timed, url, params, timeout)
+        done, _ = wait([primary], timeout=hedge_after)
+        if done:
+            return primary.result()
+        self.latency.note_hedge()
+        _note_sent()
+        hedge = _hedge_executor().submit(self._timed, url, params, timeout)
+        last_err: Optional[BaseException] = None
+        for future in as_completed([primary, hedge]):
+            try:
+                result = future.result()
+            except Exception as e:
+                last_err = e
+                continue
+            if future is hedge:
+                self.latency.note_hedge_win()
+            return result
+        raise last_err
+
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None) -> Tuple[str, httpx.Response]:
+        """
+        서킷 브레이커를 거쳐 GET. 연결 실패와 5xx 응답은 지터 섞인 지수 백오프로 재시도하고,
+        끝내 실패하면 (호스트, 엔드포인트) 서킷에 실패로 기록.
+        """
+        deadline.check(url)
+        breaker = self.breakers.get(url)
+        breaker.before_call()
+        attempt = 0
+        while True:
+            try:
+                mode, resp = self._attempt(url, params)
+            except Exception as e:
+                expired = _deadline_error(e)
+                if expired is not None:
+                    breaker.release()
+                    raise expired from e
+                delay = _retry_delay(attempt) if attempt < self.retries else None
+                if resilience.is_transient_error(e) and delay is not None:
+                    time.sleep(delay)
+                    attempt += 1
+                    continue
+                breaker.record_failure()
+                raise
+            if resilience.is_transient_status(resp.status_code):
+                delay = _retry_delay(attempt) if attempt < self.retries else None
+                if delay is not None:
+                    time.sleep(delay)
+                    attempt += 1
+                    continue
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            return mode, resp
+
+    def prewarm(self, urls: Iterable[str], background: bool = True) -> Optional[threading.Thread]:
+        """
+        서버 시작 시 대상 호스트로 HEAD 요청을 보내 TCP+TLS 연결을 미리 맺고
+        동작하는 TLS 모드를 학습해 둠. 실패해도 조용히 무시.
+        """
+        targets = list(urls)
+
+        def _warm():
+            for url in targets:
+                try:
+                    self.request("HEAD", url)
+                except Exception:
+                    pass
+
+        if not background:
+            _warm()
+            return None
+        thread = threading.Thread(target=_warm, name="http-prewarm", daemon=True)
+        thread.start()
+        return thread
+
+    def close(self) -> None:
+        with self._lock:
+            clients, self._clients = list(self._clients.values()), {}
+        for client in clients:
+            try:
+                client.close()
+            except Exception:
+                pass
+
+
+class AsyncHttpTransport:
+    """
+    HttpTransport의 비동기 버전. TLS 모드별 httpx.AsyncClient를 이벤트 루프마다 하나씩 두고,
+    TLS 모드 기억(TlsModeMemory)은 동기 전송 계층과 공유.
+    """
+
+    def __init__(
+        self,
+        timeout: float = TIMEOUT,
+        memory: Optional[TlsModeMemory] = None,
+        breakers: Optional[resilience.BreakerRegistry] = None,
+        retries: int = resilience.RETRIES,
+        tracker: Optional[latency.LatencyTracker] = None,
+    ):
+        self.timeout = timeout
+        self.memory = memory or TlsModeMemory()
+        self.breakers = breakers or resilience.BreakerRegistry()
+        self.retries = retries
+        self.latency = tracker or latency.LatencyTracker()
+        # AsyncClient는 생성된 이벤트 루프에 묶이므로 루프별로 따로 보관
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, httpx.AsyncClient]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._unavailable: set = set()
+        self._lock = threading.Lock()
+
+    def _client(self, mode: str) -> Optional[httpx.AsyncClient]:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            clients = self._clients.setdefault(loop, {})
+            client = clients.get(mode)
+            if client is None and mode not in self._unavailable:
+                try:
+                    client = httpx.AsyncClient(
+                        verify=_verify_for(mode),
+                        http2=False,
+                        timeout=self.timeout,
+                        limits=LIMITS,
+                        trust_env=True,
+                    )
+                except Exception:
+                    self._unavailable.add(mode)
+                    return None
+                clients[mode] = client
+            return client
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: Any = httpx.USE_CLIENT_DEFAULT,
+    ) -> Tuple[str, httpx.Response]:
+        """HttpTransport.request와 같은 규칙으로 TLS 모드를 시도하는 비동기 버전."""
+        host = urlsplit(url).netloc
+        modes, probing = self.memory.plan(host)
+        if RACE and probing:
+            return await self._race(method, url, params, host, modes, timeout)
+        last_err: Optional[Exception] = None
+        for mode in modes:
+            client = self._client(mode)
+            if client is None:
+                continue
+            try:
+                resp = await client.request(method, url, params=params, timeout=timeout)
+            except _NOT_TLS_RELATED:
+                # 연결·핸드셰이크는 이미 끝났으므로 다른 TLS 모드로 바꿔도 소용없음
+                raise
+            except Exception as e:
+                last_err = e
+                continue
+            self.memory.remember(host, mode, probing)
+            return mode, resp
+        self.memory.forget(host)
+        if last_err:
+            raise last_err
+        raise RuntimeError("No HTTP client candidates available")
+
+    async def _race(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]],
+        host: str,
+        modes: List[str],
+        timeout: Any = httpx.USE_CLIENT_DEFAULT,
+    ) -> Tuple[str, httpx.Response]:
+        """HttpTransport._race의 비동기 버전. 이긴 요청 외의 진행 중인 요청은 취소."""
+        remaining = [m for m in modes if m != "insecure"]
+        pending: Dict[asyncio.Task, str] = {}
+        last_err: Optional[Exception] = None
+        try:
+            while remaining or pending:
+                while remaining:
+                    mode = remaining.pop(0)
+                    client = self._client(mode)
+                    if client is not None:
+                        pending[asyncio.ensure_future(client.request(method, url, params=params, timeout=timeout))] = mode
+                        break
+                if not pending:
+                    break
+                done, _ = await asyncio.wait(
+                    list(pending), timeout=RACE_STAGGER if remaining else None, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in sorted(done, key=lambda t: TLS_MODES.index(pending[t])):
+                    mode = pending.pop(task)
+                    try:
+                        resp = task.result()
+                    except Exception as e:
+                        last_err = e
+                        continue
+                    self.memory.remember(host, mode, True)
+                    return mode, resp
+        finally:
+            for task in pending:
+                task.cancel()
+        if "insecure" in modes:
+            client = self._client("insecure")
+            if client is not None:
+                try:
+                    resp = await client.request(method, url, params=params, timeout=timeout)
+                except Exception as e:
+                    last_err = e
+                else:
+                    self.memory.remember(host, "insecure", True)
+                    return "insecure", resp
+        self.memory.forget(host)
+        if last_err:
+            raise last_err
+        raise RuntimeError("No HTTP client candidates available")
+
+    async def _timed(
+        self, url: str, params: Optional[Dict[str, Any]], timeout: httpx.Timeout
+    ) -> Tuple[str, httpx.Response]:
+        start = time.monotonic()
+        try:
+            result = await self.request("GET", url, params, timeout)
+        except httpx.TimeoutException:
+            self.latency.record(url, time.monotonic() - start)
+            raise
+        self.latency.record(url, time.monotonic() - start)
+        return result
+
+    async def _attempt(self, url: str, params: Optional[Dict[str, Any]]) -> Tuple[str, httpx.Response]:
+        """HttpTransport._attempt의 비동기 버전. 헤지에서 진 요청은 취소."""
+        timeout = _within_deadline(self.latency.timeout_for(url))
+        hedge_after = self.latency.hedge_delay(url)
+        _note_sent()
+        if hedge_after is None:
+            return await self._timed(url, params, timeout)
+        primary = asyncio.ensure_future(self._timed(url, params, timeout))
+        hedge: Optional[asyncio.Task] = None
+        try:
+            done, _ = await asyncio.wait([primary], timeout=hedge_after)
+            if done:
+                return primary.result()
+            self.latency.note_hedge()
+            _note_sent()
+            hedge = asyncio.ensure_future(self._timed(url, params, timeout))
+            pending = {primary, hedge}
+            last_err: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        last_err = e
+                        continue
+                    if task is hedge:
+                        self.latency.note_hedge_win()
+                    return result
+            raise last_err
+        finally:
+            for task in (primary, hedge):
+                if task is not None and not task.done():
+                    task.cancel()
+
+    async def get(self, url: str, params: Optional[Dict[str, Any]] = None) -> Tuple[str, httpx.Response]:
+        """HttpTransport.get과 같은 서킷 브레이커/재시도 규칙의 비동기 버전."""
+        deadline.check(url)
+        breaker = self.breakers.get(url)
+        breaker.before_call()
+        attempt = 0
+        while True:
+            try:
+                mode, resp = await self._attempt(url, params)
+            except Exception as e:
+                expired = _deadline_error(e)
+                if expired is not None:
+                    breaker.release()
+                    raise expired from e
+                delay = _retry_delay(attempt) if attempt < self.retries else None
+                if resilience.is_transient_error(e) and delay is not None:
+                    await asyncio.sleep(delay)
+                    attempt += 1
+                    continue
+                breaker.record_failure()
+                raise
+            if resilience.is_transient_status(resp.status_code):
+                delay = _retry_delay(attempt) if attempt < self.retries else None
+                if delay is not None:
+                    await asyncio.sleep(delay)
+                    attempt += 1
+                    continue
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            return mode, resp
+
+    async def aclose(self) -> None:
+        """현재 이벤트 루프에 묶인 클라이언트들을 닫음."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            clients = self._clients.pop(loop, {})
+        for client in clients.values():
+            try:
+                await client.aclose()
+            except Exception:
+                pass
+
+
+# 헤지(_attempt)와 TLS 모드 경쟁(_race)은 풀을 따로 씀: 헤지 작업 스레드가 _race를 거쳐 경쟁 요청이 끝나길
+# 기다리므로, 같은 풀이면 헤지 작업이 풀을 다 차지했을 때 경쟁 요청이 시작되지 못해 서로 기다리게 됨.
+# 경쟁 풀의 작업(client.request)은 다른 풀 작업을 기다리지 않음.
+_pools: Dict[str, ThreadPoolExecutor] = {}
+
+
+def _executor(name: str, workers: int = 16) -> ThreadPoolExecutor:
+    pool = _pools.get(name)
+    if pool is None:
+        with _transport_lock:
+            pool = _pools.get(name)
+            if pool is None:
+                pool = _pools[name] = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=name)
+    return pool
+
+
+def _race_executor() -> ThreadPoolExecutor:
+    return _executor("tls-race")
+
+
+def _hedge_executor() -> ThreadPoolExecutor:
+    return _executor("hedge")
+
+
+_memory = TlsModeMemory()
+# 동기/비동기 경로가 같은 호스트 상태를 보도록 서킷 브레이커도 공유
+_breakers = resilience.BreakerRegistry()
+_latency = latency.LatencyTracker()
+_transport: Optional[HttpTransport] = None
+_async_transport: Optional[AsyncHttpTransport] = None
+_transport_lock = threading.Lock()
+
+
+def get_transport() -> HttpTransport:
+    """프로세스 전체가 공유하는 HttpTransport 싱글턴."""
+    global _transport
+    if _transport is None:
+        with _transport_lock:
+            if _transport is None:
+                _transport = HttpTransport(memory=_memory, breakers=_breakers, tracker=_latency)
+                atexit.register(_transport.close)
+    return _transport
+
+
+def get_async_transport() -> AsyncHttpTransport:
+    """프로세스 전체가 공유하는 AsyncHttpTransport 싱글턴 (TLS 모드 기억은 동기 버전과 공유)."""
+    global _async_transport
+    if _async_transport is None:
+        with _transport_lock:
+            if _async_transport is None:
+                _async_transport = AsyncHttpTransport(memory=_memory, breakers=_breakers, tracker=_latency)
+    return _async_transport
+
+
+def prewarm(urls: Iterable[str], background: bool = True) -> Optional[threading.Thread]:
+    return get_transport().prewarm(urls, background=background)
+
+
+def circuit_state(url: str) -> str:
+    """해당 URL(호스트+엔드포인트) 서킷의 현재 상태: closed / open / half_open."""
+    return _breakers.state(url)
+
+
+def circuit_snapshot() -> Dict[str, Dict[str, Any]]:
+    return _breakers.snapshot()
+
+
+def stats() -> Dict[str, Any]:
+    """전송 계층 상태: 호스트별 TLS 모드, 서킷 상태, 엔드포인트별 지연 분포와 헤지 통계."""
+    return {
+        "tls_modes": _memory.snapshot(),
+        "circuits": _breakers.snapshot(),
+        "latency": _latency.snapshot(),
+    }
@@ -0,0 +1,95 @@
+# keyword_matcher.py — 여러 키워드 사전을 한 번에 컴파일해 입력을 한 번만 훑어 모든 일치를 찾는 Aho-Corasick 자동자
+# (키워드마다 `keyword in text`를 반복하면 사전 크기에 비례해 느려지지만, 자동자는 입력 길이 + 일치 수에만 비례)
+from collections import deque
+from typing import Any, Dict, Iterable, List, Tuple
+
+Match = Tuple[int, int, Any]  # (시작, 끝, payload) — text[시작:끝]이 키워드
+
+
+class KeywordMatcher:
+    """
+    add(keyword, payload)로 키워드를 넣고 find_all(text)로 겹치는 것까지 모든 일치를 찾음.
+    같은 키워드에 payload를 여러 개 붙일 수 있음. 키워드를 더 넣으면 다음 검색 때 다시 컴파일.
+    """
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # 상태별로 끝나는 키워드의 (길이, payload). _out은 실패 링크로 이어지는 접미 키워드의 출력까지 합친 것
+        self._own: List[List[Tuple[int, Any]]] = [[]]
+        self._out: List[List[Tuple[int, Any]]] = [[]]
+        self._keywords = 0
+        self._compiled = True
+
+    def __len__(self) -> int:
+        return self._keywords
+
+    def add(self, keyword: str, payload: Any) -> None:
+        if not keyword:
+            return
+        state = 0
+        for ch in keyword:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._own.append([])
+            state = nxt
+        if not self._own[state]:
+            self._keywords += 1
+        self._own[state].append((len(keyword), payload))
+        self._compiled = False
+
+    def add_many(self, keywords: Iterable[str], payload: Any) -> None:
+        for keyword in keywords:
+            self.add(keyword, payload)
+
+    def compile(self) -> "KeywordMatcher":
+        """너비 우선으로 실패 링크를 만들고, 접미 키워드의 출력을 각 상태에 합쳐 둠."""
+        self._out = [list(own) for own in self._own]
+        queue = deque()
+        for nxt in self._goto[0].values():
+            self._fail[nxt] = 0
+            queue.append(nxt)
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] = self._own[nxt] + self._out[self._fail[nxt]]
+                queue.append(nxt)
+        self._compiled = True
+        return self
+
+    def find_all(self, text: str) -> List[Match]:
+        """모든 일치 (겹침 포함, 끝 위치 순)."""
+        if not self._compiled:
+            self.compile()
+        goto, fail, out = self._goto, self._fail, self._out
+        matches: List[Match] = []
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                end = i + 1
+                for length, payload in out[state]:
+                    matches.append((end - length, end, payload))
+        return matches
+
+
+def leftmost_longest(matches: Iterable[Match]) -> List[Match]:
+    """겹치는 일치 중 왼쪽부터 가장 긴 것만 남김 (사전에서 가장 긴 이름을 우선하는 탐욕 분할과 같은 결과)."""
+    result: List[Match] = []
+    cursor = 0
+    for start, end, payload in sorted(matches, key=lambda m: (m[0], m[0] - m[1])):
+        if start >= cursor:
+            result.append((start, end, payload))
+            cursor = end
+    return result
@@ -0,0 +1,136 @@
+# latency.py — 엔드포인트별 응답 시간 분포로 타임아웃과 헤지(hedge) 시점을 정함
+import bisect
+import os
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+
+WINDOW = int(os.getenv("LATENCY_WINDOW") or 256)
+MIN_SAMPLES = int(os.getenv("LATENCY_MIN_SAMPLES") or 20)
+
+MAX_TIMEOUT = float(os.getenv("HTTP_TIMEOUT") or 20)
+MIN_READ_TIMEOUT = float(os.getenv("HTTP_MIN_READ_TIMEOUT") or 2)
+MIN_CONNECT_TIMEOUT = float(os.getenv("HTTP_MIN_CONNECT_TIMEOUT") or 2)
+MAX_CONNECT_TIMEOUT = float(os.getenv("HTTP_MAX_CONNECT_TIMEOUT") or 10)
+# p99의 몇 배까지 기다릴지 (느려지는 추세에도 바로 끊기지 않도록 여유를 둠)
+READ_TIMEOUT_FACTOR = float(os.getenv("HTTP_READ_TIMEOUT_FACTOR") or 2)
+
+# 헤지 요청: p95를 넘긴 호출에 한해 같은 요청을 한 번 더 보내 먼저 끝난 것을 사용
+HEDGE = (os.getenv("HTTP_HEDGE") or "1").strip().lower() not in ("0", "false", "no")
+# 헤지도 일일 호출 한도를 쓰므로 전체 요청 대비 비율 상한을 둠
+HEDGE_MAX_RATIO = float(os.getenv("HTTP_HEDGE_MAX_RATIO") or 0.05)
+MIN_HEDGE_DELAY = float(os.getenv("HTTP_MIN_HEDGE_DELAY") or 0.05)
+
+
+def _clamp(value: float, low: float, high: float) -> float:
+    return max(low, min(high, value))
+
+
+class LatencyWindow:
+    """최근 WINDOW개 응답 시간(초)을 보관하고 정렬된 사본으로 백분위수를 계산."""
+
+    def __init__(self, size: int = WINDOW):
+        self._samples: Deque[float] = deque(maxlen=size)
+        self._sorted: List[float] = []
+
+    def add(self, seconds: float) -> None:
+        if len(self._samples) == self._samples.maxlen:
+            old = self._samples[0]
+            del self._sorted[bisect.bisect_left(self._sorted, old)]
+        self._samples.append(seconds)
+        bisect.insort(self._sorted, seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self._sorted:
+            return None
+        index = min(len(self._sorted) - 1, int(q / 100.0 * len(self._sorted)))
+        return self._sorted[index]
+
+
+class LatencyTracker:
+    """(호스트, 엔드포인트 경로)별 LatencyWindow와 헤지 예산을 관리."""
+
+    def __init__(self, hedge: bool = HEDGE, hedge_max_ratio: float = HEDGE_MAX_RATIO):
+        self.hedge = hedge
+        self.hedge_max_ratio = hedge_max_ratio
+        self._windows: Dict[Tuple[str, str], LatencyWindow] = {}
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    @staticmethod
+    def _key(url: str) -> Tuple[str, str]:
+        parts = urlsplit(url)
+        return parts.netloc, parts.path.rstrip("/") or "/"
+
+    def record(self, url: str, seconds: float) -> None:
+        """완료된 요청의 소요 시간. 타임아웃으로 끝난 요청도 그때까지의 시간을 기록해 분포가 따라 늘어나게 함."""
+        key = self._key(url)
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None:
+                window = self._windows[key] = LatencyWindow()
+            window.add(seconds)
+
+    def _percentiles(self, url: str, *qs: float) -> Optional[Tuple[float, ...]]:
+        with self._lock:
+            window = self._windows.get(self._key(url))
+            if window is None or len(window) < MIN_SAMPLES:
+                return None
+            return tuple(window.percentile(q) for q in qs)
+
+    def timeout_for(self, url: str) -> httpx.Timeout:
+        """관측된 p90/p99로 연결·읽기 타임아웃을 정함. 표본이 적으면 고정값(HTTP_TIMEOUT)."""
+        ps = self._percentiles(url, 90, 99)
+        if ps is None:
+            return httpx.Timeout(MAX_TIMEOUT)
+        p90, p99 = ps
+        read = _clamp(p99 * READ_TIMEOUT_FACTOR, MIN_READ_TIMEOUT, MAX_TIMEOUT)
+        connect = _clamp(p90 * 1.5, MIN_CONNECT_TIMEOUT, MAX_CONNECT_TIMEOUT)
+        return httpx.Timeout(read, connect=connect, pool=connect)
+
+    def hedge_delay(self, url: str) -> Optional[float]:
+        """헤지 요청을 보낼 시점(p95). 헤지 꺼짐·표본 부족·예산 초과면 None."""
+        if not self.hedge:
+            return None
+        with self._lock:
+            self.requests += 1
+            if self.hedges >= self.hedge_max_ratio * self.requests:
+                return None
+        ps = self._percentiles(url, 95)
+        if ps is None:
+            return None
+        return max(MIN_HEDGE_DELAY, ps[0])
+
+    def note_hedge(self) -> None:
+        with self._lock:
+            self.hedges += 1
+
+    def note_hedge_win(self) -> None:
+        with self._lock:
+            self.hedge_wins += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            endpoints = {
+                f"{host}{path}": {
+                    "samples": len(w),
+                    "p50": w.percentile(50),
+                    "p95": w.percentile(95),
+                    "p99": w.percentile(99),
+                }
+                for (host, path), w in self._windows.items()
+            }
+            return {
+                "endpoints": endpoints,
+                "requests": self.requests,
+                "hedges": self.hedges,
+                "hedge_wins": self.hedge_wins,
+            }
@@ -0,0 +1,166 @@
+# mcp_common.py — 세 MCP 서버가 같이 쓰는 도구 등록 도우미(동기·비동기 짝 생성), 공통 오류 응답, 상태 도구
+import asyncio
+import functools
+import inspect
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+import deadline
+import http_transport
+import projection
+import quota
+import response_cache
+
+Request = Callable[..., Dict[str, Any]]
+
+# FastMCP 인스턴스별로 이 모듈을 거쳐 등록한 도구 {이름: 함수}.
+# 오케스트레이터가 FastMCP 내부 등록부를 뒤지지 않고 여기서 디스패치 표를 만듦
+_registry: "weakref.WeakKeyDictionary[Any, Dict[str, Callable[..., Any]]]" = weakref.WeakKeyDictionary()
+
+
+def quota_error(url: str, e: Exception) -> Dict[str, Any]:
+    if isinstance(e, quota.RateLimited):
+        # 일일 한도 소진이 아니므로 오케스트레이터가 그날 이 엔드포인트를 건너뛰지 않도록 따로 구분
+        return {
+            "status": "error",
+            "message": str(e),
+            "request_url": url,
+            "rate_limited": True,
+        }
+    return {
+        "status": "error",
+        "message": str(e),
+        "request_url": url,
+        "quota_exhausted": True,
+    }
+
+
+def deadline_error(url: str, e: Exception) -> Dict[str, Any]:
+    return {
+        "status": "timeout",
+        "message": str(e),
+        "request_url": url,
+    }
+
+
+def _mcp_kwargs(signature: inspect.Signature, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    FastMCP는 `**kwargs` 매개변수를 'kwargs'라는 필드 하나(dict)로 받아 그 이름 그대로 넘기므로,
+    동기 버전과 같은 모양이 되도록 펼침.
+    """
+    var_kw = next((p.name for p in signature.parameters.values() if p.kind is p.VAR_KEYWORD), None)
+    if var_kw is None or not isinstance(kwargs.get(var_kw), dict):
+        return kwargs
+    extra = kwargs[var_kw]
+    return {**{k: v for k, v in kwargs.items() if k != var_kw}, **extra}
+
+
+def _shape_args(signature: inspect.Signature, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Tuple[Any, bool]:
+    """도구 인자에서 응답 축약 옵션(fields, compact)을 꺼냄."""
+    bound = signature.bind(*args, **kwargs)
+    return bound.arguments.get("fields"), bool(bound.arguments.get("compact", False))
+
+
+def request_deadline(mcp) -> Optional[deadline.Deadline]:
+    """워커 풀 등 MCP 클라이언트가 요청 _meta로 보낸 남은 시간 (없으면 None)."""
+    try:
+        meta = mcp.get_context().request_context.meta
+    except (LookupError, ValueError):  # MCP 요청 밖에서 부름
+        return None
+    return deadline.from_meta(meta.model_extra if meta is not None else None)
+
+
+def add_tool(mcp, fn: Callable[..., Any], name: Optional[str] = None) -> Callable[..., Any]:
+    """mcp에 도구를 등록하고 registered_tools에도 기록."""
+    name = name or fn.__name__
+    mcp.tool(name=name)(fn)
+    _registry.setdefault(mcp, {})[name] = fn
+    return fn
+
+
+def registered_tools(mcp) -> Dict[str, Callable[..., Any]]:
+    """add_tool로 등록한 도구 {이름: 함수} (등록 순서)."""
+    return dict(_registry.get(mcp, {}))
+
+
+def _register(mcp, name: str, fn_async: Callable[..., Awaitable[Any]], fn_sync: Callable[..., Any]) -> None:
+    # 오케스트레이터는 MCP 도구의 sync_twin을 찾아 작업 스레드에서 동기 버전을 바로 부름
+    fn_async.__name__ = fn_async.__qualname__ = name + "_async"
+    fn_async.sync_twin = fn_sync
+    add_tool(mcp, fn_async, name)
+
+
+def twin_tool(mcp, call: Callable[..., Dict[str, Any]], call_async: Callable[..., Awaitable[Dict[str, Any]]]):
+    """
+    요청 인자만 만드는 함수 하나로 동기 도구와 MCP에 등록할 비동기 도구를 함께 만드는 데코레이터.
+    - 꾸민 함수의 시그니처·설명이 도구 스키마가 되고, 반환한 dict를 call / call_async에 키워드 인자로 넘김
+    - 동기 버전(모듈에 남는 이름): call → projection.project. 오케스트레이터 등 프로세스 내부 호출용
+    - 비동기 버전: await call_async → projection.for_mcp. 같은 이름으로 MCP에 등록
+      요청 _meta에 남은 시간이 있으면 그 데드라인 안에서 실행
+    """
+    def decorate(request: Request) -> Callable[..., Any]:
+        signature = inspect.signature(request)
+
+        @functools.wraps(request)
+        def tool(*args, **kwargs):
+            fields, compact = _shape_args(signature, args, kwargs)
+            return projection.project(call(**request(*args, **kwargs)), fields, compact)
+
+        @functools.wraps(request)
+        async def tool_async(*args, **kwargs):
+            kwargs = _mcp_kwargs(signature, kwargs)
+            fields, compact = _shape_args(signature, args, kwargs)
+            with deadline.scope(request_deadline(mcp)):
+                result = await call_async(**request(*args, **kwargs))
+            return projection.for_mcp(result, fields, compact)
+
+        _register(mcp, request.__name__, tool_async, tool)
+        return tool
+
+    return decorate
+
+
+def threaded_tool(mcp):
+    """
+    상위 API 대신 로컬 저장소(SQLite·색인)를 쓰는 동기 도구를 그대로 두고, 스레드에서 돌리는 비동기 버전을 MCP에 등록.
+    fields/compact는 비동기 버전에서 for_mcp로 적용 (데드라인 contextvar는 to_thread가 복사).
+    """
+    def decorate(fn: Callable[..., Any]) -> Callable[..., Any]:
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        async def tool_async(*args, **kwargs):
+            bound = signature.bind(*args, **_mcp_kwargs(signature, kwargs))
+            fields = bound.arguments.pop("fields", None)
+            compact = bool(bound.arguments.pop("compact", False))
+            with deadline.scope(request_deadline(mcp)):
+                result = await asyncio.to_thread(fn, *bound.args, **bound.kwargs)
+            return projection.for_mcp(result, fields, compact)
+
+        _register(mcp, fn.__name__, tool_async, fn)
+        return fn
+
+    return decorate
+
+
+def register_common_tools(mcp, keys: quota.KeyPool, pong: str = "pong") -> None:
+    """세 서버 공통 상태 도구: cacheStats, quotaStatus, transportStats, ping."""
+
+    def cacheStats():
+        """응답 캐시 적중/실패/축출 통계"""
+        return {"status": "ok", "cache": response_cache.get_cache().stats()}
+
+    def quotaStatus():
+        """API 키별 오늘 호출량과 남은 일일 한도"""
+        return {"status": "ok", "quota": keys.status()}
+
+    def transportStats():
+        """HTTP 전송 계층 상태 (TLS 모드, 서킷, 엔드포인트별 지연 백분위수와 헤지 통계)"""
+        return {"status": "ok", "transport": http_transport.stats()}
+
+    def ping():
+        """헬스체크"""
+        return {"status": "ok", "message": pong}
+
+    for tool in (cacheStats, quotaStatus, transportStats, ping):
+        add_tool(mcp, tool)
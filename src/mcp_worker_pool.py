@@ -0,0 +1,291 @@
+# mcp_worker_pool.py — 서버마다 MCP stdio 워커 프로세스 N개를 띄워 두고 도구 호출을 나눠 보내는 풀
+# 같은 인터프리터(GIL 하나)에서 XML/JSON 파싱·가공을 하지 않고 여러 코어에 나눠 처리하기 위함
+import asyncio
+import atexit
+import json
+import logging
+import os
+import sys
+import threading
+from concurrent.futures import TimeoutError as FutureTimeout
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+from mcp.shared.exceptions import McpError
+from mcp.types import CONNECTION_CLOSED
+
+import deadline
+
+logger = logging.getLogger(__name__)
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 오케스트레이터 서버 이름 → 워커로 실행할 스크립트
+SERVER_SCRIPTS = {
+    "recruitment": "server.py",
+    "realestate": "realestate_server.py",
+    "youth_policy": "youth_policy_server.py",
+}
+
+WORKERS_PER_SERVER = int(os.getenv("MCP_WORKERS_PER_SERVER") or 2)
+# 데드라인이 없는 호출의 응답 대기 상한(초)
+CALL_TIMEOUT = float(os.getenv("MCP_WORKER_CALL_TIMEOUT") or 60)
+# 워커 프로세스 stderr를 남길 파일 (비우면 버림)
+WORKER_LOG = (os.getenv("MCP_WORKER_LOG") or "").strip()
+# 연달아 죽는 워커를 다시 띄우기 전 대기(초, 실패할 때마다 두 배, 최대 RESTART_BACKOFF_MAX)
+RESTART_BACKOFF = 0.5
+RESTART_BACKOFF_MAX = 10.0
+# 워커에 넘기는 데드라인을 이만큼(초) 앞당김 (워커가 낸 timeout 결과가 호출자 대기보다 먼저 도착하도록)
+DEADLINE_MARGIN = 0.2
+# mcp 클라이언트 세션이 read_timeout_seconds 안에 응답을 못 받으면 McpError에 넣는 오류 코드
+# (mcp.shared.session이 HTTP 408 값을 그대로 쓰고, mcp.types에는 이 코드의 상수가 없음)
+REQUEST_TIMEOUT_CODE = 408
+# 워커가 죽어 처리하지 못한 호출을 다른 워커로 다시 보내는 횟수 (조회 도구라 다시 보내도 안전)
+MAX_RETRIES = 1
+
+
+class WorkerError(Exception):
+    """워커 프로세스가 죽거나 연결이 끊겨 호출을 끝내지 못함."""
+
+
+class _Job:
+    __slots__ = ("tool", "arguments", "expires_at", "future", "attempts")
+
+    def __init__(self, tool: str, arguments: Dict[str, Any], expires_at: float, future: asyncio.Future):
+        self.tool = tool
+        self.arguments = arguments
+        # 풀 이벤트 루프 시계 기준 호출자 데드라인 (큐에서 기다린 시간도 포함)
+        self.expires_at = expires_at
+        self.future = future
+        self.attempts = 0
+
+    def remaining(self) -> float:
+        return self.expires_at - asyncio.get_running_loop().time()
+
+
+def _fail(job: "_Job", error: BaseException) -> None:
+    if not job.future.done():
+        job.future.set_exception(error)
+
+
+def _decode(result) -> Any:
+    """CallToolResult → 도구가 돌려준 값 (구조화 결과가 없으면 텍스트 JSON을 풀어서)."""
+    if result.structuredContent is not None and not result.isError:
+        return result.structuredContent
+    texts = [item.text for item in result.content if getattr(item, "text", None) is not None]
+    if result.isError:
+        raise RuntimeError("\n".join(texts) or "도구 실행 오류")
+    if len(texts) != 1:
+        return [json.loads(text) for text in texts]
+    try:
+        return json.loads(texts[0])
+    except ValueError:
+        return texts[0]
+
+
+def _job_error(server_name: str, job: _Job, error: McpError) -> Exception:
+    if error.error.code == REQUEST_TIMEOUT_CODE:
+        return deadline.DeadlineExceeded(f"{server_name}.{job.tool} 응답을 데드라인 안에 받지 못했습니다")
+    return RuntimeError(f"{server_name}.{job.tool}: {error.error.message}")
+
+
+def _reason(error: BaseException) -> str:
+    """stdio 클라이언트가 TaskGroup으로 감싸 올리는 예외에서 실제 원인을 꺼냄."""
+    while isinstance(error, BaseExceptionGroup) and error.exceptions:
+        error = error.exceptions[0]
+    return f"{type(error).__name__}: {error}" if str(error) else type(error).__name__
+
+
+def _fit_arguments(properties: Optional[set], arguments: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    `**kwargs`를 받는 도구는 FastMCP가 'kwargs'라는 필수 필드 하나로 노출하므로,
+    스키마에 없는 인자(in-process에서는 **kwargs로 들어가던 추가 필터)를 그 안으로 옮김.
+    """
+    if not properties or "kwargs" not in properties or "kwargs" in arguments:
+        return arguments
+    fitted = {key: value for key, value in arguments.items() if key in properties}
+    fitted["kwargs"] = {key: value for key, value in arguments.items() if key not in properties}
+    return fitted
+
+
+class WorkerPool:
+    """
+    서버별 공유 작업 큐 하나를 워커 N개가 나눠 가져가는 구조 (한가한 워커가 다음 호출을 맡으므로 자연히 부하 분산).
+    워커는 프로세스를 띄운 뒤 세션을 계속 열어 두고(warm), 프로세스가 죽으면 잡고 있던 호출을 큐에 되돌린 뒤 다시 띄움.
+    모든 세션은 풀 전용 이벤트 루프 스레드 하나에서 돌고, call()은 어느 스레드에서나 동기로 부를 수 있음.
+    """
+
+    def __init__(self, servers: Optional[Dict[str, str]] = None, workers: int = WORKERS_PER_SERVER):
+        self.scripts = dict(servers or SERVER_SCRIPTS)
+        self.workers = max(1, int(workers))
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="mcp-worker-pool", daemon=True)
+        self._queues: Dict[str, asyncio.Queue] = {}
+        self._tools: Dict[str, List[Tuple[str, str]]] = {}
+        self._properties: Dict[str, Dict[str, set]] = {}
+        self._ready: Dict[str, asyncio.Event] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._restarts: Dict[str, int] = {}
+        self._closed = False
+        self._errlog = open(WORKER_LOG, "a") if WORKER_LOG else open(os.devnull, "w")
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._start(), self._loop).result()
+
+    async def _start(self) -> None:
+        for server_name in self.scripts:
+            self._queues[server_name] = asyncio.Queue()
+            self._ready[server_name] = asyncio.Event()
+            self._restarts[server_name] = 0
+            for index in range(self.workers):
+                self._tasks.append(asyncio.create_task(self._worker(server_name, index)))
+
+    def _params(self, server_name: str) -> StdioServerParameters:
+        # 기본 환경은 PATH 등 일부만 넘기므로 API 키·설정 환경 변수를 그대로 전달
+        return StdioServerParameters(
+            command=sys.executable,
+            args=[os.path.join(SRC_DIR, self.scripts[server_name])],
+            env=dict(os.environ),
+            cwd=SRC_DIR,
+        )
+
+    async def _worker(self, server_name: str, index: int) -> None:
+        queue = self._queues[server_name]
+        backoff = RESTART_BACKOFF
+        # 프로세스가 죽어 끝내지 못한 호출은 큐에 되돌리지 않고 다시 띄운 새 프로세스에서 먼저 실행
+        # (다른 워커도 같이 죽었을 수 있으므로)
+        retry: Optional[_Job] = None
+        while not self._closed:
+            job: Optional[_Job] = None
+            try:
+                async with stdio_client(self._params(server_name), errlog=self._errlog) as (read, write):
+                    async with ClientSession(read, write) as session:
+                        await session.initialize()
+                        if server_name not in self._tools:
+                            listed = await session.list_tools()
+                            self._tools[server_name] = [(t.name, t.description or "") for t in listed.tools]
+                            self._properties[server_name] = {
+                                t.name: set((t.inputSchema or {}).get("properties", {})) for t in listed.tools
+                            }
+                        self._ready[server_name].set()
+                        backoff = RESTART_BACKOFF
+                        while True:
+                            job, retry = retry or await queue.get(), None
+                            remaining = job.remaining()
+                            if job.future.done() or remaining <= 0:
+                                _fail(job, deadline.DeadlineExceeded(f"{server_name}.{job.tool}: 워커를 기다리다 데드라인이 지났습니다"))
+                                job = None
+                                continue
+                            job.attempts += 1
+                            try:
+                                # 남은 시간을 _meta로 넘겨 워커 안의 HTTP 호출도 같은 데드라인으로 자름
+                                result = await session.call_tool(
+                                    job.tool,
+                                    job.arguments,
+                                    read_timeout_seconds=timedelta(seconds=remaining),
+                                    meta=deadline.to_meta(remaining - DEADLINE_MARGIN),
+                                )
+                            except McpError as e:
+                                # 연결이 끊긴 경우만 프로세스 문제로 보고 재시작. 응답 시간 초과나 서버가 돌려준
+                                # 오류는 이 호출만 실패시키고 세션은 그대로 씀
+                                if e.error.code == CONNECTION_CLOSED:
+                                    raise
+                                _fail(job, _job_error(server_name, job, e))
+                                job = None
+                                continue
+                            if not job.future.done():
+                                try:
+                                    job.future.set_result(_decode(result))
+                                except Exception as e:
+                                    job.future.set_exception(e)
+                            job = None
+            except asyncio.CancelledError:
+                if job is not None:
+                    _fail(job, WorkerError("워커 풀이 종료되었습니다"))
+                raise
+            except Exception as e:
+                if self._closed:
+                    return
+                reason = _reason(e)
+                self._restarts[server_name] += 1
+                logger.warning("MCP 워커 %s#%d 재시작: %s", server_name, index, reason)
+                if job is not None and not job.future.done():
+                    if job.attempts <= MAX_RETRIES:
+                        retry = job
+                    else:
+                        _fail(job, WorkerError(f"{server_name} 워커가 응답하지 않습니다: {reason}"))
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, RESTART_BACKOFF_MAX)
+
+    async def _submit(self, server_name: str, tool: str, arguments: Dict[str, Any], timeout: float) -> Any:
+        future = self._loop.create_future()
+        self._queues[server_name].put_nowait(_Job(tool, arguments, self._loop.time() + timeout, future))
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            raise deadline.DeadlineExceeded(f"{server_name}.{tool} 응답을 {timeout:.0f}초 안에 받지 못했습니다")
+
+    def call(self, server_name: str, tool: str, arguments: Optional[Dict[str, Any]] = None) -> Any:
+        """도구 하나를 워커에서 실행해 결과를 반환. 현재 질의 데드라인이 있으면 남은 시간만큼만 기다림."""
+        if server_name not in self.scripts:
+            raise KeyError(server_name)
+        timeout = deadline.remaining(CALL_TIMEOUT)
+        if timeout <= 0:
+            raise deadline.DeadlineExceeded("질의 시간 예산이 남지 않았습니다")
+        arguments = _fit_arguments(self._properties.get(server_name, {}).get(tool), arguments or {})
+        pending = asyncio.run_coroutine_threadsafe(
+            self._submit(server_name, tool, arguments, timeout), self._loop
+        )
+        try:
+            return pending.result(timeout + 1.0)
+        except FutureTimeout:
+            pending.cancel()
+            raise deadline.DeadlineExceeded(f"{server_name}.{tool} 응답을 {timeout:.0f}초 안에 받지 못했습니다")
+
+    def list_tools(self, server_name: str, timeout: float = 30.0) -> List[Tuple[str, str]]:
+        """서버의 (도구 이름, 설명) 목록. 첫 워커가 뜰 때까지 기다림."""
+        asyncio.run_coroutine_threadsafe(
+            asyncio.wait_for(self._ready[server_name].wait(), timeout), self._loop
+        ).result(timeout + 1.0)
+        return list(self._tools[server_name])
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers_per_server": self.workers,
+            "queued": {name: queue.qsize() for name, queue in self._queues.items()},
+            "restarts": dict(self._restarts),
+        }
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+
+        async def stop():
+            for task in self._tasks:
+                task.cancel()
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+        try:
+            asyncio.run_coroutine_threadsafe(stop(), self._loop).result(10.0)
+        except Exception:
+            pass
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(5.0)
+        self._errlog.close()
+
+
+_pool: Optional[WorkerPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool(workers: Optional[int] = None) -> WorkerPool:
+    """프로세스 전체가 공유하는 워커 풀 (처음 쓸 때 워커를 띄움)."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = WorkerPool(workers=workers or WORKERS_PER_SERVER)
+                atexit.register(_pool.close)
+    return _pool
@@ -0,0 +1,102 @@
+# molit_xml.py — 국토부 실거래가 XML 응답(바이트)을 타입이 정해진 거래 행으로 변환
+# (전체 문자열 디코딩이나 ElementTree 전체 트리를 만들지 않고 <item>이 끝날 때마다 바로 행으로 바꾸고 버림)
+import xml.etree.ElementTree as ET
+from typing import Any, Dict, Iterable, List, Optional
+
+# 정수/실수로 바꿀 필드 (dealAmount는 "  10,000" 같은 만원 단위 문자열)
+INT_FIELDS = frozenset({"dealYear", "dealMonth", "dealDay", "floor", "buildYear"})
+FLOAT_FIELDS = frozenset({"excluUseAr"})
+AMOUNT_FIELDS = frozenset({"dealAmount"})
+
+# 응답 본문/헤더에서 따로 모아 둘 값 (정상 응답 헤더와 data.go.kr 게이트웨이 오류 응답 모두)
+META_TAGS = frozenset({
+    "resultCode", "resultMsg", "totalCount", "pageNo", "numOfRows",
+    "returnAuthMsg", "returnReasonCode", "errMsg",
+})
+OK_RESULT_CODES = ("00", "000")
+
+
+def to_amount(value: Optional[str]) -> Optional[int]:
+    """'  10,000' → 10000 (만원). 빈 값이나 숫자가 아니면 None."""
+    if value is None:
+        return None
+    digits = value.replace(",", "").strip()
+    return int(digits) if digits.isdigit() else None
+
+
+def to_int(value: Optional[str]) -> Optional[int]:
+    try:
+        return int(value.strip()) if value and value.strip() else None
+    except ValueError:
+        return None
+
+
+def to_float(value: Optional[str]) -> Optional[float]:
+    try:
+        return float(value.strip()) if value and value.strip() else None
+    except ValueError:
+        return None
+
+
+def typed_row(item: ET.Element) -> Dict[str, Any]:
+    row: Dict[str, Any] = {}
+    for child in item:
+        text = (child.text or "").strip()
+        tag = child.tag
+        if tag in AMOUNT_FIELDS:
+            row[tag] = to_amount(text)
+        elif tag in INT_FIELDS:
+            row[tag] = to_int(text)
+        elif tag in FLOAT_FIELDS:
+            row[tag] = to_float(text)
+        else:
+            row[tag] = text
+    return row
+
+
+class TradeParser:
+    """XMLPullParser로 조각을 받는 대로 <item>을 행으로 변환."""
+
+    def __init__(self):
+        self._parser = ET.XMLPullParser(events=("end",))
+        self.items: List[Dict[str, Any]] = []
+        self.meta: Dict[str, str] = {}
+
+    def feed(self, chunk: bytes) -> None:
+        self._parser.feed(chunk)
+        self._drain()
+
+    def close(self) -> None:
+        self._parser.close()
+        self._drain()
+
+    def _drain(self) -> None:
+        for _, elem in self._parser.read_events():
+            if elem.tag == "item":
+                self.items.append(typed_row(elem))
+                elem.clear()
+            elif elem.tag in META_TAGS:
+                self.meta[elem.tag] = (elem.text or "").strip()
+
+    @property
+    def total_count(self) -> Optional[int]:
+        return to_int(self.meta.get("totalCount"))
+
+    @property
+    def api_error(self) -> Optional[str]:
+        """상위 API가 돌려준 오류 메시지 (정상이면 None)."""
+        if self.meta.get("returnAuthMsg") or self.meta.get("errMsg"):
+            return self.meta.get("returnAuthMsg") or self.meta.get("errMsg")
+        code = self.meta.get("resultCode")
+        if code and code not in OK_RESULT_CODES:
+            return self.meta.get("resultMsg") or f"resultCode {code}"
+        return None
+
+
+def parse_trades(chunks: Iterable[bytes]) -> TradeParser:
+    """바이트 조각들을 순서대로 넣어 파싱. XML이 아니면 ET.ParseError."""
+    parser = TradeParser()
+    for chunk in chunks:
+        parser.feed(chunk)
+    parser.close()
+    return parser
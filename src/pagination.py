@@ -0,0 +1,390 @@
+# pagination.py — 목록 API 전체 페이지 순회 (첫 페이지의 총 건수로 나머지 페이지를 동시에 미리 받아 옴)
+import asyncio
+import contextvars
+import math
+import os
+import re
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional
+
+import deadline
+
+# 동시에 받아 둘 페이지 수 (키별 초당 호출 제한보다 크게 잡아도 quota 풀에서 기다리게 됨)
+PAGE_WINDOW = int(os.getenv("PAGINATION_WINDOW") or 4)
+# 총 건수를 알 수 없을 때 무한히 돌지 않도록 둔 페이지 상한
+MAX_PAGES = int(os.getenv("PAGINATION_MAX_PAGES") or 200)
+
+_XML_TOTAL = re.compile(r"<totalCount>\s*(\d+)\s*</totalCount>")
+
+PageFetch = Callable[[int], Dict[str, Any]]
+AsyncPageFetch = Callable[[int], Awaitable[Dict[str, Any]]]
+Extract = Callable[[Dict[str, Any]], List[Any]]
+
+
+def total_count(result: Dict[str, Any]) -> Optional[int]:
+    """
+    페이지 응답에서 전체 건수를 찾음.
+    정규화된 total_count → JSON totalCount → 청년정책 result.pagging.totCount → 국토부 XML <totalCount> 순.
+    """
+    candidates = [result.get("total_count")]
+    data = result.get("data")
+    if isinstance(data, dict):
+        candidates.append(data.get("totalCount"))
+        section = data.get("result")
+        if isinstance(section, dict):
+            candidates.append((section.get("pagging") or {}).get("totCount"))
+    text = result.get("text")
+    if isinstance(text, str):
+        match = _XML_TOTAL.search(text)
+        if match:
+            candidates.append(match.group(1))
+    for value in candidates:
+        try:
+            if value is not None and value != "":
+                return int(value)
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+def is_ok(result: Dict[str, Any]) -> bool:
+    return isinstance(result, dict) and result.get("status") == "ok" and not result.get("api_error")
+
+
+class PageStats:
+    """순회 결과 요약 (총 건수, 받아 온 페이지, 실패한 페이지)."""
+
+    def __init__(self):
+        self.total_count: Optional[int] = None
+        self.pages = 0
+        self.records = 0
+        self.errors: List[Dict[str, Any]] = []
+        self.timed_out = False
+        # MAX_PAGES에 막혀 목록 끝까지 가지 못함
+        self.truncated = False
+        # 목록의 마지막 페이지까지 받음 (max_records·MAX_PAGES·오류로 멈추지 않음)
+        self.exhausted = False
+
+    @property
+    def complete(self) -> bool:
+        """목록 끝까지 오류 없이 받음 (이 결과만 보고 빠진 항목을 지워도 됨)."""
+        return self.exhausted and not self.errors
+
+    def note_error(self, page: int, result: Any) -> None:
+        if isinstance(result, BaseException):
+            message = str(result)
+            self.timed_out = self.timed_out or isinstance(result, deadline.DeadlineExceeded)
+        else:
+            self.timed_out = self.timed_out or (result or {}).get("status") == "timeout"
+            message = (result or {}).get("message") or (result or {}).get("api_error") or "unknown error"
+        self.errors.append({"page": page, "message": message})
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "total_count": self.total_count,
+            "pages": self.pages,
+            "records": self.records,
+            "errors": self.errors,
+            "truncated": self.truncated,
+            "complete": self.complete,
+        }
+
+
+def _plan(total: Optional[int], page_size: int, max_records: Optional[int], stats: PageStats) -> Optional[int]:
+    """
+    받아야 할 마지막 페이지 번호. 총 건수를 모르면 None(짧은 페이지가 나올 때까지 차례로).
+    MAX_PAGES로 잘리면 stats.truncated 표시.
+    """
+    if total is None:
+        return None
+    wanted = total if max_records is None else min(total, max_records)
+    pages = max(1, math.ceil(wanted / page_size))
+    stats.truncated = pages > MAX_PAGES
+    return min(MAX_PAGES, pages)
+
+
+def _reaches_end(total: Optional[int], page_size: int, max_records: Optional[int]) -> bool:
+    """총 건수를 아는 목록에서 계획한 페이지를 다 받으면 목록 끝까지 받은 것인지."""
+    return total is not None and math.ceil(total / page_size) <= MAX_PAGES and (
+        max_records is None or total <= max_records
+    )
+
+
+def _note_stop(stats: PageStats, items: List[Any], page_size: int, page: int) -> None:
+    """총 건수 없이 차례로 돌던 순회가 멈춘 이유 기록: 짧은 페이지면 끝, 꽉 찬 페이지에서 MAX_PAGES면 잘림."""
+    if len(items) < page_size:
+        stats.exhausted = True
+    elif page >= MAX_PAGES:
+        stats.truncated = True
+
+
+def iterate(
+    fetch_page: PageFetch,
+    extract: Extract,
+    page_size: int,
+    max_records: Optional[int] = None,
+    window: int = PAGE_WINDOW,
+    stats: Optional[PageStats] = None,
+) -> Iterator[Any]:
+    """
+    fetch_page(page_no)로 전체 페이지를 돌며 레코드를 하나씩 내보냄.
+    첫 페이지의 총 건수로 남은 페이지를 window개씩 스레드에서 미리 받아 두고, 페이지 순서대로 내보냄.
+    실패한 페이지는 건너뛰고 stats.errors에 기록. max_records에 닿으면 중단.
+    """
+    stats = stats if stats is not None else PageStats()
+    emitted = 0
+
+    def _emit(items: List[Any]) -> Iterator[Any]:
+        nonlocal emitted
+        for item in items:
+            if max_records is not None and emitted >= max_records:
+                return
+            emitted += 1
+            stats.records = emitted
+            yield item
+
+    first = fetch_page(1)
+    if not is_ok(first):
+        stats.note_error(1, first)
+        return
+    stats.pages = 1
+    items = extract(first)
+    stats.total_count = total_count(first)
+    yield from _emit(items)
+    last_page = _plan(stats.total_count, page_size, max_records, stats)
+
+    if last_page is None:
+        # 총 건수가 없는 응답: 짧은 페이지가 나올 때까지 차례로
+        page = 1
+        while len(items) >= page_size and page < MAX_PAGES and (max_records is None or emitted < max_records):
+            page += 1
+            result = fetch_page(page)
+            if not is_ok(result):
+                stats.note_error(page, result)
+                return
+            stats.pages += 1
+            items = extract(result)
+            yield from _emit(items)
+        _note_stop(stats, items, page_size, page)
+        return
+
+    pages = iter(range(2, last_page + 1))
+    pending: Dict[int, Future] = {}
+    # 스레드에서도 질의 데드라인(contextvar)이 그대로 적용되도록 컨텍스트를 복사해 실행
+    pool = ThreadPoolExecutor(max_workers=max(1, window), thread_name_prefix="page")
+    try:
+        def _submit() -> None:
+            page = next(pages, None)
+            if page is not None:
+                pending[page] = pool.submit(contextvars.copy_context().run, fetch_page, page)
+
+        for _ in range(window):
+            _submit()
+        for page in range(2, last_page + 1):
+            if max_records is not None and emitted >= max_records:
+                break
+            future = pending.pop(page)
+            _submit()
+            try:
+                result = future.result()
+            except Exception as e:
+                stats.note_error(page, e)
+                continue
+            if not is_ok(result):
+                stats.note_error(page, result)
+                continue
+            stats.pages += 1
+            yield from _emit(extract(result))
+        else:
+            stats.exhausted = _reaches_end(stats.total_count, page_size, max_records)
+    finally:
+        for future in pending.values():
+            future.cancel()
+        pool.shutdown(wait=False)
+
+
+async def aiterate(
+    fetch_page: AsyncPageFetch,
+    extract: Extract,
+    page_size: int,
+    max_records: Optional[int] = None,
+    window: int = PAGE_WINDOW,
+    stats: Optional[PageStats] = None,
+) -> AsyncIterator[Any]:
+    """iterate의 비동기 버전. 남은 페이지를 window개까지 태스크로 동시에 받아 둠."""
+    stats = stats if stats is not None else PageStats()
+    emitted = 0
+
+    first = await fetch_page(1)
+    if not is_ok(first):
+        stats.note_error(1, first)
+        return
+    stats.pages = 1
+    items = extract(first)
+    stats.total_count = total_count(first)
+    for item in items:
+        if max_records is not None and emitted >= max_records:
+            return
+        emitted += 1
+        stats.records = emitted
+        yield item
+    last_page = _plan(stats.total_count, page_size, max_records, stats)
+
+    if last_page is None:
+        page = 1
+        while len(items) >= page_size and page < MAX_PAGES and (max_records is None or emitted < max_records):
+            page += 1
+            result = await fetch_page(page)
+            if not is_ok(result):
+                stats.note_error(page, result)
+                return
+            stats.pages += 1
+            items = extract(result)
+            for item in items:
+                if max_records is not None and emitted >= max_records:
+                    return
+                emitted += 1
+                stats.records = emitted
+                yield item
+        _note_stop(stats, items, page_size, page)
+        return
+
+    pages = iter(range(2, last_page + 1))
+    pending: Dict[int, asyncio.Task] = {}
+
+    def _submit() -> None:
+        page = next(pages, None)
+        if page is not None:
+            pending[page] = asyncio.ensure_future(fetch_page(page))
+
+    try:
+        for _ in range(window):
+            _submit()
+        for page in range(2, last_page + 1):
+            if max_records is not None and emitted >= max_records:
+                break
+            task = pending.pop(page)
+            _submit()
+            try:
+                result = await task
+            except Exception as e:
+                stats.note_error(page, e)
+                continue
+            if not is_ok(result):
+                stats.note_error(page, result)
+                continue
+            stats.pages += 1
+            for item in extract(result):
+                if max_records is not None and emitted >= max_records:
+                    break
+                emitted += 1
+                stats.records = emitted
+                yield item
+        else:
+            stats.exhausted = _reaches_end(stats.total_count, page_size, max_records)
+    finally:
+        for task in pending.values():
+            task.cancel()
+
+
+def collected(items: List[Any], stats: PageStats) -> Dict[str, Any]:
+    """도구 응답 형태: 모은 레코드 + 순회 요약. 일부 페이지만 실패했으면 status=partial."""
+    if stats.errors and not items:
+        status = "timeout" if stats.timed_out else "error"
+    elif stats.errors or stats.truncated:
+        status = "partial"
+    else:
+        status = "ok"
+    result: Dict[str, Any] = {"status": status, "items": items, **stats.as_dict()}
+    if stats.timed_out:
+        result["timed_out"] = True
+    if status == "error":
+        result["message"] = stats.errors[0]["message"]
+    elif stats.truncated:
+        result["message"] = f"페이지 상한({MAX_PAGES})에 닿아 목록 끝까지 받지 못했습니다"
+    return result
+
+
+def collect(
+    fetch_page: PageFetch,
+    extract: Extract,
+    page_size: int,
+    max_records: Optional[int] = None,
+    window: int = PAGE_WINDOW,
+) -> Dict[str, Any]:
+    stats = PageStats()
+    items = list(iterate(fetch_page, extract, page_size, max_records, window, stats))
+    return collected(items, stats)
+
+
+async def collect_async(
+    fetch_page: AsyncPageFetch,
+    extract: Extract,
+    page_size: int,
+    max_records: Optional[int] = None,
+    window: int = PAGE_WINDOW,
+) -> Dict[str, Any]:
+    stats = PageStats()
+    items = [item async for item in aiterate(fetch_page, extract, page_size, max_records, window, stats)]
+    return collected(items, stats)
+
+
+def collect_many(fetchers: List[PageFetch], extract: Extract, page_size: int, executor: Executor) -> List[Dict[str, Any]]:
+    """
+    여러 목록(예: 지역×계약년월)을 실행기 하나에서 평평하게 받음. 모든 목록의 첫 페이지를 먼저 올리고,
+    총 건수로 정한 나머지 페이지를 같은 실행기에 올림. 작업이 다른 작업을 기다리지 않으므로
+    목록마다 스레드 풀을 새로 만들어 중첩하지 않아도 됨. 목록마다 collect()와 같은 형태의 결과.
+    """
+    def _submit(fn: Callable[..., Any], *args: Any) -> Future:
+        # 스레드에서도 질의 데드라인(contextvar)이 그대로 적용되도록 컨텍스트를 복사해 실행
+        return executor.submit(contextvars.copy_context().run, fn, *args)
+
+    def _wait(future: Future) -> Any:
+        try:
+            return future.result()
+        except Exception as e:
+            return e
+
+    firsts = [_submit(fetch, 1) for fetch in fetchers]
+    plans = []
+    for fetch, first_future in zip(fetchers, firsts):
+        stats = PageStats()
+        first = _wait(first_future)
+        if isinstance(first, BaseException) or not is_ok(first):
+            stats.note_error(1, first)
+            plans.append((stats, [], None))
+            continue
+        stats.pages = 1
+        stats.total_count = total_count(first)
+        last_page = _plan(stats.total_count, page_size, None, stats)
+        if last_page is None:
+            # 총 건수가 없는 목록은 한 작업에서 차례로 (첫 페이지는 응답 캐시에서 다시 읽음)
+            plans.append((None, None, _submit(collect, fetch, extract, page_size, None, 1)))
+            continue
+        rest = [(page, _submit(fetch, page)) for page in range(2, last_page + 1)]
+        plans.append((stats, list(extract(first)), rest))
+
+    results = []
+    for stats, items, rest in plans:
+        if stats is None:
+            walked = _wait(rest)
+            results.append(walked if isinstance(walked, dict) else collected([], _failed(walked)))
+            continue
+        for page, future in rest or []:
+            result = _wait(future)
+            if isinstance(result, BaseException) or not is_ok(result):
+                stats.note_error(page, result)
+                continue
+            stats.pages += 1
+            items.extend(extract(result))
+        if rest is not None:
+            stats.exhausted = _reaches_end(stats.total_count, page_size, None)
+        stats.records = len(items)
+        results.append(collected(items, stats))
+    return results
+
+
+def _failed(error: BaseException) -> PageStats:
+    stats = PageStats()
+    stats.note_error(1, error)
+    return stats
@@ -0,0 +1,249 @@
+# policy_index.py — 받아 온 청년정책으로 로컬 역색인을 유지하고 BM25로 순위 검색 (상위 API 왕복 없음)
+# 한국어는 조사·어미가 붙어 어절 단위 일치가 잘 안 되므로 글자 2-gram으로 색인
+import atexit
+import heapq
+import marshal
+import math
+import os
+import re
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import response_cache
+
+INDEX_PATH = os.path.expanduser((os.getenv("POLICY_INDEX_PATH") or "~/.cache/huss/policy_index.bin").strip())
+# 색인이 바뀐 뒤 백그라운드 스레드가 디스크에 쓰기까지 기다리는 시간(초). 종료 시에는 남은 변경을 한 번 더 씀
+SAVE_INTERVAL = float(os.getenv("POLICY_INDEX_SAVE_INTERVAL") or 30)
+
+# 색인 필드와 가중치 (정책명·키워드에 나온 단어를 본문보다 무겁게)
+FIELD_WEIGHTS = {"plcyNm": 3, "plcyKywdNm": 2, "plcyExplnCn": 1, "plcySprtCn": 1}
+NGRAM = 2
+BM25_K1 = 1.2
+BM25_B = 0.75
+FORMAT_VERSION = 1
+
+_WORD = re.compile(r"[0-9a-z가-힣]+")
+KST = timezone(timedelta(hours=9))
+
+
+def _today() -> str:
+    return datetime.now(KST).strftime("%Y%m%d")
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """'청년 월세지원' → ['청년', '월세', '세지', '지원']. 한 글자 단어는 그대로."""
+    tokens: List[str] = []
+    for word in _WORD.findall((text or "").lower()):
+        if len(word) <= NGRAM:
+            tokens.append(word)
+        else:
+            tokens.extend(word[i:i + NGRAM] for i in range(len(word) - NGRAM + 1))
+    return tokens
+
+
+def term_freqs(policy: Dict[str, Any]) -> Dict[str, int]:
+    """필드 가중치를 곱한 정책의 용어 빈도."""
+    freqs: Dict[str, int] = {}
+    for field, weight in FIELD_WEIGHTS.items():
+        for token in tokenize(policy.get(field)):
+            freqs[token] = freqs.get(token, 0) + weight
+    return freqs
+
+
+class PolicyIndex:
+    """
+    정책 번호(plcyNo) → 문서 번호, 용어 → {문서 번호: 빈도} 역색인.
+    같은 정책이 다시 들어오면 내용이 바뀐 경우에만 옛 용어를 빼고 다시 색인.
+    marshal + zlib으로 저장해 JSON보다 작고 불러오기가 빠름.
+    """
+
+    def __init__(self, path: Optional[str] = INDEX_PATH):
+        self.path = path
+        self._lock = threading.RLock()
+        self._docs: List[Optional[Dict[str, Any]]] = []
+        self._ids: Dict[str, int] = {}
+        self._lengths: List[int] = []
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._total_length = 0
+        self._dirty = False
+        # 저장은 요청 경로 밖(백그라운드 스레드)에서: 색인이 바뀌면 깨우고, 모아서 한 번에 씀
+        self._wake = threading.Event()
+        self._saver: Optional[threading.Thread] = None
+        if path:
+            self.load()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    # ---- 갱신 ----
+    def add(self, policy: Dict[str, Any]) -> bool:
+        """정책 하나를 색인. 새로 넣거나 바뀌었으면 True."""
+        key = str(policy.get("plcyNo") or "").strip()
+        if not key:
+            return False
+        with self._lock:
+            doc = self._ids.get(key)
+            if doc is not None:
+                if self._docs[doc] == policy:
+                    return False
+                self._unindex(doc)
+            else:
+                doc = len(self._docs)
+                self._docs.append(None)
+                self._lengths.append(0)
+                self._ids[key] = doc
+            freqs = term_freqs(policy)
+            for term, tf in freqs.items():
+                self._postings.setdefault(term, {})[doc] = tf
+            length = sum(freqs.values())
+            self._docs[doc] = dict(policy)
+            self._lengths[doc] = length
+            self._total_length += length
+            self._dirty = True
+            return True
+
+    def add_many(self, policies: Iterable[Any]) -> int:
+        changed = sum(1 for policy in policies if isinstance(policy, dict) and self.add(policy))
+        if changed:
+            self._schedule()
+        return changed
+
+    def _unindex(self, doc: int) -> None:
+        old = self._docs[doc]
+        for term in term_freqs(old or {}):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(doc, None)
+                if not postings:
+                    del self._postings[term]
+        self._total_length -= self._lengths[doc]
+        self._lengths[doc] = 0
+
+    # ---- 검색 ----
+    def search(
+        self,
+        query: str,
+        limit: int = 20,
+        region_code: Optional[str] = None,
+        include_closed: bool = False,
+        today: Optional[str] = None,
+    ) -> Tuple[int, List[Tuple[float, Dict[str, Any]]]]:
+        """
+        query: 공백/콤마로 나눈 검색어 (예: "청년,취업,창업,주거지원"). 검색어 중 하나라도 맞으면 후보.
+        region_code: zipCd에 이 코드(앞자리 일치)가 있는 정책만. include_closed: 신청 기간이 지난 정책도 포함.
+        반환: (맞은 정책 수, [(점수, 정책)] 점수 높은 순)
+        """
+        terms = set(tokenize(query.replace(",", " ")))
+        today = today or _today()
+        with self._lock:
+            n_docs = len(self._ids)
+            if not terms or not n_docs:
+                return 0, []
+            avg_length = self._total_length / n_docs or 1.0
+            scores: Dict[int, float] = {}
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc, tf in postings.items():
+                    norm = BM25_K1 * (1 - BM25_B + BM25_B * self._lengths[doc] / avg_length)
+                    scores[doc] = scores.get(doc, 0.0) + idf * tf * (BM25_K1 + 1) / (tf + norm)
+            matched = [
+                (score, doc) for doc, score in scores.items()
+                if self._visible(self._docs[doc], region_code, include_closed, today)
+            ]
+            top = heapq.nlargest(max(0, int(limit)), matched)
+            return len(matched), [(score, self._docs[doc]) for score, doc in top]
+
+    @staticmethod
+    def _visible(policy: Optional[Dict[str, Any]], region_code: Optional[str], include_closed: bool, today: str) -> bool:
+        if policy is None:
+            return False
+        if region_code:
+            zips = [z.strip() for z in str(policy.get("zipCd") or "").split(",")]
+            if not any(z.startswith(region_code) for z in zips if z):
+                return False
+        if not include_closed:
+            end = response_cache.apply_period_end(policy.get("aplyYmd"))
+            if end and end < today:
+                return False
+        return True
+
+    # ---- 저장/불러오기 ----
+    def save(self) -> None:
+        if not self.path:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            blob = zlib.compress(marshal.dumps((FORMAT_VERSION, self._docs, self._ids, self._lengths, self._postings)), 6)
+            self._dirty = False
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(blob)
+            os.replace(tmp, self.path)
+        except OSError:
+            self._dirty = True
+
+    def _schedule(self) -> None:
+        if not self.path:
+            return
+        if self._saver is None:
+            with self._lock:
+                if self._saver is None:
+                    self._saver = threading.Thread(target=self._run, name="policy-index-save", daemon=True)
+                    self._saver.start()
+        self._wake.set()
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait()
+            time.sleep(SAVE_INTERVAL)  # 그 사이 들어온 정책을 모아 한 번에 저장
+            self._wake.clear()
+            self.save()
+
+    def load(self) -> bool:
+        """저장된 색인을 읽음. 없거나 형식이 다르면 빈 색인으로 시작."""
+        try:
+            with open(self.path, "rb") as f:
+                version, docs, ids, lengths, postings = marshal.loads(zlib.decompress(f.read()))
+        except (OSError, ValueError, EOFError, TypeError, zlib.error):
+            return False
+        if version != FORMAT_VERSION:
+            return False
+        with self._lock:
+            self._docs, self._ids, self._lengths, self._postings = docs, ids, lengths, postings
+            self._total_length = sum(lengths)
+            self._dirty = False
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "path": self.path,
+                "policies": len(self._ids),
+                "terms": len(self._postings),
+                "bytes_on_disk": os.path.getsize(self.path) if self.path and os.path.exists(self.path) else 0,
+            }
+
+
+_index: Optional[PolicyIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_index() -> PolicyIndex:
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = PolicyIndex()
+                atexit.register(_index.save)
+    return _index
@@ -0,0 +1,80 @@
+# projection.py — 도구 응답 축약: 필요한 컬럼만 남기고(fields) 상위 원문/전송 메타데이터를 뺀 형태(compact)
+import json
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import pagination
+
+try:  # 선택 의존성: 있으면 빠른 JSON 인코더 사용
+    import orjson
+except ImportError:  # pragma: no cover - 설치 환경에 따라 다름
+    orjson = None
+
+# compact 모드에서 남길 최상위 키 (레코드 목록은 items로 통일)
+COMPACT_KEYS = (
+    "status", "total_count", "count", "pages", "records", "pairs", "by_pair",
+    "errors", "timed_out", "truncated", "complete", "api_error", "message", "cache",
+)
+# 레코드 목록 키 → data 안에 같은 목록이 원문으로 한 번 더 있는 자리 (fields로 축약할 때 같이 뺌)
+RAW_DUPLICATES = {"policies": ("result", "youthPolicyList")}
+
+
+def dumps(obj: Any) -> str:
+    """한글을 이스케이프하지 않는 공백 없는 JSON. orjson이 있으면 orjson."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+def _locate_records(result: Dict[str, Any]) -> Optional[Tuple[List[Any], Callable[[List[Any]], Dict[str, Any]]]]:
+    """응답 안의 레코드 목록과, 바뀐 목록을 같은 자리에 다시 넣는 함수."""
+    for key in ("items", "policies"):
+        if isinstance(result.get(key), list):
+            return result[key], lambda records, _key=key: {**result, _key: records}
+    data = result.get("data")
+    if isinstance(data, dict) and isinstance(data.get("result"), list):
+        return data["result"], lambda records: {**result, "data": {**data, "result": records}}
+    return None
+
+
+def _drop_raw_duplicate(result: Dict[str, Any]) -> Dict[str, Any]:
+    for key, (section, name) in RAW_DUPLICATES.items():
+        data = result.get("data")
+        if key in result and isinstance(data, dict) and isinstance(data.get(section), dict) and name in data[section]:
+            trimmed = {k: v for k, v in data[section].items() if k != name}
+            result = {**result, "data": {**data, section: trimmed}}
+    return result
+
+
+def select(records: List[Any], fields: Sequence[str]) -> List[Any]:
+    wanted = [f for f in fields if f]
+    return [{f: r[f] for f in wanted if f in r} if isinstance(r, dict) else r for r in records]
+
+
+def project(result: Any, fields: Optional[Sequence[str]] = None, compact: bool = False) -> Any:
+    """
+    fields: 레코드마다 남길 컬럼 목록. compact: 상위 원문(data)과 전송 메타데이터를 빼고
+    {status, total_count, items, ...}만 반환. 오류 응답이나 레코드 목록이 없는 응답은 그대로.
+    """
+    if not (fields or compact) or not isinstance(result, dict):
+        return result
+    if result.get("status") not in ("ok", "partial"):
+        return result
+    located = _locate_records(result)
+    if located is None:
+        return result
+    records, put_back = located
+    if fields:
+        records = select(records, fields)
+    if not compact:
+        return _drop_raw_duplicate(put_back(records))
+    out = {key: result[key] for key in COMPACT_KEYS if key in result}
+    if "total_count" not in out:
+        out["total_count"] = pagination.total_count(result)
+    out["items"] = records
+    return out
+
+
+def for_mcp(result: Any, fields: Optional[Sequence[str]] = None, compact: bool = False) -> Any:
+    """MCP 도구 반환값. compact면 미리 직렬화한 JSON 문자열(들여쓰기 없는)로 돌려 전송량을 줄임."""
+    shaped = project(result, fields, compact)
+    return dumps(shaped) if compact else shaped
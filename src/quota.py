@@ -0,0 +1,469 @@
+# quota.py — API 키 풀 + 토큰 버킷 속도 제한 + 일일 호출 한도 추적
+# (data.go.kr / youthcenter.go.kr 키는 하루 호출 수가 정해져 있어 한도를 넘기 전에 조절·분산)
+import asyncio
+import atexit
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import deadline
+import http_transport
+
+# 일일 한도는 한국 시간 자정에 초기화
+KST = timezone(timedelta(hours=9))
+
+QUOTA_DB = os.path.expanduser((os.getenv("API_QUOTA_DB") or "~/.cache/huss/quota.sqlite").strip())
+# 메모리 카운터를 SQLite에 모아 쓰는 간격(초)
+FLUSH_INTERVAL = float(os.getenv("API_QUOTA_FLUSH_SEC") or 1)
+# 토큰이 없을 때 기다릴 수 있는 최대 시간 (넘으면 한도 초과로 응답)
+MAX_WAIT = float(os.getenv("API_RATE_MAX_WAIT") or 5)
+
+# 상위 API가 일일 한도 초과 시 내려주는 메시지
+QUOTA_ERROR_MARKERS = ("LIMITED_NUMBER_OF_SERVICE_REQUESTS_EXCEEDS", "LIMITED NUMBER OF SERVICE REQUESTS")
+
+
+class QuotaExhausted(Exception):
+    """풀 안의 모든 키가 일일 한도를 다 씀."""
+
+
+class RateLimited(QuotaExhausted):
+    """일일 한도는 남았지만 MAX_WAIT 안에 속도 제한 토큰을 얻지 못함 (잠시 뒤 다시 시도하면 됨)."""
+
+
+def today() -> str:
+    return datetime.now(KST).strftime("%Y%m%d")
+
+
+def key_id(key: str) -> str:
+    """키 원문 대신 저장/표시에 쓰는 짧은 식별자."""
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:10]
+
+
+def env_keys(*names: str) -> List[str]:
+    """환경 변수들에서 콤마로 구분된 키 목록을 모음 (중복 제거, 순서 유지)."""
+    keys: List[str] = []
+    for name in names:
+        for key in (os.getenv(name) or "").split(","):
+            key = key.strip()
+            if key and key not in keys:
+                keys.append(key)
+    return keys
+
+
+class TokenBucket:
+    """초당 rate개씩 채워지고 최대 burst개까지 모이는 토큰 버킷."""
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def delay(self) -> float:
+        """토큰 하나가 생길 때까지 남은 초 (지금 있으면 0)."""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= 1 or self.rate <= 0:
+                return 0.0 if self._tokens >= 1 else float("inf")
+            return (1 - self._tokens) / self.rate
+
+    def take(self) -> bool:
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    def refund(self) -> None:
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + 1)
+
+
+class QuotaStore:
+    """
+    (서비스, 키, 엔드포인트, 날짜)별 호출 수. 요청 경로에서는 메모리 카운터만 읽고 쓰며,
+    백그라운드 스레드가 FLUSH_INTERVAL마다 증가분을 SQLite에 더하고 다른 프로세스가 쓴 값을 다시 읽어 옴
+    (재시작·다중 프로세스에서도 유지). 파일을 쓸 수 없으면 프로세스 메모리만 사용.
+    """
+
+    def __init__(self, path: str = QUOTA_DB, flush_interval: float = FLUSH_INTERVAL):
+        self.path = path
+        self.flush_interval = flush_interval
+        self._counts: Dict[Tuple[str, str, str, str], int] = {}
+        # 아직 SQLite에 쓰지 않은 증가분과 덮어쓸 값
+        self._deltas: Dict[Tuple[str, str, str, str], int] = {}
+        self._sets: Dict[Tuple[str, str, str, str], int] = {}
+        # SQLite에서 한 번 읽어 온 (서비스, 날짜)
+        self._loaded: set = set()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        self._conn_: Optional[sqlite3.Connection] = None
+        self.persistent = True
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn().execute(
+                "CREATE TABLE IF NOT EXISTS usage ("
+                " service TEXT, key_id TEXT, endpoint TEXT, day TEXT, count INTEGER NOT NULL,"
+                " PRIMARY KEY (service, key_id, endpoint, day))"
+            )
+        except Exception:
+            self.persistent = False
+
+    def _conn(self) -> sqlite3.Connection:
+        # 처음 읽을 때와 백그라운드 저장에서만 쓰고, _flush_lock으로 한 번에 한 스레드만 사용
+        if self._conn_ is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            self._conn_ = conn
+        return self._conn_
+
+    def _read(self, service: str, day: str) -> Dict[Tuple[str, str, str, str], int]:
+        rows = self._conn().execute(
+            "SELECT key_id, endpoint, count FROM usage WHERE service = ? AND day = ?", (service, day)
+        ).fetchall()
+        return {(service, kid, endpoint, day): count for kid, endpoint, count in rows}
+
+    def _load(self, service: str, day: str) -> None:
+        """(서비스, 날짜)를 처음 쓸 때 한 번만 SQLite에서 읽어 메모리 카운터에 합침."""
+        if not self.persistent or (service, day) in self._loaded:
+            return
+        with self._flush_lock:
+            if (service, day) in self._loaded:
+                return
+            try:
+                stored = self._read(service, day)
+            except Exception:
+                stored = {}
+            with self._lock:
+                for k, count in stored.items():
+                    if k not in self._sets:
+                        self._counts[k] = count + self._deltas.get(k, 0)
+                self._loaded.add((service, day))
+
+    def _schedule(self) -> None:
+        if not self.persistent:
+            return
+        if self._flusher is None:
+            with self._lock:
+                if self._flusher is None:
+                    self._flusher = threading.Thread(target=self._run, name="quota-flush", daemon=True)
+                    self._flusher.start()
+                    atexit.register(self.flush)
+        self._wake.set()
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait()
+            time.sleep(self.flush_interval)  # 그 사이 호출을 모아 한 번에 저장
+            self._wake.clear()
+            self.flush()
+
+    def flush(self) -> None:
+        """쌓인 증가분을 SQLite에 쓰고, 다른 프로세스가 쓴 값을 포함한 합계로 메모리 카운터를 갱신."""
+        if not self.persistent:
+            return
+        with self._flush_lock:
+            with self._lock:
+                deltas, self._deltas = self._deltas, {}
+                sets, self._sets = self._sets, {}
+                loaded = set(self._loaded)
+            try:
+                conn = self._conn()
+                conn.execute("BEGIN")
+                conn.executemany(
+                    "INSERT INTO usage (service, key_id, endpoint, day, count) VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT(service, key_id, endpoint, day) DO UPDATE SET count = count + excluded.count",
+                    [(*k, n) for k, n in deltas.items() if k not in sets],
+                )
+                conn.executemany(
+                    "INSERT OR REPLACE INTO usage (service, key_id, endpoint, day, count) VALUES (?, ?, ?, ?, ?)",
+                    [(*k, n) for k, n in sets.items()],
+                )
+                conn.execute("COMMIT")
+                stored: Dict[Tuple[str, str, str, str], int] = {}
+                for service, day in loaded:
+                    stored.update(self._read(service, day))
+            except Exception:
+                try:
+                    self._conn().execute("ROLLBACK")
+                except Exception:
+                    pass
+                # 다음 저장 때 다시 시도
+                with self._lock:
+                    for k, n in deltas.items():
+                        self._deltas[k] = self._deltas.get(k, 0) + n
+                    for k, n in sets.items():
+                        self._sets.setdefault(k, n)
+                return
+            with self._lock:
+                for k, count in stored.items():
+                    if k not in self._sets:
+                        self._counts[k] = count + self._deltas.get(k, 0)
+
+    def add(self, service: str, kid: str, endpoint: str, day: str, n: int = 1) -> None:
+        self._load(service, day)
+        k = (service, kid, endpoint, day)
+        with self._lock:
+            self._counts[k] = self._counts.get(k, 0) + n
+            if k in self._sets:
+                self._sets[k] += n
+            else:
+                self._deltas[k] = self._deltas.get(k, 0) + n
+        self._schedule()
+
+    def set(self, service: str, kid: str, endpoint: str, day: str, count: int) -> None:
+        self._load(service, day)
+        k = (service, kid, endpoint, day)
+        with self._lock:
+            self._counts[k] = count
+            self._sets[k] = count
+            self._deltas.pop(k, None)
+        self._schedule()
+
+    def usage(self, service: str, day: str) -> Dict[Tuple[str, str], int]:
+        """{(key_id, endpoint): count}"""
+        self._load(service, day)
+        with self._lock:
+            return {(k, e): c for (s, k, e, d), c in self._counts.items() if s == service and d == day}
+
+
+class KeyPool:
+    """
+    서비스 하나의 API 키 풀. 요청마다 일일 한도가 남아 있고 토큰이 있는 키를 돌아가며 골라 줌.
+    - 키별 토큰 버킷(rate_per_key)과 엔드포인트별 토큰 버킷(rate_per_endpoint)을 모두 통과해야 함
+    - 일일 카운터는 (키, 엔드포인트) 단위로 QuotaStore에 저장
+    """
+
+    def __init__(
+        self,
+        service: str,
+        keys: List[str],
+        daily_quota: int,
+        rate_per_key: float,
+        rate_per_endpoint: float,
+        store: Optional[QuotaStore] = None,
+    ):
+        self.service = service
+        self.keys = list(keys)
+        self.daily_quota = daily_quota
+        self.rate_per_key = rate_per_key
+        self.rate_per_endpoint = rate_per_endpoint
+        self._store = store
+        self._key_buckets = {key: TokenBucket(rate_per_key) for key in self.keys}
+        self._endpoint_buckets: Dict[str, TokenBucket] = {}
+        self._next = 0
+        self._lock = threading.Lock()
+
+    @property
+    def store(self) -> QuotaStore:
+        # 모듈을 읽을 때가 아니라 처음 키를 고를 때 저장소(SQLite 파일)를 엶
+        if self._store is None:
+            self._store = get_store()
+        return self._store
+
+    def _endpoint_bucket(self, endpoint: str) -> TokenBucket:
+        with self._lock:
+            bucket = self._endpoint_buckets.get(endpoint)
+            if bucket is None:
+                bucket = self._endpoint_buckets[endpoint] = TokenBucket(self.rate_per_endpoint)
+            return bucket
+
+    def _used(self, endpoint: str) -> Dict[str, int]:
+        try:
+            usage = self.store.usage(self.service, today())
+        except Exception:
+            usage = {}
+        return {key: usage.get((key_id(key), endpoint), 0) for key in self.keys}
+
+    def _try_acquire(self, endpoint: str) -> Tuple[Optional[str], float]:
+        """(키, 0) 또는 (None, 다음 시도까지 기다릴 초). 모든 키가 한도 소진이면 QuotaExhausted."""
+        used = self._used(endpoint)
+        available = [key for key in self.keys if used[key] < self.daily_quota]
+        if not available:
+            raise QuotaExhausted(f"{self.service}: 모든 API 키의 일일 호출 한도({self.daily_quota}회)를 소진했습니다")
+        endpoint_bucket = self._endpoint_bucket(endpoint)
+        if not endpoint_bucket.take():
+            return None, endpoint_bucket.delay()
+        with self._lock:
+            start = self._next
+            self._next = (self._next + 1) % max(1, len(self.keys))
+        # 라운드 로빈 순서로 돌되, 오늘 덜 쓴 키를 우선
+        ordered = sorted(
+            (available[(start + i) % len(available)] for i in range(len(available))),
+            key=lambda k: used[k],
+        )
+        waits = []
+        for key in ordered:
+            bucket = self._key_buckets[key]
+            if bucket.take():
+                try:
+                    self.store.add(self.service, key_id(key), endpoint, today())
+                except Exception:
+                    pass
+                return key, 0.0
+            waits.append(bucket.delay())
+        endpoint_bucket.refund()
+        return None, min(waits) if waits else MAX_WAIT
+
+    @staticmethod
+    def _give_up_at(max_wait: float) -> Tuple[float, bool]:
+        """기다림을 포기할 시각과, 그 시각이 질의 데드라인 때문에 당겨졌는지."""
+        left = deadline.remaining()
+        if left is not None and left < max_wait:
+            return time.monotonic() + left, True
+        return time.monotonic() + max_wait, False
+
+    def acquire(self, endpoint: str, max_wait: float = MAX_WAIT) -> str:
+        """
+        사용할 키를 골라 호출 1회를 기록. 한도가 없으면 QuotaExhausted,
+        max_wait 안에 토큰이 안 생기면 RateLimited.
+        """
+        give_up_at, by_deadline = self._give_up_at(max_wait)
+        while True:
+            key, wait = self._try_acquire(endpoint)
+            if key is not None:
+                return key
+            if time.monotonic() + wait > give_up_at:
+                if by_deadline:
+                    raise deadline.DeadlineExceeded(f"{self.service}: 질의 시간 예산 안에 호출 속도 제한이 풀리지 않습니다")
+                raise RateLimited(f"{self.service}: 호출 속도 제한으로 {max_wait:.0f}초 안에 요청을 보낼 수 없습니다")
+            time.sleep(wait)
+
+    async def acquire_async(self, endpoint: str, max_wait: float = MAX_WAIT) -> str:
+        """acquire의 비동기 버전 (기다리는 동안 이벤트 루프를 막지 않음)."""
+        give_up_at, by_deadline = self._give_up_at(max_wait)
+        while True:
+            key, wait = self._try_acquire(endpoint)
+            if key is not None:
+                return key
+            if time.monotonic() + wait > give_up_at:
+                if by_deadline:
+                    raise deadline.DeadlineExceeded(f"{self.service}: 질의 시간 예산 안에 호출 속도 제한이 풀리지 않습니다")
+                raise RateLimited(f"{self.service}: 호출 속도 제한으로 {max_wait:.0f}초 안에 요청을 보낼 수 없습니다")
+            await asyncio.sleep(wait)
+
+    def mark_exhausted(self, key: str, endpoint: str) -> None:
+        """상위 API가 한도 초과를 알려 오면 오늘은 그 키를 더 쓰지 않음."""
+        try:
+            self.store.set(self.service, key_id(key), endpoint, today(), self.daily_quota)
+        except Exception:
+            pass
+
+    def check_response(self, key: str, endpoint: str, content: bytes) -> bool:
+        """상위 응답 본문(HTTP 200이어도)이 한도 초과 오류면 그 키를 소진 처리하고 True."""
+        # 한도 초과 응답은 짧은 오류 메시지뿐이므로 큰 정상 응답은 검사하지 않음
+        if len(content) <= 4096 and any(marker.encode() in content for marker in QUOTA_ERROR_MARKERS):
+            self.mark_exhausted(key, endpoint)
+            return True
+        return False
+
+    def _record_extra(self, key: str, endpoint: str, sent: List[int]) -> None:
+        """acquire가 센 1회 외에 전송 계층이 더 보낸 요청(5xx 재시도, 헤지)을 일일 카운터에 더함."""
+        if sent[0] > 1:
+            try:
+                self.store.add(self.service, key_id(key), endpoint, today(), sent[0] - 1)
+            except Exception:
+                pass
+
+    def send(self, endpoint: str, request: Callable[[str], Tuple[str, Any]]) -> Tuple[str, Any]:
+        """
+        키를 골라 request(key) → (mode, response)를 보냄. 응답이 한도 초과면 다른 키로 다시 보내고,
+        풀의 키를 모두 소진하면 QuotaExhausted (그 응답은 결과로 만들지 않으므로 캐시에도 남지 않음).
+        """
+        while True:
+            key = self.acquire(endpoint)
+            with http_transport.count_sent() as sent:
+                try:
+                    mode, resp = request(key)
+                finally:
+                    self._record_extra(key, endpoint, sent)
+            if not self.check_response(key, endpoint, resp.content):
+                return mode, resp
+
+    async def send_async(self, endpoint: str, request: Callable[[str], Awaitable[Tuple[str, Any]]]) -> Tuple[str, Any]:
+        """send의 비동기 버전."""
+        while True:
+            key = await self.acquire_async(endpoint)
+            with http_transport.count_sent() as sent:
+                try:
+                    mode, resp = await request(key)
+                finally:
+                    self._record_extra(key, endpoint, sent)
+            if not self.check_response(key, endpoint, resp.content):
+                return mode, resp
+
+    def status(self) -> Dict[str, Any]:
+        """키/엔드포인트별 오늘 사용량과 남은 호출 수."""
+        day = today()
+        try:
+            usage = self.store.usage(self.service, day)
+        except Exception as e:
+            return {"service": self.service, "day": day, "error": str(e)}
+        keys = []
+        for key in self.keys:
+            kid = key_id(key)
+            endpoints = {e: c for (k, e), c in usage.items() if k == kid}
+            keys.append({
+                "key_id": kid,
+                "endpoints": {
+                    e: {"used": c, "remaining": max(0, self.daily_quota - c)} for e, c in endpoints.items()
+                },
+            })
+        exhausted = sorted(
+            e for e in {e for (_, e) in usage}
+            if all(usage.get((key_id(key), e), 0) >= self.daily_quota for key in self.keys)
+        )
+        return {
+            "service": self.service,
+            "day": day,
+            "daily_quota_per_key": self.daily_quota,
+            "key_count": len(self.keys),
+            "rate_per_key": self.rate_per_key,
+            "rate_per_endpoint": self.rate_per_endpoint,
+            "keys": keys,
+            "exhausted_endpoints": exhausted,
+        }
+
+
+_store: Optional[QuotaStore] = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> QuotaStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = QuotaStore()
+    return _store
+
+
+def pool_from_env(service: str, key_env: str, prefix: str, default_key: str = "") -> KeyPool:
+    """
+    환경 변수로 키 풀 구성:
+    - {key_env}, {key_env}S: 콤마로 구분한 키 목록 (여러 개면 돌아가며 사용)
+    - {prefix}_DAILY_QUOTA, {prefix}_RATE_PER_SEC, {prefix}_ENDPOINT_RATE_PER_SEC
+    """
+    keys = env_keys(key_env, key_env + "S") or ([default_key] if default_key else [])
+    return KeyPool(
+        service=service,
+        keys=keys,
+        daily_quota=int(os.getenv(f"{prefix}_DAILY_QUOTA") or 10000),
+        rate_per_key=float(os.getenv(f"{prefix}_RATE_PER_SEC") or 10),
+        rate_per_endpoint=float(os.getenv(f"{prefix}_ENDPOINT_RATE_PER_SEC") or 20),
+    )
@@ -1,59 +1,121 @@
 # realestate_server.py — 부동산 실거래가 MCP 서버
+import asyncio
 import os
-import ssl
-from typing import Any, Dict, Optional, Tuple, Iterable
+import threading
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
 
-import httpx
 from dotenv import load_dotenv
 from mcp.server.fastmcp import FastMCP
 
+import deadline
+import http_transport
+import mcp_common
+import molit_xml
+import pagination
+import quota
+import response_cache
+
 load_dotenv()
 
 mcp = FastMCP("realestate-mcp")
 
 # 국토교통부 부동산 실거래가 API
 BASE_URL = (os.getenv("MOLIT_BASE_URL") or "https://apis.data.go.kr/1613000/RTMSDataSvcAptTrade").rstrip("/")
-API_KEY = (os.getenv("MOLIT_API_KEY") or "").strip()
+# MOLIT_API_KEY에 콤마로 여러 키를 넣으면 요청마다 돌아가며 사용
+_keys = quota.pool_from_env("realestate", "MOLIT_API_KEY", "MOLIT")
+API_KEY = _keys.keys[0] if _keys.keys else ""
+# 여러 지역·여러 달 일괄 조회 시 동시에 진행할 (지역, 계약년월) 수와 한 번에 받을 수 있는 최대 개월 수
+BULK_WORKERS = int(os.getenv("MOLIT_BULK_WORKERS") or 8)
+BULK_MAX_MONTHS = int(os.getenv("MOLIT_BULK_MAX_MONTHS") or 60)
 
-def _client_candidates() -> Iterable[Tuple[str, httpx.Client]]:
+def _try_get(url: str, params: Dict[str, Any]):
     """
-    TLS/SSL 환경에 따라 순차적으로 시도할 httpx.Client 후보들.
+    공용 전송 계층(http_transport)으로 GET. 성공하면 (mode, response) 반환.
     """
-    # 1) 기본값
-    yield "default", httpx.Client(http2=False, timeout=20, trust_env=True)
+    return http_transport.get_transport().get(url, params)
+
+
+async def _try_get_async(url: str, params: Dict[str, Any]):
+    """_try_get의 비동기 버전 (공유 AsyncClient 사용)."""
+    return await http_transport.get_async_transport().get(url, params)
+
+
+def _build_request(
+    endpoint: str,
+    lawdcd: str,
+    deal_ymd: str,
+    page_no: int,
+    num_rows: int,
+    filters: Optional[Dict[str, Any]],
+) -> Tuple[str, Dict[str, Any]]:
+    url = f"{BASE_URL}/{endpoint}" if endpoint else BASE_URL
+    params: Dict[str, Any] = {
+        "serviceKey": API_KEY,
+        "pageNo": page_no,
+        "numOfRows": num_rows,
+        "LAWD_CD": lawdcd,
+        "DEAL_YMD": deal_ymd,
+    }
+    if filters:
+        params.update(filters)
+    return url, params
 
-    # 2) TLS 1.2 이상 + 낮은 보안 레벨
+
+def _build_result(mode: str, resp) -> Dict[str, Any]:
+    req_url = str(resp.request.url)
+    status_code = resp.status_code
+    resp.raise_for_status()
+    result: Dict[str, Any] = {
+        "status": "ok",
+        "ssl_mode": mode,
+        "circuit": http_transport.circuit_state(req_url),
+        "request_url": req_url,
+        "status_code": status_code,
+    }
     try:
-        tls = ssl.create_default_context()
-        tls.minimum_version = ssl.TLSVersion.TLSv1_2
+        # 본문은 전송 계층이 이미 다 받아 두었음 (한도 초과 검사에도 씀). 문자열 디코딩·전체 트리 없이
+        # <item>이 끝날 때마다 타입이 정해진 행으로 바꾸고 버림
+        parsed = molit_xml.parse_trades([resp.content])
+    except ET.ParseError:
+        # XML이 아닌 응답(JSON 오류 메시지 등)은 그대로 전달
         try:
-            tls.set_ciphers("DEFAULT:@SECLEVEL=1")
+            result["data"] = resp.json()
         except Exception:
-            pass
-        yield "tls12_seclevel1", httpx.Client(verify=tls, http2=False, timeout=20, trust_env=True)
-    except Exception:
-        pass
+            result["text"] = resp.text
+        return result
+    result["items"] = parsed.items
+    result["total_count"] = parsed.total_count
+    if parsed.api_error:
+        result["api_error"] = parsed.api_error
+    return result
 
-    # 3) 최후 수단: 인증서 검증 비활성화
-    yield "insecure", httpx.Client(verify=False, http2=False, timeout=20, trust_env=True)
 
+def _fetch(url: str, params: Dict[str, Any], endpoint: str) -> Dict[str, Any]:
+    """키 풀에서 한도·속도 제한을 통과한 키를 골라 실제 상위 호출 (본문이 한도 초과면 다른 키로 다시)."""
+    try:
+        mode, resp = _keys.send(endpoint, lambda key: _try_get(url, {**params, "serviceKey": key}))
+    except quota.QuotaExhausted as e:
+        return mcp_common.quota_error(url, e)
+    return _build_result(mode, resp)
+
+
+async def _fetch_async(url: str, params: Dict[str, Any], endpoint: str) -> Dict[str, Any]:
+    """_fetch의 비동기 버전."""
+    try:
+        mode, resp = await _keys.send_async(endpoint, lambda key: _try_get_async(url, {**params, "serviceKey": key}))
+    except quota.QuotaExhausted as e:
+        return mcp_common.quota_error(url, e)
+    return _build_result(mode, resp)
 
-def _try_get(url: str, params: Dict[str, Any]):
-    """
-    위의 후보 클라이언트들을 순서대로 시도. 성공하면 (mode, response) 반환.
-    """
-    last_err: Optional[Exception] = None
-    for mode, client in _client_candidates():
-        try:
-            with client as c:
-                resp = c.get(url, params=params)
-                return mode, resp
-        except Exception as e:
-            last_err = e
-            continue
-    if last_err:
-        raise last_err
-    raise RuntimeError("No HTTP client candidates available")
+
+def _missing_key_error(endpoint: str) -> Dict[str, Any]:
+    return {
+        "status": "error",
+        "message": "MOLIT_API_KEY is missing in .env",
+        "request_url": f"{BASE_URL}/{endpoint}",
+    }
 
 
 def call_molit_api(
@@ -63,61 +125,78 @@ def call_molit_api(
     page_no: int = 1,
     num_rows: int = 10,
     filters: Optional[Dict[str, Any]] = None,
+    closed_ttl: Optional[float] = response_cache.CLOSED_MONTH_TTL,  # None이면 마감된 달은 만료 없이 캐시
 ):
     if not API_KEY:
+        return _missing_key_error(endpoint)
+
+    url, params = _build_request(endpoint, lawdcd, deal_ymd, page_no, num_rows, filters)
+    try:
+        # 신고기한이 지난 달은 길게, 진행 중인 달은 짧게 캐시
+        return response_cache.get_cache().cached_call(
+            response_cache.fingerprint(url, params),
+            lambda: _fetch(url, params, endpoint),
+            lambda _: response_cache.month_ttl(deal_ymd, closed_ttl),
+        )
+    except deadline.DeadlineExceeded as e:
+        return mcp_common.deadline_error(url, e)
+    except Exception as e:
         return {
             "status": "error",
-            "message": "MOLIT_API_KEY is missing in .env",
-            "request_url": f"{BASE_URL}/{endpoint}",
+            "message": str(e),
+            "request_url": url,
+            "circuit": http_transport.circuit_state(url),
         }
 
-    url = f"{BASE_URL}/{endpoint}" if endpoint else BASE_URL
-    params: Dict[str, Any] = {
-        "serviceKey": API_KEY,
-        "pageNo": page_no,
-        "numOfRows": num_rows,
-        "LAWD_CD": lawdcd,
-        "DEAL_YMD": deal_ymd,
-    }
-    if filters:
-        params.update(filters)
+
+async def call_molit_api_async(
+    endpoint: str = "getRTMSDataSvcAptTrade",
+    lawdcd: str = "",
+    deal_ymd: str = "",
+    page_no: int = 1,
+    num_rows: int = 10,
+    filters: Optional[Dict[str, Any]] = None,
+    closed_ttl: Optional[float] = response_cache.CLOSED_MONTH_TTL,  # None이면 마감된 달은 만료 없이 캐시
+):
+    """call_molit_api의 비동기 버전."""
+    if not API_KEY:
+        return _missing_key_error(endpoint)
+
+    url, params = _build_request(endpoint, lawdcd, deal_ymd, page_no, num_rows, filters)
 
     try:
-        mode, resp = _try_get(url, params)
-        req_url = str(resp.request.url)
-        status_code = resp.status_code
-        resp.raise_for_status()
-        try:
-            return {
-                "status": "ok",
-                "ssl_mode": mode,
-                "request_url": req_url,
-                "status_code": status_code,
-                "data": resp.json(),
-            }
-        except Exception:
-            return {
-                "status": "ok",
-                "ssl_mode": mode,
-                "request_url": req_url,
-                "status_code": status_code,
-                "text": resp.text,
-            }
+        return await response_cache.get_cache().cached_call_async(
+            response_cache.fingerprint(url, params),
+            lambda: _fetch_async(url, params, endpoint),
+            lambda _: response_cache.month_ttl(deal_ymd, closed_ttl),
+        )
+    except deadline.DeadlineExceeded as e:
+        return mcp_common.deadline_error(url, e)
     except Exception as e:
         return {
             "status": "error",
             "message": str(e),
             "request_url": url,
+            "circuit": http_transport.circuit_state(url),
         }
 
 
-@mcp.tool()
+APT_TRADE_ENDPOINT = "getRTMSDataSvcAptTrade"
+OFFICE_TRADE_ENDPOINT = "OpenAPI_ToolInstallPackage/service/rest/RTMSOBJSvc/getRTMSDataSvcOffiTrade"
+HOUSE_TRADE_ENDPOINT = "OpenAPI_ToolInstallPackage/service/rest/RTMSOBJSvc/getRTMSDataSvcSHRent"
+
+
+# 도구마다 요청 인자를 만드는 함수 하나로 동기 버전(오케스트레이터 등 프로세스 내부 호출용)과
+# 같은 이름의 비동기 MCP 도구를 함께 만듦 (mcp_common.twin_tool)
+@mcp_common.twin_tool(mcp, call_molit_api, call_molit_api_async)
 def getApartmentTrades(
     lawdcd: str,
     deal_ymd: str,
     pageNo: int = 1,
     numOfRows: int = 10,
     filters: Optional[Dict[str, Any]] = None,
+    fields: Optional[List[str]] = None,
+    compact: bool = False,
 ):
     """
     아파트 실거래가 조회
@@ -125,67 +204,434 @@ def getApartmentTrades(
     - deal_ymd: 계약년월 YYYYMM (예: 202506)
     - pageNo, numOfRows: 페이지/행 수
     - filters: 추가 필터 파라미터
+    - fields: 항목마다 남길 컬럼 목록, compact: 원문·전송 메타데이터를 뺀 축약 응답
     """
-    return call_molit_api(
-        endpoint="getRTMSDataSvcAptTrade",
-        lawdcd=lawdcd,
-        deal_ymd=deal_ymd,
-        page_no=pageNo,
-        num_rows=numOfRows,
-        filters=filters
+    return dict(
+        endpoint=APT_TRADE_ENDPOINT, lawdcd=lawdcd, deal_ymd=deal_ymd, page_no=pageNo, num_rows=numOfRows, filters=filters
     )
 
 
-@mcp.tool()
+@mcp_common.twin_tool(mcp, call_molit_api, call_molit_api_async)
 def getOfficeTrades(
     lawdcd: str,
     deal_ymd: str,
     pageNo: int = 1,
     numOfRows: int = 10,
     filters: Optional[Dict[str, Any]] = None,
+    fields: Optional[List[str]] = None,
+    compact: bool = False,
 ):
     """
     오피스텔 실거래가 조회
     - lawdcd: 법정동코드 5자리
     - deal_ymd: 계약년월 YYYYMM
+    - fields: 항목마다 남길 컬럼 목록, compact: 원문·전송 메타데이터를 뺀 축약 응답
     """
-    return call_molit_api(
-        endpoint="OpenAPI_ToolInstallPackage/service/rest/RTMSOBJSvc/getRTMSDataSvcOffiTrade",
-        lawdcd=lawdcd,
-        deal_ymd=deal_ymd,
-        page_no=pageNo,
-        num_rows=numOfRows,
-        filters=filters
+    return dict(
+        endpoint=OFFICE_TRADE_ENDPOINT, lawdcd=lawdcd, deal_ymd=deal_ymd, page_no=pageNo, num_rows=numOfRows, filters=filters
     )
 
 
-@mcp.tool()
+@mcp_common.twin_tool(mcp, call_molit_api, call_molit_api_async)
 def getHouseTrades(
     lawdcd: str,
     deal_ymd: str,
     pageNo: int = 1,
     numOfRows: int = 10,
     filters: Optional[Dict[str, Any]] = None,
+    fields: Optional[List[str]] = None,
+    compact: bool = False,
 ):
     """
     단독/다가구 실거래가 조회
     - lawdcd: 법정동코드 5자리
     - deal_ymd: 계약년월 YYYYMM
+    - fields: 항목마다 남길 컬럼 목록, compact: 원문·전송 메타데이터를 뺀 축약 응답
+    """
+    return dict(
+        endpoint=HOUSE_TRADE_ENDPOINT, lawdcd=lawdcd, deal_ymd=deal_ymd, page_no=pageNo, num_rows=numOfRows, filters=filters
+    )
+
+
+def _trade_items(result: Dict[str, Any]) -> List[Dict[str, Any]]:
+    if "items" in result:
+        return result["items"] or []
+    # 예전 형식(원문 XML text)으로 저장된 캐시 항목
+    text = result.get("text")
+    if not text:
+        return []
+    try:
+        return molit_xml.parse_trades([text.encode("utf-8")]).items
+    except ET.ParseError:
+        return []
+
+
+def iter_trades(
+    lawdcd: str,
+    deal_ymd: str,
+    endpoint: str = APT_TRADE_ENDPOINT,
+    numOfRows: int = 1000,
+    maxRecords: Optional[int] = None,
+) -> Iterator[Dict[str, Any]]:
+    """(지역, 계약년월)의 실거래 전체 페이지를 돌며 거래를 하나씩 내보냄 (남은 페이지는 동시에 미리 받아 둠)."""
+    return pagination.iterate(
+        lambda page: call_molit_api(endpoint=endpoint, lawdcd=lawdcd, deal_ymd=deal_ymd, page_no=page, num_rows=numOfRows),
+        _trade_items,
+        numOfRows,
+        maxRecords,
+    )
+
+
+def aiter_trades(
+    lawdcd: str,
+    deal_ymd: str,
+    endpoint: str = APT_TRADE_ENDPOINT,
+    numOfRows: int = 1000,
+    maxRecords: Optional[int] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """iter_trades의 비동기 버전."""
+    return pagination.aiterate(
+        lambda page: call_molit_api_async(
+            endpoint=endpoint, lawdcd=lawdcd, deal_ymd=deal_ymd, page_no=page, num_rows=numOfRows
+        ),
+        _trade_items,
+        numOfRows,
+        maxRecords,
+    )
+
+
+def _all_trades(
+    endpoint: str,
+    lawdcd: str,
+    deal_ymd: str,
+    numOfRows: int,
+    maxRecords: Optional[int],
+    closed_ttl: Optional[float] = response_cache.CLOSED_MONTH_TTL,
+):
+    return pagination.collect(
+        lambda page: call_molit_api(
+            endpoint=endpoint, lawdcd=lawdcd, deal_ymd=deal_ymd, page_no=page, num_rows=numOfRows, closed_ttl=closed_ttl
+        ),
+        _trade_items,
+        numOfRows,
+        maxRecords,
+    )
+
+
+async def _all_trades_async(
+    endpoint: str,
+    lawdcd: str,
+    deal_ymd: str,
+    numOfRows: int,
+    maxRecords: Optional[int],
+    closed_ttl: Optional[float] = response_cache.CLOSED_MONTH_TTL,
+):
+    return await pagination.collect_async(
+        lambda page: call_molit_api_async(
+            endpoint=endpoint, lawdcd=lawdcd, deal_ymd=deal_ymd, page_no=page, num_rows=numOfRows, closed_ttl=closed_ttl
+        ),
+        _trade_items,
+        numOfRows,
+        maxRecords,
+    )
+
+
+@mcp_common.twin_tool(mcp, _all_trades, _all_trades_async)
+def getAllApartmentTrades(
+    lawdcd: str,
+    deal_ymd: str,
+    numOfRows: int = 1000,
+    maxRecords: Optional[int] = None,
+    fields: Optional[List[str]] = None,
+    compact: bool = False,
+):
+    """
+    아파트 실거래가 전체 조회 (모든 페이지, 거래를 items로 반환)
+    - lawdcd: 법정동코드 5자리, deal_ymd: 계약년월 YYYYMM
+    - maxRecords: 최대 거래 수 (없으면 전체)
+    - fields: 항목마다 남길 컬럼 목록, compact: 원문·전송 메타데이터를 뺀 축약 응답
+    """
+    return dict(endpoint=APT_TRADE_ENDPOINT, lawdcd=lawdcd, deal_ymd=deal_ymd, numOfRows=numOfRows, maxRecords=maxRecords)
+
+
+@mcp_common.twin_tool(mcp, _all_trades, _all_trades_async)
+def getAllOfficeTrades(
+    lawdcd: str,
+    deal_ymd: str,
+    numOfRows: int = 1000,
+    maxRecords: Optional[int] = None,
+    fields: Optional[List[str]] = None,
+    compact: bool = False,
+):
+    """
+    오피스텔 실거래가 전체 조회 (모든 페이지)
+    - fields: 항목마다 남길 컬럼 목록, compact: 원문·전송 메타데이터를 뺀 축약 응답
+    """
+    return dict(endpoint=OFFICE_TRADE_ENDPOINT, lawdcd=lawdcd, deal_ymd=deal_ymd, numOfRows=numOfRows, maxRecords=maxRecords)
+
+
+@mcp_common.twin_tool(mcp, _all_trades, _all_trades_async)
+def getAllHouseTrades(
+    lawdcd: str,
+    deal_ymd: str,
+    numOfRows: int = 1000,
+    maxRecords: Optional[int] = None,
+    fields: Optional[List[str]] = None,
+    compact: bool = False,
+):
+    """
+    단독/다가구 실거래가 전체 조회 (모든 페이지)
+    - fields: 항목마다 남길 컬럼 목록, compact: 원문·전송 메타데이터를 뺀 축약 응답
+    """
+    return dict(endpoint=HOUSE_TRADE_ENDPOINT, lawdcd=lawdcd, deal_ymd=deal_ymd, numOfRows=numOfRows, maxRecords=maxRecords)
+
+
+TRADE_ENDPOINTS = {
+    "apartment": APT_TRADE_ENDPOINT,
+    "office": OFFICE_TRADE_ENDPOINT,
+    "house": HOUSE_TRADE_ENDPOINT,
+}
+
+
+def month_range(start_ymd: str, end_ymd: str) -> List[str]:
+    """YYYYMM 두 값 사이(양끝 포함)의 계약년월 목록. 형식이 틀리거나 시작이 끝보다 늦으면 ValueError."""
+    for ymd in (start_ymd, end_ymd):
+        if len(ymd) != 6 or not ymd.isdigit() or not 1 <= int(ymd[4:]) <= 12:
+            raise ValueError(f"계약년월 형식은 YYYYMM입니다: {ymd}")
+    if start_ymd > end_ymd:
+        raise ValueError(f"시작 계약년월({start_ymd})이 끝 계약년월({end_ymd})보다 늦습니다")
+    year, month = int(start_ymd[:4]), int(start_ymd[4:])
+    months = []
+    while f"{year:04d}{month:02d}" <= end_ymd:
+        months.append(f"{year:04d}{month:02d}")
+        if len(months) > BULK_MAX_MONTHS:
+            raise ValueError(f"한 번에 조회할 수 있는 기간은 최대 {BULK_MAX_MONTHS}개월입니다")
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
+def _bulk_plan(lawdcds: List[str], start_ymd: str, end_ymd: str, propertyType: str) -> Tuple[str, List[Tuple[str, str]]]:
+    endpoint = TRADE_ENDPOINTS.get(propertyType)
+    if endpoint is None:
+        raise ValueError(f"propertyType은 {', '.join(TRADE_ENDPOINTS)} 중 하나입니다: {propertyType}")
+    codes = list(dict.fromkeys(code.strip() for code in lawdcds if code and code.strip()))
+    if not codes:
+        raise ValueError("lawdcds가 비어 있습니다")
+    return endpoint, [(code, ymd) for code in codes for ymd in month_range(start_ymd, end_ymd)]
+
+
+def _merge_trades(pairs: List[Tuple[str, str]], results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    (지역, 계약년월)별 결과를 하나로 합침. pairs는 _bulk_plan이 이미 중복을 없앤 목록이고,
+    같은 날 같은 단지·층·금액의 거래가 실제로 여러 건일 수 있으므로 행 내용으로도 중복을 가리지 않음.
+    """
+    items: List[Dict[str, Any]] = []
+    by_pair: Dict[str, int] = {}
+    errors: List[Dict[str, Any]] = []
+    timed_out = any(result.get("status") == "timeout" or result.get("timed_out") for result in results)
+    for (lawdcd, deal_ymd), result in zip(pairs, results):
+        by_pair[f"{lawdcd}:{deal_ymd}"] = len(result.get("items") or [])
+        for err in result.get("errors") or []:
+            errors.append({"lawdcd": lawdcd, "deal_ymd": deal_ymd, **err})
+        items.extend(result.get("items") or [])
+    items.sort(key=lambda t: (
+        t.get("sggCd", ""),
+        int(t.get("dealYear") or 0),
+        int(t.get("dealMonth") or 0),
+        int(t.get("dealDay") or 0),
+    ))
+    if not errors:
+        status = "ok"
+    elif items:
+        status = "partial"
+    else:
+        status = "timeout" if timed_out else "error"
+    merged: Dict[str, Any] = {"status": status, "items": items, "count": len(items), "pairs": len(pairs), "by_pair": by_pair}
+    if errors:
+        merged["errors"] = errors
+    if timed_out:
+        merged["timed_out"] = True
+    return merged
+
+
+def _bulk_error(e: BaseException) -> Dict[str, Any]:
+    return {"status": "error", "items": [], "errors": [{"page": None, "message": str(e)}]}
+
+
+_bulk_pool: Optional[ThreadPoolExecutor] = None
+_bulk_pool_lock = threading.Lock()
+
+
+def _bulk_executor() -> ThreadPoolExecutor:
+    """일괄 조회가 같이 쓰는 BULK_WORKERS개짜리 풀 (호출마다 풀을 만들거나 페이지 순회 풀을 중첩하지 않음)."""
+    global _bulk_pool
+    if _bulk_pool is None:
+        with _bulk_pool_lock:
+            if _bulk_pool is None:
+                _bulk_pool = ThreadPoolExecutor(max_workers=max(1, BULK_WORKERS), thread_name_prefix="bulk")
+    return _bulk_pool
+
+
+def _bulk_fetch(endpoint: str, pairs: List[Tuple[str, str]], numOfRows: int) -> Dict[str, Any]:
+    """(지역, 계약년월) 조합의 모든 페이지를 공유 풀 하나에서 평평하게 받고 하나로 합침."""
+    def _fetcher(lawdcd: str, deal_ymd: str):
+        return lambda page: call_molit_api(
+            endpoint=endpoint, lawdcd=lawdcd, deal_ymd=deal_ymd, page_no=page, num_rows=numOfRows, closed_ttl=None
+        )
+
+    results = pagination.collect_many(
+        [_fetcher(lawdcd, deal_ymd) for lawdcd, deal_ymd in pairs], _trade_items, numOfRows, _bulk_executor()
+    )
+    return _merge_trades(pairs, results)
+
+
+async def _bulk_fetch_async(endpoint: str, pairs: List[Tuple[str, str]], numOfRows: int) -> Dict[str, Any]:
+    limit = asyncio.Semaphore(max(1, BULK_WORKERS))
+
+    async def _one(lawdcd: str, deal_ymd: str) -> Dict[str, Any]:
+        async with limit:
+            return await _all_trades_async(endpoint, lawdcd, deal_ymd, numOfRows, None, None)
+
+    gathered = await asyncio.gather(*(_one(lawdcd, deal_ymd) for lawdcd, deal_ymd in pairs), return_exceptions=True)
+    results = [r if not isinstance(r, BaseException) else _bulk_error(r) for r in gathered]
+    return _merge_trades(pairs, results)
+
+
+def _bulk_trades(lawdcds: List[str], start_ymd: str, end_ymd: str, propertyType: str, numOfRows: int) -> Dict[str, Any]:
+    try:
+        endpoint, pairs = _bulk_plan(lawdcds, start_ymd, end_ymd, propertyType)
+    except ValueError as e:
+        return {"status": "error", "message": str(e)}
+    return _bulk_fetch(endpoint, pairs, numOfRows)
+
+
+async def _bulk_trades_async(
+    lawdcds: List[str], start_ymd: str, end_ymd: str, propertyType: str, numOfRows: int
+) -> Dict[str, Any]:
+    try:
+        endpoint, pairs = _bulk_plan(lawdcds, start_ymd, end_ymd, propertyType)
+    except ValueError as e:
+        return {"status": "error", "message": str(e)}
+    return await _bulk_fetch_async(endpoint, pairs, numOfRows)
+
+
+@mcp_common.twin_tool(mcp, _bulk_trades, _bulk_trades_async)
+def getBulkTrades(
+    lawdcds: List[str],
+    start_ymd: str,
+    end_ymd: str,
+    propertyType: str = "apartment",
+    numOfRows: int = 1000,
+    fields: Optional[List[str]] = None,
+    compact: bool = False,
+):
+    """
+    여러 지역 × 여러 달 실거래가 일괄 조회 (모든 페이지, 병렬)
+    - lawdcds: 법정동코드 5자리 목록 (예: ["51150", "51770"])
+    - start_ymd, end_ymd: 계약년월 범위 YYYYMM (양끝 포함)
+    - propertyType: apartment | office | house
+    신고기한이 지난 달은 만료 없이 캐시하므로 같은 기간을 다시 조회하면 진행 중인 달만 상위 호출
+    - fields: 항목마다 남길 컬럼 목록, compact: 원문·전송 메타데이터를 뺀 축약 응답
+    """
+    return dict(lawdcds=lawdcds, start_ymd=start_ymd, end_ymd=end_ymd, propertyType=propertyType, numOfRows=numOfRows)
+
+
+def _group_keys(groupBy: str) -> List[str]:
+    # trade_analytics(numpy)는 통계를 처음 요청할 때만 읽음 (서버 기동 시간에 포함하지 않음)
+    import trade_analytics
+    keys = [key.strip() for key in (groupBy or "").split(",") if key.strip()]
+    unknown = [key for key in keys if key not in trade_analytics.GROUP_KEYS]
+    if not keys or unknown:
+        raise ValueError(f"groupBy는 {', '.join(trade_analytics.GROUP_KEYS)} 중에서 쉼표로 골라 주세요: {groupBy}")
+    return keys
+
+
+def _check_percentiles(percentiles: Optional[List[float]]) -> List[float]:
+    """상위 호출 전에 백분위수 인자를 검증 (생략하면 기본값). 잘못되면 ValueError."""
+    import trade_analytics
+    return trade_analytics.check_percentiles(trade_analytics.DEFAULT_PERCENTILES if percentiles is None else percentiles)
+
+
+def _trade_statistics(merged: Dict[str, Any], by: List[str], percentiles: List[float]) -> Dict[str, Any]:
+    """일괄 조회 결과에 통계를 붙이고 거래 행 목록은 뺌. 데이터가 하나도 없는 오류는 그대로 전달."""
+    if merged.get("status") not in ("ok", "partial"):
+        return {key: value for key, value in merged.items() if key != "items"}
+    import trade_analytics
+    stats = trade_analytics.summarize(merged["items"], by=by, percentiles=percentiles)
+    out: Dict[str, Any] = {"status": merged["status"], "pairs": merged["pairs"], **stats}
+    for key in ("errors", "timed_out"):
+        if key in merged:
+            out[key] = merged[key]
+    return out
+
+
+def _statistics(
+    lawdcds: List[str],
+    start_ymd: str,
+    end_ymd: str,
+    groupBy: str,
+    propertyType: str,
+    percentiles: Optional[List[float]],
+    numOfRows: int,
+) -> Dict[str, Any]:
+    try:
+        by = _group_keys(groupBy)
+        percentiles = _check_percentiles(percentiles)
+        endpoint, pairs = _bulk_plan(lawdcds, start_ymd, end_ymd, propertyType)
+    except ValueError as e:
+        return {"status": "error", "message": str(e)}
+    return _trade_statistics(_bulk_fetch(endpoint, pairs, numOfRows), by, percentiles)
+
+
+async def _statistics_async(
+    lawdcds: List[str],
+    start_ymd: str,
+    end_ymd: str,
+    groupBy: str,
+    propertyType: str,
+    percentiles: Optional[List[float]],
+    numOfRows: int,
+) -> Dict[str, Any]:
+    try:
+        by = _group_keys(groupBy)
+        percentiles = _check_percentiles(percentiles)
+        endpoint, pairs = _bulk_plan(lawdcds, start_ymd, end_ymd, propertyType)
+    except ValueError as e:
+        return {"status": "error", "message": str(e)}
+    merged = await _bulk_fetch_async(endpoint, pairs, numOfRows)
+    # 통계 계산은 CPU 작업이므로 이벤트 루프를 막지 않게 스레드에서
+    return await asyncio.to_thread(_trade_statistics, merged, by, percentiles)
+
+
+@mcp_common.twin_tool(mcp, _statistics, _statistics_async)
+def getTradeStatistics(
+    lawdcds: List[str],
+    start_ymd: str,
+    end_ymd: str,
+    groupBy: str = "region,month",
+    propertyType: str = "apartment",
+    percentiles: Optional[List[float]] = None,
+    numOfRows: int = 1000,
+):
+    """
+    실거래가 통계 (거래량, 가격 평균/중앙값/백분위수, ㎡당 가격 중앙값, 지역별 월 추이)
+    - lawdcds, start_ymd, end_ymd, propertyType: getBulkTrades와 동일
+    - groupBy: region, month, area_bucket(전용면적대), build_year_bucket(건축연도대)을 쉼표로 조합
+    - percentiles: 그룹별로 계산할 백분위수 (기본 25, 50, 75)
+    가격 단위는 만원, ㎡당 가격은 만원/㎡
     """
-    return call_molit_api(
-        endpoint="OpenAPI_ToolInstallPackage/service/rest/RTMSOBJSvc/getRTMSDataSvcSHRent",
-        lawdcd=lawdcd,
-        deal_ymd=deal_ymd,
-        page_no=pageNo,
-        num_rows=numOfRows,
-        filters=filters
+    return dict(
+        lawdcds=lawdcds,
+        start_ymd=start_ymd,
+        end_ymd=end_ymd,
+        groupBy=groupBy,
+        propertyType=propertyType,
+        percentiles=percentiles,
+        numOfRows=numOfRows,
     )
 
 
-@mcp.tool()
-def ping():
-    """헬스체크"""
-    return {"status": "ok", "message": "realestate server pong"}
+mcp_common.register_common_tools(mcp, _keys, "realestate server pong")
 
 
 def main():
@@ -194,6 +640,10 @@ def main():
         print("[REALESTATE SERVER] tools:", names, flush=True)
     except Exception:
         pass
+    # 디스크 캐시(RESPONSE_CACHE_DB)가 있으면 최근 항목을 메모리로 미리 읽어 둠
+    response_cache.get_cache()
+    # 첫 요청 전에 TCP+TLS 연결을 맺고 동작하는 TLS 모드를 학습
+    http_transport.prewarm([BASE_URL])
     mcp.run()
 
 
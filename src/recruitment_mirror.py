@@ -0,0 +1,307 @@
+# recruitment_mirror.py — 진행 중인 채용공고를 로컬 SQLite에 미러링 (증분 동기화 + 코드 색인 조회)
+# 목록 API를 질의마다 부르지 않고, 지역/고용형태/학력/NCS 코드 필터를 로컬 색인으로 바로 처리
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import pagination
+
+MIRROR_DB = os.path.expanduser((os.getenv("RECRUITMENT_MIRROR_DB") or "~/.cache/huss/recruitment.sqlite").strip())
+# 마지막 동기화 후 이 시간(초) 안에는 다시 동기화하지 않음 (force로 무시 가능)
+MIN_SYNC_INTERVAL = float(os.getenv("RECRUITMENT_MIRROR_MIN_INTERVAL") or 600)
+# 증분 동기화도 이 주기(초)가 지나면 전체 동기화로 바꿔 사라진(취소·조기마감) 공고를 정리
+FULL_SYNC_INTERVAL = float(os.getenv("RECRUITMENT_MIRROR_FULL_INTERVAL") or 86400)
+# 증분 기준일을 마지막으로 본 공고 시작일보다 며칠 앞당겨 늦게 등록·수정된 공고도 다시 받음
+OVERLAP_DAYS = int(os.getenv("RECRUITMENT_MIRROR_OVERLAP_DAYS") or 3)
+SYNC_PAGE_ROWS = 100
+
+# 콤마로 여러 코드가 들어 있는 필드 → 색인 테이블(posting_codes)로 펼침
+CODE_FIELDS = ("workRgnLst", "hireTypeLst", "acbgCondLst", "ncsCdLst", "recrutSe")
+# 목록 API 요청 파라미터: 진행 중 공고만, 증분 시 공고 시작일 기준
+ONGOING_PARAM = {"ongoingYn": "Y"}
+SINCE_PARAM = "pbancBgngYmd"
+
+# 공고 마감일은 한국 날짜 기준
+KST = timezone(timedelta(hours=9))
+
+ListPage = Callable[[int, int, Dict[str, Any]], Dict[str, Any]]
+Extract = Callable[[Dict[str, Any]], List[Dict[str, Any]]]
+
+
+def _today() -> str:
+    return datetime.now(KST).strftime("%Y%m%d")
+
+
+def split_codes(value: Any) -> List[str]:
+    """'R1010, R1040' → ['R1010', 'R1040'] (빈 값·중복 제거)."""
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple)):
+        parts = [str(v) for v in value]
+    else:
+        parts = str(value).split(",")
+    return list(dict.fromkeys(p.strip() for p in parts if p and p.strip()))
+
+
+def _digest(record: Dict[str, Any]) -> str:
+    raw = json.dumps(record, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _ymd(value: Any) -> str:
+    digits = "".join(ch for ch in str(value or "") if ch.isdigit())
+    return digits[:8] if len(digits) >= 8 else ""
+
+
+class RecruitmentMirror:
+    """
+    공고 테이블(postings) + (코드 종류, 코드, 공고) 색인 테이블(posting_codes) + 동기화 상태(sync_state).
+    파일을 쓸 수 없으면 프로세스 메모리 DB로 대체. 연결 하나를 잠금으로 공유 (조회·쓰기 모두 ms 단위).
+    """
+
+    def __init__(self, path: str = MIRROR_DB):
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = self._open(path)
+        except Exception:
+            self.path = ":memory:"
+            self._db = self._open(":memory:")
+
+    @staticmethod
+    def _open(path: str) -> sqlite3.Connection:
+        conn = sqlite3.connect(path, timeout=5.0, isolation_level=None, check_same_thread=False)
+        if path != ":memory:":
+            conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        conn.executescript(
+            "CREATE TABLE IF NOT EXISTS postings ("
+            " sn TEXT PRIMARY KEY, bgng_ymd TEXT, end_ymd TEXT, title TEXT, inst_nm TEXT,"
+            " work_rgn_nm TEXT, digest TEXT, sync_id INTEGER, raw TEXT NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS postings_end ON postings (end_ymd);"
+            "CREATE INDEX IF NOT EXISTS postings_bgng ON postings (bgng_ymd);"
+            "CREATE TABLE IF NOT EXISTS posting_codes ("
+            " kind TEXT, code TEXT, sn TEXT, PRIMARY KEY (kind, code, sn)) WITHOUT ROWID;"
+            "CREATE INDEX IF NOT EXISTS posting_codes_sn ON posting_codes (sn);"
+            "CREATE TABLE IF NOT EXISTS sync_state (key TEXT PRIMARY KEY, value TEXT);"
+        )
+        return conn
+
+    # ---- 동기화 상태 ----
+    def _state(self) -> Dict[str, str]:
+        return dict(self._db.execute("SELECT key, value FROM sync_state").fetchall())
+
+    def _set_state(self, **values: Any) -> None:
+        self._db.executemany(
+            "INSERT OR REPLACE INTO sync_state (key, value) VALUES (?, ?)",
+            [(k, str(v)) for k, v in values.items()],
+        )
+
+    def plan(self, full: bool = False, now: Optional[float] = None) -> Tuple[bool, Optional[str]]:
+        """(전체 동기화 여부, 증분 기준 공고 시작일 YYYYMMDD). 미러가 비었거나 전체 주기가 지났으면 전체."""
+        now = now if now is not None else time.time()
+        with self._lock:
+            state = self._state()
+            newest = self._db.execute("SELECT MAX(bgng_ymd) FROM postings").fetchone()[0]
+        last_full = float(state.get("last_full_sync") or 0)
+        if full or not newest or now - last_full >= FULL_SYNC_INTERVAL:
+            return True, None
+        try:
+            since = datetime.strptime(newest, "%Y%m%d") - timedelta(days=OVERLAP_DAYS)
+        except ValueError:  # 상위 데이터의 잘못된 날짜(예: 20251399)는 기준일로 쓸 수 없으므로 전체 동기화
+            return True, None
+        return False, since.strftime("%Y%m%d")
+
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        with self._lock:
+            last = float(self._state().get("last_sync") or 0)
+        return (now if now is not None else time.time()) - last < MIN_SYNC_INTERVAL
+
+    # ---- 쓰기 ----
+    def apply(self, records: Iterable[Dict[str, Any]], full: bool, complete: bool, since: Optional[str] = None) -> Dict[str, int]:
+        """
+        받은 공고를 반영. 내용 해시가 같으면 건너뛰고 바뀐 공고만 다시 씀.
+        전체 동기화가 끝까지 성공했을 때만(complete) 이번에 보이지 않은 공고를 지움.
+        """
+        counts = {"received": 0, "inserted": 0, "updated": 0, "unchanged": 0, "removed": 0, "expired": 0}
+        now = time.time()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                sync_id = int(self._state().get("sync_id") or 0) + 1
+                for record in records:
+                    sn = record.get("recrutPblntSn")
+                    sn = str(sn).strip() if sn is not None else ""
+                    if not sn:
+                        continue
+                    counts["received"] += 1
+                    digest = _digest(record)
+                    row = self._db.execute("SELECT digest FROM postings WHERE sn = ?", (sn,)).fetchone()
+                    if row is not None and row[0] == digest:
+                        self._db.execute("UPDATE postings SET sync_id = ? WHERE sn = ?", (sync_id, sn))
+                        counts["unchanged"] += 1
+                        continue
+                    self._write(sn, record, digest, sync_id)
+                    counts["inserted" if row is None else "updated"] += 1
+                if full and complete:
+                    counts["removed"] = self._delete("sync_id IS NOT ?", (sync_id,))
+                counts["expired"] = self._delete("end_ymd != '' AND end_ymd < ?", (_today(),))
+                state: Dict[str, Any] = {"sync_id": sync_id, "last_sync": now, "last_mode": "full" if full else "delta"}
+                if full and complete:
+                    state["last_full_sync"] = now
+                if since:
+                    state["last_since"] = since
+                self._set_state(**state)
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return counts
+
+    def _write(self, sn: str, record: Dict[str, Any], digest: str, sync_id: int) -> None:
+        self._db.execute(
+            "INSERT OR REPLACE INTO postings (sn, bgng_ymd, end_ymd, title, inst_nm, work_rgn_nm, digest, sync_id, raw)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                sn,
+                _ymd(record.get("pbancBgngYmd")),
+                _ymd(record.get("pbancEndYmd")),
+                record.get("recrutPbancTtl") or "",
+                record.get("instNm") or "",
+                record.get("workRgnNmLst") or "",
+                digest,
+                sync_id,
+                json.dumps(record, ensure_ascii=False),
+            ),
+        )
+        self._db.execute("DELETE FROM posting_codes WHERE sn = ?", (sn,))
+        self._db.executemany(
+            "INSERT OR IGNORE INTO posting_codes (kind, code, sn) VALUES (?, ?, ?)",
+            [(kind, code, sn) for kind in CODE_FIELDS for code in split_codes(record.get(kind))],
+        )
+
+    def _delete(self, where: str, args: Sequence[Any]) -> int:
+        gone = [row[0] for row in self._db.execute(f"SELECT sn FROM postings WHERE {where}", args)]
+        if gone:
+            self._db.executemany("DELETE FROM posting_codes WHERE sn = ?", [(sn,) for sn in gone])
+            self._db.executemany("DELETE FROM postings WHERE sn = ?", [(sn,) for sn in gone])
+        return len(gone)
+
+    def purge_expired(self, today: Optional[str] = None) -> int:
+        """마감일(pbancEndYmd)이 지난 공고 삭제."""
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                removed = self._delete("end_ymd != '' AND end_ymd < ?", (today or _today(),))
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return removed
+
+    # ---- 동기화 ----
+    def sync(self, list_page: ListPage, extract: Extract, full: bool = False, force: bool = False) -> Dict[str, Any]:
+        """
+        list_page(page_no, num_rows, filters)로 목록 API를 돌며 미러 갱신.
+        평소에는 마지막으로 본 공고 시작일 이후만 받고(증분), 전체 주기가 되면 진행 중 공고 전체를 받음.
+        """
+        if not (full or force) and self.is_fresh():
+            return {"status": "ok", "skipped": True, "mirror": self.stats()}
+        full, since = self.plan(full)
+        filters = dict(ONGOING_PARAM)
+        if since:
+            filters[SINCE_PARAM] = since
+        page_stats = pagination.PageStats()
+        records = list(pagination.iterate(
+            lambda page: list_page(page, SYNC_PAGE_ROWS, filters), extract, SYNC_PAGE_ROWS, stats=page_stats,
+        ))
+        if page_stats.errors and not records:
+            status = "timeout" if page_stats.timed_out else "error"
+            return {"status": status, "mode": "full" if full else "delta", "errors": page_stats.errors}
+        # MAX_PAGES에 잘리거나 중간 페이지가 빠진 순회로는 사라진 공고를 판단할 수 없으므로 끝까지 받은 경우만 정리
+        counts = self.apply(records, full=full, complete=page_stats.complete, since=since)
+        result: Dict[str, Any] = {
+            "status": "ok" if page_stats.complete else "partial",
+            "mode": "full" if full else "delta",
+            "since": since,
+            "pages": page_stats.pages,
+            **counts,
+            "mirror": self.stats(),
+        }
+        if page_stats.errors:
+            result["errors"] = page_stats.errors
+        if page_stats.timed_out:
+            result["timed_out"] = True
+        if page_stats.truncated:
+            result["truncated"] = True
+        return result
+
+    # ---- 조회 ----
+    def query(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        keyword: Optional[str] = None,
+        limit: int = 100,
+        offset: int = 0,
+        today: Optional[str] = None,
+    ) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        filters: {"workRgnLst": "R3010,R3018", "hireTypeLst": "R1010", ...} — 같은 필드 안의 코드는 OR, 필드끼리는 AND.
+        keyword: 공고명·기관명·근무지명 부분 일치. 반환: (조건에 맞는 전체 건수, 마감일 순 공고 목록)
+        """
+        where = ["(p.end_ymd = '' OR p.end_ymd >= ?)"]
+        args: List[Any] = [today or _today()]
+        for kind, value in (filters or {}).items():
+            if kind not in CODE_FIELDS:
+                raise ValueError(f"필터는 {', '.join(CODE_FIELDS)} 중 하나입니다: {kind}")
+            codes = split_codes(value)
+            if not codes:
+                continue
+            where.append(
+                "p.sn IN (SELECT sn FROM posting_codes WHERE kind = ? AND code IN (%s))" % ",".join("?" * len(codes))
+            )
+            args += [kind, *codes]
+        if keyword:
+            where.append("(p.title LIKE ? OR p.inst_nm LIKE ? OR p.work_rgn_nm LIKE ?)")
+            args += [f"%{keyword}%"] * 3
+        clause = " AND ".join(where)
+        with self._lock:
+            total = self._db.execute(f"SELECT COUNT(*) FROM postings p WHERE {clause}", args).fetchone()[0]
+            rows = self._db.execute(
+                f"SELECT p.raw FROM postings p WHERE {clause} ORDER BY p.end_ymd, p.sn LIMIT ? OFFSET ?",
+                [*args, max(0, int(limit)), max(0, int(offset))],
+            ).fetchall()
+        return total, [json.loads(raw) for (raw,) in rows]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            state = self._state()
+            postings = self._db.execute("SELECT COUNT(*) FROM postings").fetchone()[0]
+        return {
+            "path": self.path,
+            "postings": postings,
+            "last_sync": state.get("last_sync") and datetime.fromtimestamp(float(state["last_sync"])).isoformat(timespec="seconds"),
+            "last_full_sync": state.get("last_full_sync") and datetime.fromtimestamp(float(state["last_full_sync"])).isoformat(timespec="seconds"),
+            "last_mode": state.get("last_mode"),
+        }
+
+
+_mirror: Optional[RecruitmentMirror] = None
+_mirror_lock = threading.Lock()
+
+
+def get_mirror() -> RecruitmentMirror:
+    global _mirror
+    if _mirror is None:
+        with _mirror_lock:
+            if _mirror is None:
+                _mirror = RecruitmentMirror()
+    return _mirror
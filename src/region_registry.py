@@ -0,0 +1,269 @@
+# region_registry.py — 법정동 시군구 코드표(data/lawd_sigungu.csv)를 한 번 읽어 코드↔이름↔시도 계층과 별칭, 지역 관련성 표를 미리 만들어 둠
+import csv
+import os
+import re
+import threading
+from typing import Dict, Iterable, List, Optional
+
+from keyword_matcher import KeywordMatcher, Match, leftmost_longest
+
+TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "lawd_sigungu.csv")
+
+# 관련성 순위 (작을수록 가까움): 같은 시군구 → 같은 시도 → 대상 코드가 목록에 포함 → 무관
+RANK_SIGUNGU = 0
+RANK_SIDO = 1
+RANK_CODE_LISTED = 2
+NO_MATCH = 999
+
+# '시/군/구'를 뗀 짧은 이름이 일반 단어와 겹쳐 자연어에서 지역으로 잡으면 안 되는 것들
+# (예: "예산 지원" → 예산군, "고양이" → 고양시). 이런 지역은 전체 이름이나 "충남 예산"처럼 시도와 함께 써야 인식
+BARE_NAME_STOPWORDS = frozenset({
+    "강화", "거창", "고령", "고양", "공주", "광산", "광주", "구리", "기장", "남동", "남해", "달성",
+    "동안", "동작", "동해", "무안", "부여", "사상", "상당", "상주", "수성", "수영", "수정", "수지",
+    "영광", "영양", "예산", "완주", "유성", "음성", "인제", "장수", "진도", "청원", "함양", "화성",
+    "연수", "보은", "봉화", "오산",
+})
+_SUFFIX = ("시", "군", "구")
+_SPACES = re.compile(r"\s+")
+
+
+def normalize(text: Optional[str]) -> str:
+    """별칭 비교용: 공백 제거 + 소문자."""
+    return _SPACES.sub("", (text or "")).lower()
+
+
+def _stem(name: str) -> str:
+    """'강릉시' → '강릉'. 떼고 남는 글자가 한 글자면(중구, 동구) 그대로."""
+    return name[:-1] if name.endswith(_SUFFIX) and len(name) > 2 else name
+
+
+class Region:
+    """시도(code 'NN000') 또는 시군구(5자리 법정동 코드) 하나."""
+
+    __slots__ = ("code", "name", "sido_code", "sido_name", "parent", "label")
+
+    def __init__(self, code: str, name: str, sido_code: str, sido_name: str, parent: Optional[str] = None):
+        self.code = code
+        self.name = name
+        self.sido_code = sido_code
+        self.sido_name = sido_name
+        self.parent = parent
+        self.label = name
+
+    @property
+    def is_sido(self) -> bool:
+        return self.code.endswith("000")
+
+    def __repr__(self) -> str:
+        return f"Region({self.code}, {self.label})"
+
+
+class RegionRegistry:
+    """
+    - get(code), resolve(이름/코드), candidates(이름): 코드↔이름 조회와 동명 지역 후보
+    - find_in_text(자연어): 문장 안의 지역 언급 (가장 긴 별칭 우선, 동명 지역은 같이 언급된 시도로 구분)
+    - relevance(code, 이름 목록): 미리 만든 '이름 → 순위' 표로 O(1) 조회
+    """
+
+    def __init__(self, path: str = TABLE_PATH):
+        self._regions: Dict[str, Region] = {}
+        self._children: Dict[str, List[str]] = {}
+        self._sigungu_aliases: Dict[str, List[str]] = {}
+        self._sido_aliases: Dict[str, str] = {}
+        # 금지어에 걸린 짧은 이름 (자연어에서는 무시하고, /region처럼 이름만 입력한 경우에만 사용)
+        self._guarded_aliases: Dict[str, List[str]] = {}
+        self._relevance: Dict[str, Dict[str, int]] = {}
+        self._matcher: Optional[KeywordMatcher] = None
+        self._load(path)
+
+    # ---- 적재 ----
+    def _load(self, path: str) -> None:
+        extra: Dict[str, List[str]] = {}
+        with open(path, encoding="utf-8", newline="") as f:
+            for row in csv.DictReader(f):
+                code, sido_name, name = row["code"].strip(), row["sido"].strip(), row["sigungu"].strip()
+                sido_code = code[:2]
+                extra[code] = [a.strip() for a in (row.get("aliases") or "").split(";") if a.strip()]
+                if not name:
+                    self._regions[code] = Region(code, sido_name, sido_code, sido_name)
+                    continue
+                city = name.split(" ", 1)[0] if " " in name else None
+                self._regions[code] = Region(code, name, sido_code, sido_name)
+                if city:
+                    # 일반구: 같은 시도 안에서 이름이 '시'인 상위 시를 부모로
+                    self._regions[code].parent = city
+
+        city_codes = {(r.sido_code, r.name): r.code for r in self._regions.values() if not r.is_sido and " " not in r.name}
+        for region in self._regions.values():
+            if region.parent:
+                region.parent = city_codes.get((region.sido_code, region.parent))
+                if region.parent:
+                    self._children.setdefault(region.parent, []).append(region.code)
+
+        for code, region in self._regions.items():
+            if region.is_sido:
+                for alias in (region.name, *extra[code]):
+                    self._sido_aliases[normalize(alias)] = region.sido_code
+            else:
+                for alias in self._names(region, bare=True) + extra[code]:
+                    self._add_alias(alias, code)
+                if _stem(region.name) in BARE_NAME_STOPWORDS and not region.parent:
+                    self._guarded_aliases.setdefault(_stem(region.name), []).append(code)
+                sido = self._regions.get(f"{region.sido_code}000")
+                for sido_alias in ([sido.name, *extra[sido.code]] if sido else []):
+                    # "강원 고성", "경남고성군"처럼 시도를 붙인 이름은 동명 지역이 있어도 하나로 정해짐
+                    for alias in self._names(region, bare=False):
+                        self._add_alias(sido_alias + alias, code)
+
+        for region in self._regions.values():
+            if not region.is_sido and len(self._sigungu_aliases.get(normalize(region.name), ())) > 1:
+                region.label = f"{region.sido_name} {region.name}"
+        for code, region in self._regions.items():
+            if not region.is_sido:
+                self._relevance[code] = self._relevance_table(region, extra)
+
+    def _names(self, region: Region, bare: bool) -> List[str]:
+        """시군구 하나를 부를 수 있는 이름들. bare=False면 짧은 이름도 금지어 검사 없이 포함."""
+        names = [region.name]
+        if region.parent:
+            city = self._regions[region.parent].name
+            gu = region.name.split(" ", 1)[1]
+            names += [gu, _stem(city) + gu]
+        else:
+            stem = _stem(region.name)
+            if stem != region.name and (not bare or stem not in BARE_NAME_STOPWORDS):
+                names.append(stem)
+        return names
+
+    def _add_alias(self, alias: str, code: str) -> None:
+        codes = self._sigungu_aliases.setdefault(normalize(alias), [])
+        if code not in codes:
+            codes.append(code)
+
+    def _relevance_table(self, region: Region, extra: Dict[str, List[str]]) -> Dict[str, int]:
+        """레코드의 지역 이름 토큰 → 순위. '…청'(기관명)도 같은 순위로."""
+        table: Dict[str, int] = {}
+        sido = self._regions.get(f"{region.sido_code}000")
+        for name in [region.sido_name, *(extra[sido.code] if sido else [])]:
+            table[normalize(name)] = RANK_SIDO
+        own = [region.name, _stem(region.name), *extra[region.code]]
+        if region.parent:
+            parent = self._regions[region.parent]
+            gu = region.name.split(" ", 1)[1]
+            own += [parent.name, _stem(parent.name), gu, _stem(gu)]
+        for name in own:
+            table[normalize(name)] = RANK_SIGUNGU
+        for name, rank in list(table.items()):
+            table.setdefault(name + "청", rank)
+        return table
+
+    # ---- 조회 ----
+    def get(self, code: Optional[str]) -> Optional[Region]:
+        return self._regions.get((code or "").strip())
+
+    def sido(self, code: str) -> Optional[Region]:
+        region = self.get(code)
+        return self._regions.get(f"{region.sido_code}000") if region else None
+
+    def children(self, code: str) -> List[str]:
+        """일반구가 있는 시의 구 코드들 (없으면 빈 목록)."""
+        return list(self._children.get(code, ()))
+
+    def sigungu(self, sido_code: Optional[str] = None) -> List[Region]:
+        return [
+            r for r in self._regions.values()
+            if not r.is_sido and (sido_code is None or r.sido_code == sido_code[:2])
+        ]
+
+    def trade_codes(self, code: str) -> List[str]:
+        """실거래가 조회용 코드. 일반구가 있는 시는 구 단위로만 조회되므로 구 코드들로 펼침."""
+        return self.children(code) or [code]
+
+    def name(self, code: str) -> Optional[str]:
+        region = self.get(code)
+        return region.label if region else None
+
+    def candidates(self, text: str) -> List[Region]:
+        """이름(별칭)에 해당하는 시군구 후보 전체."""
+        key = normalize(text)
+        codes = self._sigungu_aliases.get(key) or self._guarded_aliases.get(key, [])
+        if not codes and key in self._sido_aliases:
+            return self.sigungu(self._sido_aliases[key])
+        return [self._regions[c] for c in codes]
+
+    def resolve(self, text: str) -> Optional[Region]:
+        """코드 또는 이름 → 시군구. 동명 지역이 여럿이거나 시도만 가리키면(시군구가 하나뿐인 세종 제외) None."""
+        key = normalize(text)
+        if key in self._regions:
+            region = self._regions[key]
+            return None if region.is_sido else region
+        found = self.candidates(key)
+        return found[0] if len(found) == 1 else None
+
+    def add_aliases(self, matcher: KeywordMatcher) -> None:
+        """자연어 인식용 별칭을 다른 키워드와 같은 자동자에 넣음. payload: ("sigungu", 코드들) 또는 ("sido", 시도 코드)."""
+        for alias, codes in self._sigungu_aliases.items():
+            matcher.add(alias, ("sigungu", tuple(codes)))
+        for alias, sido_code in self._sido_aliases.items():
+            matcher.add(alias, ("sido", sido_code))
+
+    def choose(self, hits: Iterable[Match]) -> Optional[str]:
+        """
+        add_aliases로 넣은 별칭의 일치들 → 시군구 코드. 겹치면 왼쪽부터 가장 긴 별칭만 보고, 앞에서부터 처음 정해지는 지역.
+        "고성"처럼 동명 지역이면 같은 문장에 나온 시도(예: "강원")로 고르고, 그래도 정해지지 않으면 건너뜀.
+        """
+        picked = leftmost_longest(hits)
+        sidos = {value for _, _, (kind, value) in picked if kind == "sido"}
+        for _, _, (kind, codes) in picked:
+            if kind != "sigungu":
+                continue
+            if len(codes) == 1:
+                return codes[0]
+            in_sido = [c for c in codes if self._regions[c].sido_code in sidos]
+            if len(in_sido) == 1:
+                return in_sido[0]
+        return None
+
+    def find_in_text(self, text: str) -> Optional[str]:
+        """자연어 안의 시군구 코드 (별칭 자동자로 한 번 훑음)."""
+        if self._matcher is None:
+            matcher = KeywordMatcher()
+            self.add_aliases(matcher)
+            self._matcher = matcher.compile()
+        return self.choose(self._matcher.find_all(normalize(text)))
+
+    def relevance(self, code: str, names: Iterable[str]) -> int:
+        """이름들(근무지역 목록, 기관명 단어 등) 중 대상 시군구와 가장 가까운 순위. 표에 없으면 NO_MATCH."""
+        table = self._relevance.get(code)
+        if not table:
+            return NO_MATCH
+        best = NO_MATCH
+        for name in names:
+            rank = table.get(normalize(name), NO_MATCH)
+            if rank < best:
+                best = rank
+                if best == RANK_SIGUNGU:
+                    break
+        return best
+
+    def __len__(self) -> int:
+        return len(self._relevance)
+
+
+def split_names(value: Optional[str]) -> List[str]:
+    """'강원, 서울' / '강원특별자치도 강릉시' → 이름 토큰들 (콤마·공백 구분)."""
+    return [part for part in re.split(r"[,\s]+", value or "") if part]
+
+
+_registry: Optional[RegionRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> RegionRegistry:
+    """프로세스 전체가 공유하는 지역 표 (처음 쓸 때 한 번만 읽음)."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = RegionRegistry()
+    return _registry
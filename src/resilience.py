@@ -0,0 +1,147 @@
+# resilience.py — 상위 호스트/엔드포인트별 서킷 브레이커 + 지터 섞인 지수 백오프
+import os
+import random
+import threading
+import time
+from typing import Any, Dict, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+
+FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD") or 5)
+RESET_TIMEOUT = float(os.getenv("CIRCUIT_RESET_TIMEOUT") or 30)
+HALF_OPEN_PROBES = int(os.getenv("CIRCUIT_HALF_OPEN_PROBES") or 1)
+
+RETRIES = int(os.getenv("HTTP_RETRIES") or 2)
+BACKOFF_BASE = float(os.getenv("HTTP_BACKOFF_BASE") or 0.3)
+BACKOFF_CAP = float(os.getenv("HTTP_BACKOFF_CAP") or 5)
+
+# 재시도할 만한 일시적 오류: 게이트웨이/서비스 불가 계열 응답과 연결 실패
+RETRY_STATUSES = frozenset({500, 502, 503, 504})
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """서킷이 열려 있어 상위 호출 없이 바로 실패."""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"circuit open for {name} (retry after {retry_after:.0f}s)")
+        self.name = name
+        self.retry_after = retry_after
+
+
+def is_transient_error(err: BaseException) -> bool:
+    return isinstance(err, httpx.ConnectError)
+
+
+def is_transient_status(status_code: int) -> bool:
+    return status_code in RETRY_STATUSES
+
+
+def backoff_delay(attempt: int, base: float = BACKOFF_BASE, cap: float = BACKOFF_CAP) -> float:
+    """full jitter: [0, min(cap, base * 2^attempt)] 사이 임의 값."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class CircuitBreaker:
+    """
+    연속 실패가 failure_threshold에 닿으면 열림(open) → reset_timeout 동안 즉시 실패.
+    그 뒤 반열림(half_open)에서 probe 요청만 통과시켜 성공하면 닫고, 실패하면 다시 엶.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = FAILURE_THRESHOLD,
+        reset_timeout: float = RESET_TIMEOUT,
+        half_open_probes: int = HALF_OPEN_PROBES,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_probes = half_open_probes
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                return HALF_OPEN
+            return self._state
+
+    def before_call(self) -> None:
+        """호출 가능 여부 확인. 열려 있으면 CircuitOpenError."""
+        with self._lock:
+            if self._state == OPEN:
+                elapsed = time.monotonic() - self._opened_at
+                if elapsed < self.reset_timeout:
+                    raise CircuitOpenError(self.name, self.reset_timeout - elapsed)
+                self._state = HALF_OPEN
+                self._probes = 0
+            if self._state == HALF_OPEN:
+                if self._probes >= self.half_open_probes:
+                    raise CircuitOpenError(self.name, self.reset_timeout)
+                self._probes += 1
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+            self._probes = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+                self._probes = 0
+
+    def release(self) -> None:
+        """결과를 판정할 수 없이 끝난 호출(질의 데드라인 초과 등). 반열림 probe 자리만 돌려줌."""
+        with self._lock:
+            if self._state == HALF_OPEN and self._probes > 0:
+                self._probes -= 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        state = self.state
+        with self._lock:
+            return {"state": state, "consecutive_failures": self._failures}
+
+
+class BreakerRegistry:
+    """(호스트, 엔드포인트 경로)별 서킷 브레이커 모음."""
+
+    def __init__(self):
+        self._breakers: Dict[Tuple[str, str], CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(url: str) -> Tuple[str, str]:
+        parts = urlsplit(url)
+        return parts.netloc, parts.path.rstrip("/") or "/"
+
+    def get(self, url: str) -> CircuitBreaker:
+        key = self._key(url)
+        with self._lock:
+            breaker = self._breakers.get(key)
+            if breaker is None:
+                breaker = self._breakers[key] = CircuitBreaker(f"{key[0]}{key[1]}")
+            return breaker
+
+    def state(self, url: str) -> str:
+        with self._lock:
+            breaker = self._breakers.get(self._key(url))
+        return breaker.state if breaker else CLOSED
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return {b.name: b.snapshot() for b in breakers}
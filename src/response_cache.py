@@ -0,0 +1,318 @@
+# response_cache.py — 상위 API 응답용 프로세스 내 TTL/LRU 캐시
+# (serviceKey를 뺀 요청 지문으로 키를 만들고, 데이터 성격에 따라 만료 시각을 정함)
+# RESPONSE_CACHE_DB를 지정하면 디스크 계층(disk_cache)을 함께 써서 재시작 후에도 캐시가 유지됨
+import hashlib
+import json
+import marshal
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from disk_cache import DiskCache
+from singleflight import SingleFlight
+
+# 요청 지문에서 제외할 인증 파라미터 (키가 달라도 같은 요청이면 같은 항목을 공유)
+SECRET_PARAMS = ("serviceKey", "apiKeyNm")
+
+MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES") or 2048)
+DEFAULT_TTL = float(os.getenv("RESPONSE_CACHE_TTL") or 600)
+# 국토부 실거래 신고기한(계약 후 30일)이 지난 달은 더 이상 바뀌지 않음
+CLOSED_MONTH_TTL = float(os.getenv("MOLIT_CLOSED_MONTH_TTL") or 7 * 24 * 3600)
+OPEN_MONTH_TTL = float(os.getenv("MOLIT_OPEN_MONTH_TTL") or 600)
+REPORT_GRACE_DAYS = int(os.getenv("MOLIT_REPORT_GRACE_DAYS") or 30)
+# 디스크 계층 (선택): 경로를 지정하면 활성화, 시작 시 최근 항목을 메모리로 미리 읽음
+DISK_PATH = (os.getenv("RESPONSE_CACHE_DB") or "").strip()
+WARM_ENTRIES = int(os.getenv("RESPONSE_CACHE_WARM_ENTRIES") or MAX_ENTRIES // 2)
+
+_YMD = re.compile(r"(\d{8})")
+
+
+def fingerprint(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """URL + 정렬된 파라미터(인증키 제외)로 만든 정규화된 요청 지문."""
+    canonical = sorted(
+        (str(k), str(v)) for k, v in (params or {}).items()
+        if k not in SECRET_PARAMS and v is not None
+    )
+    raw = json.dumps([url.rstrip("/"), canonical], ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def seconds_until_day_end(ymd: str, now: Optional[datetime] = None) -> Optional[float]:
+    """YYYYMMDD 날짜가 끝나는 시각(다음날 0시)까지 남은 초. 해석 불가면 None."""
+    if not ymd or len(ymd) != 8 or not ymd.isdigit():
+        return None
+    try:
+        end = datetime.strptime(ymd, "%Y%m%d") + timedelta(days=1)
+    except ValueError:
+        return None
+    return (end - (now or datetime.now())).total_seconds()
+
+
+def ttl_until_earliest(dates: Iterable[Optional[str]], default_ttl: float = DEFAULT_TTL) -> float:
+    """
+    목록 안에서 가장 먼저 끝나는 날짜(공고 마감일, 신청 종료일)에 맞춰 만료.
+    이미 지난 날짜는 무시하고, 기본 TTL보다 길게 잡지는 않음.
+    """
+    ttl = default_ttl
+    now = datetime.now()
+    for ymd in dates:
+        remaining = seconds_until_day_end(ymd or "", now)
+        if remaining is not None and 0 < remaining < ttl:
+            ttl = remaining
+    return ttl
+
+
+def apply_period_end(apply_period: Optional[str]) -> Optional[str]:
+    """청년정책 aplyYmd("20250101 ~ 20251231" 또는 "20251231")에서 종료일만 추출."""
+    if not apply_period:
+        return None
+    dates = _YMD.findall(apply_period)
+    return dates[-1] if dates else None
+
+
+def is_closed_month(deal_ymd: str, today: Optional[date] = None) -> bool:
+    """신고기한까지 지나 더 이상 거래가 추가되지 않는 계약년월인지."""
+    if not deal_ymd or len(deal_ymd) != 6 or not deal_ymd.isdigit():
+        return False
+    year, month = int(deal_ymd[:4]), int(deal_ymd[4:])
+    if not 1 <= month <= 12:
+        return False
+    next_month = date(year + month // 12, month % 12 + 1, 1)
+    return (today or date.today()) >= next_month + timedelta(days=REPORT_GRACE_DAYS)
+
+
+def month_ttl(deal_ymd: str, closed_ttl: Optional[float] = CLOSED_MONTH_TTL) -> Optional[float]:
+    """계약년월별 TTL. closed_ttl=None이면 마감된 달은 만료 없이 보관."""
+    return closed_ttl if is_closed_month(deal_ymd) else OPEN_MONTH_TTL
+
+
+def is_cacheable(result: Dict[str, Any]) -> bool:
+    # 한도 초과 응답은 키를 바꾸거나 다음 날이면 풀리므로 저장하지 않음
+    return result.get("status") == "ok" and not result.get("api_error") and not result.get("quota_exhausted")
+
+
+class ResponseCache:
+    """
+    항목 수 상한이 있는 LRU + 항목별 만료 시각(TTL) 캐시. 스레드 안전.
+    disk가 있으면 메모리 미스 시 디스크를 확인하고, 저장은 두 계층에 모두 함.
+    메모리에는 marshal로 직렬화해 두고 꺼낼 때마다 새 객체로 풀어 줌
+    (호출한 쪽이 items를 정렬·필터링해도 캐시된 항목이나 다른 호출의 결과가 바뀌지 않음).
+    """
+
+    def __init__(self, max_entries: int = MAX_ENTRIES, disk: Optional[DiskCache] = None):
+        self.max_entries = max_entries
+        self.disk = disk
+        # 캐시 미스가 동시에 여러 번 나도 상위 호출은 키당 한 번만
+        self.flight = SingleFlight()
+        self._entries: "OrderedDict[str, Tuple[Optional[float], bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.disk_hits = 0
+
+    def _get_memory(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._entries[key]
+                self.expirations += 1
+                return None
+            self._entries.move_to_end(key)
+        return marshal.loads(value)
+
+    def _put_memory(self, key: str, value: Dict[str, Any], expires_at: Optional[float]) -> None:
+        try:
+            blob = marshal.dumps(value)
+        except ValueError:  # JSON 모양이 아닌 값은 메모리 계층에 두지 않음
+            return
+        with self._lock:
+            self._entries[key] = (expires_at, blob)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def _get_disk(self, key: str) -> Optional[Dict[str, Any]]:
+        if self.disk is None:
+            return None
+        try:
+            found = self.disk.get(key)
+        except Exception:
+            # 디스크 계층 장애는 캐시 미스로 취급 (상위 호출은 계속 진행)
+            return None
+        if found is None:
+            return None
+        expires_at, value = found
+        self._put_memory(key, value, expires_at)
+        with self._lock:
+            self.disk_hits += 1
+        return value
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        value = self._get_memory(key)
+        if value is None:
+            value = self._get_disk(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key: str, value: Dict[str, Any], ttl: Optional[float]) -> None:
+        """ttl=None이면 만료 없이(LRU로만 밀려남) 보관, 0 이하면 저장하지 않음."""
+        if ttl is not None and ttl <= 0:
+            return
+        expires_at = None if ttl is None else time.time() + ttl
+        self._put_memory(key, value, expires_at)
+        if self.disk is not None:
+            try:
+                self.disk.set(key, value, expires_at)
+            except Exception:
+                pass
+
+    def invalidate(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+        if self.disk is not None:
+            try:
+                self.disk.delete(key)
+            except Exception:
+                pass
+
+    def warm_from_disk(self, limit: int = WARM_ENTRIES) -> int:
+        """디스크에서 최근 사용 항목을 메모리로 미리 올림 (서버 시작 시 웜 스타트)."""
+        if self.disk is None or limit <= 0:
+            return 0
+        loaded = 0
+        try:
+            # 최근 사용 순으로 받아오므로 역순으로 넣어야 LRU 순서가 유지됨
+            for key, expires_at, value in reversed(list(self.disk.recent(min(limit, self.max_entries)))):
+                self._put_memory(key, value, expires_at)
+                loaded += 1
+        except Exception:
+            pass
+        return loaded
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            stats = {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "disk_hits": self.disk_hits,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+        stats["single_flight"] = self.flight.stats()
+        if self.disk is not None:
+            try:
+                stats["disk"] = self.disk.stats()
+            except Exception as e:
+                stats["disk"] = {"path": self.disk.path, "error": str(e)}
+        return stats
+
+    @staticmethod
+    def _hit(value: Dict[str, Any]) -> Dict[str, Any]:
+        return {**value, "cache": "hit"}
+
+    @staticmethod
+    def _copy(value: Dict[str, Any]) -> Dict[str, Any]:
+        """합쳐진 호출끼리 같은 객체를 나눠 갖지 않도록 호출마다 따로 푼 사본."""
+        try:
+            return marshal.loads(marshal.dumps(value))
+        except ValueError:
+            return value
+
+    @classmethod
+    def _shared(cls, value: Dict[str, Any]) -> Dict[str, Any]:
+        return {**cls._copy(value), "cache": "coalesced"}
+
+    def _store(self, key: str, result: Dict[str, Any], ttl_for: Callable[[Dict[str, Any]], Optional[float]]) -> None:
+        if is_cacheable(result):
+            self.set(key, result, ttl_for(result))
+
+    def cached_call(
+        self,
+        key: str,
+        fetch: Callable[[], Dict[str, Any]],
+        ttl_for: Callable[[Dict[str, Any]], Optional[float]],
+    ) -> Dict[str, Any]:
+        """
+        캐시에 있으면 그대로, 없으면 fetch() 결과를 ttl_for(result) 동안 저장 후 반환.
+        같은 키의 동시 미스는 fetch() 한 번으로 합쳐짐.
+        """
+        value = self.get(key)
+        if value is not None:
+            return self._hit(value)
+
+        def _load():
+            # 앞선 호출이 막 저장을 끝낸 경우
+            cached = self._get_memory(key)
+            if cached is not None:
+                return cached
+            result = fetch()
+            self._store(key, result, ttl_for)
+            return result
+
+        result, shared = self.flight.do(key, _load)
+        return self._shared(result) if shared else self._copy(result)
+
+    async def cached_call_async(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[Dict[str, Any]]],
+        ttl_for: Callable[[Dict[str, Any]], Optional[float]],
+    ) -> Dict[str, Any]:
+        """cached_call의 비동기 버전."""
+        value = self.get(key)
+        if value is not None:
+            return self._hit(value)
+
+        async def _load():
+            cached = self._get_memory(key)
+            if cached is not None:
+                return cached
+            result = await fetch()
+            self._store(key, result, ttl_for)
+            return result
+
+        result, shared = await self.flight.do_async(key, _load)
+        return self._shared(result) if shared else self._copy(result)
+
+
+_cache: Optional[ResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> ResponseCache:
+    """프로세스 전체가 공유하는 응답 캐시 (키에 URL이 들어가므로 서버 간 충돌 없음)."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                disk = None
+                if DISK_PATH:
+                    try:
+                        disk = DiskCache(DISK_PATH)
+                    except Exception:
+                        disk = None
+                _cache = ResponseCache(disk=disk)
+                _cache.warm_from_disk()
+    return _cache
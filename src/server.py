@@ -1,63 +1,117 @@
-# server.py — MCP 서버 (자동 TLS 폴백: default → TLS1.2+SECLEVEL1 → verify=False)
+# server.py — MCP 서버 (공용 전송 계층: 연결 풀 + 호스트별 TLS 모드 기억, 폴백 default → TLS1.2+SECLEVEL1 → verify=False)
 import os
-import ssl
-from typing import Any, Dict, Optional, Tuple, Iterable
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
 
-import httpx
 from dotenv import load_dotenv
 from mcp.server.fastmcp import FastMCP
 
+import deadline
+import http_transport
+import mcp_common
+import pagination
+import projection
+import quota
+import recruitment_mirror
+import response_cache
+
 load_dotenv()
 
 mcp = FastMCP("recruitment-mcp")
 
 BASE_URL = (os.getenv("BASE_URL") or "https://apis.data.go.kr/1051000/recruitment").rstrip("/")
-API_KEY = (os.getenv("DATA_GO_KR_KEY") or "").strip()
+# DATA_GO_KR_KEY에 콤마로 여러 키를 넣으면 요청마다 돌아가며 사용
+_keys = quota.pool_from_env("recruitment", "DATA_GO_KR_KEY", "DATA_GO_KR")
+API_KEY = _keys.keys[0] if _keys.keys else ""
 
-def _client_candidates() -> Iterable[Tuple[str, httpx.Client]]:
+def _try_get(url: str, params: Dict[str, Any]):
     """
-    TLS/SSL 환경에 따라 순차적으로 시도할 httpx.Client 후보들.
-    각 후보는 (모드이름, Client) 형태로 yield됩니다.
+    공용 전송 계층(http_transport)으로 GET. 성공하면 (mode, response) 반환.
+    연결 풀과 호스트별 TLS 모드 기억은 세 서버가 공유합니다.
     """
-    # 1) 기본값: TLS 자동 협상 + 시스템 프록시/환경 변수 신뢰
-    yield "default", httpx.Client(http2=False, timeout=20, trust_env=True)
+    return http_transport.get_transport().get(url, params)
+
+
+async def _try_get_async(url: str, params: Dict[str, Any]):
+    """_try_get의 비동기 버전 (공유 AsyncClient 사용)."""
+    return await http_transport.get_async_transport().get(url, params)
 
-    # 2) TLS 1.2 이상 + 낮은 보안 레벨(일부 구형 서버/프록시 대응)
+
+def _build_request(
+    path: str,
+    page_no: int,
+    num_rows: int,
+    filters: Optional[Dict[str, Any]],
+) -> Tuple[str, Dict[str, Any]]:
+    url = f"{BASE_URL}/{path.lstrip('/')}"
+    params: Dict[str, Any] = {
+        "serviceKey": API_KEY,  # 반드시 'Decoding(원문)' 키 사용 (% 없는 원문키)
+        "type": "json",
+        "pageNo": page_no,
+        "numOfRows": num_rows,
+    }
+    if filters:
+        params.update(filters)
+    return url, params
+
+
+def _build_result(mode: str, resp) -> Dict[str, Any]:
+    req_url = str(resp.request.url)
+    status_code = resp.status_code
+    resp.raise_for_status()
     try:
-        tls = ssl.create_default_context()
-        tls.minimum_version = ssl.TLSVersion.TLSv1_2
-        # 일부 공공/기관망 장비가 오래된 cipher만 허용 → OpenSSL3 기본 보안레벨과 충돌
-        try:
-            tls.set_ciphers("DEFAULT:@SECLEVEL=1")
-        except Exception:
-            pass
-        yield "tls12_seclevel1", httpx.Client(verify=tls, http2=False, timeout=20, trust_env=True)
+        return {
+            "status": "ok",
+            "ssl_mode": mode,
+            "circuit": http_transport.circuit_state(req_url),
+            "request_url": req_url,
+            "status_code": status_code,
+            "data": resp.json(),
+        }
     except Exception:
-        pass
+        return {
+            "status": "ok",
+            "ssl_mode": mode,
+            "circuit": http_transport.circuit_state(req_url),
+            "request_url": req_url,
+            "status_code": status_code,
+            "text": resp.text,
+        }
 
-    # 3) 최후 수단: 인증서 검증 비활성화 (가능하면 피하고, 네트워크 진단용으로만 사용)
-    #    성공 시에도 ssl_mode로 'insecure'가 내려갑니다.
-    yield "insecure", httpx.Client(verify=False, http2=False, timeout=20, trust_env=True)
 
+def _ttl_for(result: Dict[str, Any]) -> float:
+    """목록 안에서 가장 먼저 마감되는 공고(pbancEndYmd)에 맞춰 캐시 만료."""
+    items = (result.get("data") or {}).get("result") if isinstance(result.get("data"), dict) else None
+    if isinstance(items, dict):
+        items = [items]
+    return response_cache.ttl_until_earliest(
+        job.get("pbancEndYmd") for job in (items or []) if isinstance(job, dict)
+    )
 
-def _try_get(url: str, params: Dict[str, Any]):
-    """
-    위의 후보 클라이언트들을 순서대로 시도. 성공하면 (mode, response) 반환.
-    전부 실패하면 마지막 예외를 다시 던짐.
-    """
-    last_err: Optional[Exception] = None
-    for mode, client in _client_candidates():
-        try:
-            with client as c:
-                resp = c.get(url, params=params)
-                return mode, resp
-        except Exception as e:
-            last_err = e
-            continue
-    # 전부 실패
-    if last_err:
-        raise last_err
-    raise RuntimeError("No HTTP client candidates available")
+
+def _fetch(url: str, params: Dict[str, Any], endpoint: str) -> Dict[str, Any]:
+    """키 풀에서 한도·속도 제한을 통과한 키를 골라 실제 상위 호출 (본문이 한도 초과면 다른 키로 다시)."""
+    try:
+        mode, resp = _keys.send(endpoint, lambda key: _try_get(url, {**params, "serviceKey": key}))
+    except quota.QuotaExhausted as e:
+        return mcp_common.quota_error(url, e)
+    return _build_result(mode, resp)
+
+
+async def _fetch_async(url: str, params: Dict[str, Any], endpoint: str) -> Dict[str, Any]:
+    """_fetch의 비동기 버전."""
+    try:
+        mode, resp = await _keys.send_async(endpoint, lambda key: _try_get_async(url, {**params, "serviceKey": key}))
+    except quota.QuotaExhausted as e:
+        return mcp_common.quota_error(url, e)
+    return _build_result(mode, resp)
+
+
+def _missing_key_error(path: str) -> Dict[str, Any]:
+    return {
+        "status": "error",
+        "message": "DATA_GO_KR_KEY is missing in .env",
+        "request_url": f"{BASE_URL}/{path.lstrip('/')}",
+    }
 
 
 def call_api(
@@ -65,84 +119,226 @@ def call_api(
     page_no: int = 1,
     num_rows: int = 10,
     filters: Optional[Dict[str, Any]] = None,
+    cached: bool = True,
 ):
     if not API_KEY:
+        return _missing_key_error(path)
+
+    url, params = _build_request(path, page_no, num_rows, filters)
+    try:
+        if not cached:
+            return _fetch(url, params, path.lstrip("/"))
+        return response_cache.get_cache().cached_call(
+            response_cache.fingerprint(url, params),
+            lambda: _fetch(url, params, path.lstrip("/")),
+            _ttl_for,
+        )
+    except deadline.DeadlineExceeded as e:
+        return mcp_common.deadline_error(url, e)
+    except Exception as e:
         return {
             "status": "error",
-            "message": "DATA_GO_KR_KEY is missing in .env",
-            "request_url": f"{BASE_URL}/{path.lstrip('/')}",
+            "message": str(e),
+            "request_url": url,
+            "circuit": http_transport.circuit_state(url),
         }
 
-    url = f"{BASE_URL}/{path.lstrip('/')}"
-    params: Dict[str, Any] = {
-        "serviceKey": API_KEY,  # 반드시 'Decoding(원문)' 키 사용 (% 없는 원문키)
-        "type": "json",
-        "pageNo": page_no,
-        "numOfRows": num_rows,
-    }
-    if filters:
-        params.update(filters)
+
+async def call_api_async(
+    path: str,
+    page_no: int = 1,
+    num_rows: int = 10,
+    filters: Optional[Dict[str, Any]] = None,
+    cached: bool = True,
+):
+    """call_api의 비동기 버전. 이벤트 루프를 막지 않으므로 한 프로세스에서 여러 요청을 동시에 처리."""
+    if not API_KEY:
+        return _missing_key_error(path)
+
+    url, params = _build_request(path, page_no, num_rows, filters)
 
     try:
-        mode, resp = _try_get(url, params)
-        req_url = str(resp.request.url)
-        status_code = resp.status_code
-        resp.raise_for_status()
-        try:
-            return {
-                "status": "ok",
-                "ssl_mode": mode,
-                "request_url": req_url,
-                "status_code": status_code,
-                "data": resp.json(),
-            }
-        except Exception:
-            return {
-                "status": "ok",
-                "ssl_mode": mode,
-                "request_url": req_url,
-                "status_code": status_code,
-                "text": resp.text,
-            }
+        if not cached:
+            return await _fetch_async(url, params, path.lstrip("/"))
+        return await response_cache.get_cache().cached_call_async(
+            response_cache.fingerprint(url, params),
+            lambda: _fetch_async(url, params, path.lstrip("/")),
+            _ttl_for,
+        )
+    except deadline.DeadlineExceeded as e:
+        return mcp_common.deadline_error(url, e)
     except Exception as e:
         return {
             "status": "error",
             "message": str(e),
             "request_url": url,
+            "circuit": http_transport.circuit_state(url),
         }
 
 
-@mcp.tool()
+# 도구마다 요청 인자를 만드는 함수 하나로 동기 버전(오케스트레이터 등 프로세스 내부 호출용)과
+# 같은 이름의 비동기 MCP 도구를 함께 만듦 (mcp_common.twin_tool)
+@mcp_common.twin_tool(mcp, call_api, call_api_async)
 def listRecruitments(
     path: str = "list",
     pageNo: int = 1,
     numOfRows: int = 10,
     filters: Optional[Dict[str, Any]] = None,
+    fields: Optional[List[str]] = None,
+    compact: bool = False,
 ):
     """
     공공기관 채용정보 목록 조회
     - path: 기본 'list'
     - pageNo, numOfRows: 페이지/행 수
     - filters: {"hireTypeLst":"R1050,R1060,R1070", ...} 등 추가 파라미터
+    - fields: 항목마다 남길 컬럼 목록, compact: 원문·전송 메타데이터를 뺀 축약 응답
     """
-    return call_api(path=path, page_no=pageNo, num_rows=numOfRows, filters=filters)
+    return dict(path=path, page_no=pageNo, num_rows=numOfRows, filters=filters)
 
 
-@mcp.tool()
-def getRecruitmentDetail(path: str, **params):
+def _detail_paging(params: Dict[str, Any]) -> Tuple[int, int]:
+    page_no = int(params.pop("pageNo", 1)) if "pageNo" in params else 1
+    num_rows = int(params.pop("numOfRows", 10)) if "numOfRows" in params else 10
+    return page_no, num_rows
+
+
+@mcp_common.twin_tool(mcp, call_api, call_api_async)
+def getRecruitmentDetail(path: str, fields: Optional[List[str]] = None, compact: bool = False, **params):
     """
     상세 조회(엔드포인트/파라미터를 그대로 전달)
     예: path="detail", recruitSn="..." 등
+    - fields: 항목마다 남길 컬럼 목록, compact: 원문·전송 메타데이터를 뺀 축약 응답
     """
-    page_no = int(params.pop("pageNo", 1)) if "pageNo" in params else 1
-    num_rows = int(params.pop("numOfRows", 10)) if "numOfRows" in params else 10
-    return call_api(path=path, page_no=page_no, num_rows=num_rows, filters=params)
+    page_no, num_rows = _detail_paging(params)
+    return dict(path=path, page_no=page_no, num_rows=num_rows, filters=params)
+
+
+def _records(result: Dict[str, Any]) -> List[Dict[str, Any]]:
+    data = result.get("data")
+    items = data.get("result") if isinstance(data, dict) else None
+    return items if isinstance(items, list) else []
+
+
+def iter_recruitments(
+    path: str = "list",
+    numOfRows: int = 100,
+    filters: Optional[Dict[str, Any]] = None,
+    maxRecords: Optional[int] = None,
+) -> Iterator[Dict[str, Any]]:
+    """채용공고 전체 페이지를 돌며 공고를 하나씩 내보냄 (남은 페이지는 동시에 미리 받아 둠)."""
+    return pagination.iterate(
+        lambda page: call_api(path=path, page_no=page, num_rows=numOfRows, filters=filters),
+        _records,
+        numOfRows,
+        maxRecords,
+    )
+
+
+def aiter_recruitments(
+    path: str = "list",
+    numOfRows: int = 100,
+    filters: Optional[Dict[str, Any]] = None,
+    maxRecords: Optional[int] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """iter_recruitments의 비동기 버전."""
+    return pagination.aiterate(
+        lambda page: call_api_async(path=path, page_no=page, num_rows=numOfRows, filters=filters),
+        _records,
+        numOfRows,
+        maxRecords,
+    )
+
+
+def _collect_recruitments(path: str, numOfRows: int, filters: Optional[Dict[str, Any]], maxRecords: Optional[int]):
+    return pagination.collect(
+        lambda page: call_api(path=path, page_no=page, num_rows=numOfRows, filters=filters),
+        _records,
+        numOfRows,
+        maxRecords,
+    )
+
+
+async def _collect_recruitments_async(
+    path: str, numOfRows: int, filters: Optional[Dict[str, Any]], maxRecords: Optional[int]
+):
+    return await pagination.collect_async(
+        lambda page: call_api_async(path=path, page_no=page, num_rows=numOfRows, filters=filters),
+        _records,
+        numOfRows,
+        maxRecords,
+    )
+
+
+@mcp_common.twin_tool(mcp, _collect_recruitments, _collect_recruitments_async)
+def listAllRecruitments(
+    path: str = "list",
+    numOfRows: int = 100,
+    filters: Optional[Dict[str, Any]] = None,
+    maxRecords: Optional[int] = None,
+    fields: Optional[List[str]] = None,
+    compact: bool = False,
+):
+    """
+    공공기관 채용정보 전체 목록 (모든 페이지)
+    - numOfRows: 페이지당 행 수
+    - filters: listRecruitments와 같은 추가 파라미터
+    - maxRecords: 최대 공고 수 (없으면 전체)
+    - fields: 항목마다 남길 컬럼 목록, compact: 원문·전송 메타데이터를 뺀 축약 응답
+    """
+    return dict(path=path, numOfRows=numOfRows, filters=filters, maxRecords=maxRecords)
+
+
+def _mirror_page(page: int, num_rows: int, filters: Dict[str, Any]) -> Dict[str, Any]:
+    # 캐시된 페이지를 받으면 force로 돌려도 새 공고·삭제를 놓치므로 미러 동기화는 항상 상위 API를 직접 부름
+    return call_api(path="list", page_no=page, num_rows=num_rows, filters=filters, cached=False)
+
+
+# 페이지 순회와 SQLite 쓰기는 동기 코드이므로 MCP에는 스레드에서 돌리는 비동기 버전을 등록
+@mcp_common.threaded_tool(mcp)
+def syncRecruitmentMirror(full: bool = False, force: bool = False):
+    """
+    채용공고 로컬 미러 동기화
+    - 평소에는 마지막으로 본 공고 시작일 이후 등록·수정된 공고만 받고, 마감일이 지난 공고는 삭제
+    - full: 진행 중 공고 전체를 받아 사라진 공고까지 정리 (하루 한 번은 자동으로 전체)
+    - force: 최근 동기화 직후라도 다시 동기화
+    """
+    if not API_KEY:
+        return _missing_key_error("list")
+    return recruitment_mirror.get_mirror().sync(_mirror_page, _records, full=full, force=force)
+
+
+@mcp_common.threaded_tool(mcp)
+def queryRecruitments(
+    filters: Optional[Dict[str, Any]] = None,
+    keyword: Optional[str] = None,
+    limit: int = 100,
+    offset: int = 0,
+    fields: Optional[List[str]] = None,
+    compact: bool = False,
+):
+    """
+    로컬 미러에서 진행 중인 채용공고 조회 (상위 API 호출 없음, 마감일 순)
+    - filters: {"workRgnLst":"R3010", "hireTypeLst":"R1050,R1060", "acbgCondLst":"R7010", "ncsCdLst":"R600020"}
+      같은 필드 안의 코드는 OR, 필드끼리는 AND
+    - keyword: 공고명·기관명·근무지명 부분 일치
+    - limit, offset: 반환할 공고 수와 시작 위치
+    - fields: 항목마다 남길 컬럼 목록, compact: 원문·전송 메타데이터를 뺀 축약 응답
+    미러가 비어 있으면 syncRecruitmentMirror를 먼저 실행하세요.
+    """
+    mirror = recruitment_mirror.get_mirror()
+    state = mirror.stats()
+    if not state["last_sync"]:
+        return {"status": "error", "message": "채용공고 미러가 비어 있습니다. syncRecruitmentMirror를 먼저 실행하세요."}
+    try:
+        total, items = mirror.query(filters, keyword, limit, offset)
+    except ValueError as e:
+        return {"status": "error", "message": str(e)}
+    result = {"status": "ok", "total_count": total, "count": len(items), "items": items, "synced_at": state["last_sync"]}
+    return projection.project(result, fields, compact)
 
 
-@mcp.tool()
-def ping():
-    """헬스체크"""
-    return {"status": "ok", "message": "pong"}
+mcp_common.register_common_tools(mcp, _keys)
 
 
 def main():
@@ -152,6 +348,10 @@ def main():
         print("[SERVER] tools:", names, flush=True)
     except Exception:
         pass
+    # 디스크 캐시(RESPONSE_CACHE_DB)가 있으면 최근 항목을 메모리로 미리 읽어 둠
+    response_cache.get_cache()
+    # 첫 요청 전에 TCP+TLS 연결을 맺고 동작하는 TLS 모드를 학습
+    http_transport.prewarm([BASE_URL])
     mcp.run()
 
 
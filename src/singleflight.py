@@ -0,0 +1,120 @@
+# singleflight.py — 같은 키로 동시에 들어온 요청을 상위 호출 한 번으로 합치기
+import asyncio
+import threading
+import weakref
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeout
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+import deadline
+
+
+def _has_time_left() -> bool:
+    """앞선 호출이 데드라인으로 실패했을 때, 기다리던 쪽이 새로 호출할 시간이 남았는지."""
+    remaining = deadline.remaining()
+    return remaining is None or remaining > 0
+
+
+class SingleFlight:
+    """
+    키별로 진행 중인 호출을 하나만 두고, 같은 키로 들어온 나머지 호출은
+    그 결과(또는 예외)를 함께 받음. 동기(스레드)와 비동기(이벤트 루프) 경로를 모두 지원.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, Future] = {}
+        self._tasks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Task]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.coalesced = 0
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        fn()을 실행하거나 이미 진행 중인 호출을 기다림. (결과, 공유받았는지) 반환.
+        기다리는 쪽은 현재 질의 데드라인까지만 기다리고, 넘으면 DeadlineExceeded.
+        앞선 호출이 그 호출의 데드라인 때문에 실패했는데 내 데드라인이 남아 있으면 직접 다시 호출함.
+        """
+        while True:
+            with self._lock:
+                future = self._calls.get(key)
+                leader = future is None
+                if leader:
+                    future = Future()
+                    self._calls[key] = future
+                    self.leaders += 1
+                else:
+                    self.coalesced += 1
+            if leader:
+                break
+            try:
+                return future.result(timeout=deadline.remaining()), True
+            except FutureTimeout:
+                if future.done():  # 공유 호출 자체가 낸 TimeoutError
+                    raise
+                raise deadline.DeadlineExceeded(f"같은 요청의 응답을 기다리다 질의 시간 예산을 넘었습니다 ({key})")
+            except deadline.DeadlineExceeded:
+                if not _has_time_left():
+                    raise
+                with self._lock:  # 앞선 호출이 자리를 비우기 전에 깨어났을 수 있음
+                    if self._calls.get(key) is future:
+                        del self._calls[key]
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            with self._lock:
+                if self._calls.get(key) is future:
+                    del self._calls[key]
+
+    async def do_async(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """do()의 비동기 버전. 기다리던 쪽이 취소되거나 데드라인을 넘겨도 공유 호출은 취소되지 않음."""
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._lock:
+                tasks = self._tasks.setdefault(loop, {})
+                task = tasks.get(key)
+                leader = task is None
+                if leader:
+                    task = loop.create_task(fn())
+                    tasks[key] = task
+                    task.add_done_callback(lambda _t, _tasks=tasks: self._forget(_tasks, key, _t))
+                    self.leaders += 1
+                else:
+                    self.coalesced += 1
+            try:
+                return await asyncio.wait_for(asyncio.shield(task), deadline.remaining()), not leader
+            except asyncio.TimeoutError:
+                if task.done():
+                    raise
+                if leader:
+                    raise deadline.DeadlineExceeded(f"질의 시간 예산 안에 응답을 받지 못했습니다 ({key})")
+                raise deadline.DeadlineExceeded(f"같은 요청의 응답을 기다리다 질의 시간 예산을 넘었습니다 ({key})")
+            except deadline.DeadlineExceeded:
+                if leader or not _has_time_left():
+                    raise
+                with self._lock:  # done 콜백보다 먼저 깨어났을 수 있으므로 끝난 호출은 직접 치움
+                    if tasks.get(key) is task:
+                        del tasks[key]
+
+    def _forget(self, tasks: Dict[str, asyncio.Task], key: str, task: asyncio.Task) -> None:
+        # 기다리던 쪽이 모두 취소된 경우에도 "exception was never retrieved" 경고가 나지 않도록
+        if not task.cancelled():
+            task.exception()
+        with self._lock:
+            if tasks.get(key) is task:
+                del tasks[key]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "in_flight": len(self._calls) + sum(len(t) for t in self._tasks.values()),
+                "leaders": self.leaders,
+                "coalesced": self.coalesced,
+            }
@@ -0,0 +1,236 @@
+# trade_analytics.py — 실거래 행을 컬럼별 NumPy 배열로 모아 지역·월·면적대·건축연도대별 통계를 벡터 연산으로 계산
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# 전용면적 구간 (주택 공급 규칙에서 흔히 쓰는 60/85/102/135㎡ 경계)
+AREA_BINS = (40.0, 60.0, 85.0, 102.0, 135.0)
+AREA_LABELS = ("~40㎡", "40~60㎡", "60~85㎡", "85~102㎡", "102~135㎡", "135㎡~")
+# 건축연도 구간 (10년 단위)
+BUILD_YEAR_BINS = (1990, 2000, 2010, 2020)
+BUILD_YEAR_LABELS = ("~1989", "1990년대", "2000년대", "2010년대", "2020~")
+
+DEFAULT_PERCENTILES = (25, 50, 75)
+GROUP_KEYS = ("region", "month", "area_bucket", "build_year_bucket")
+
+
+class TradeFrame:
+    """
+    거래 행들을 필드별 배열로 보관. 가격(dealAmount, 만원)이나 면적이 없는 행은 제외.
+    region: 시군구코드 사전(region_labels)의 번호, month: YYYYMM 정수, amount: 만원, area: ㎡,
+    price_per_m2: 만원/㎡
+    """
+
+    def __init__(
+        self,
+        region: np.ndarray,
+        region_labels: np.ndarray,
+        month: np.ndarray,
+        amount: np.ndarray,
+        area: np.ndarray,
+        build_year: np.ndarray,
+        floor: np.ndarray,
+    ):
+        self.region = region
+        self.region_labels = region_labels
+        self.month = month
+        self.amount = amount
+        self.area = area
+        self.build_year = build_year
+        self.floor = floor
+        self.price_per_m2 = np.divide(amount, area, out=np.zeros_like(amount), where=area > 0)
+
+    def __len__(self) -> int:
+        return int(self.amount.shape[0])
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict[str, Any]]) -> "TradeFrame":
+        region: List[int] = []
+        region_codes: Dict[str, int] = {}
+        month: List[int] = []
+        amount: List[float] = []
+        area: List[float] = []
+        build_year: List[int] = []
+        floor: List[int] = []
+        for row in rows:
+            price, size = row.get("dealAmount"), row.get("excluUseAr")
+            if not isinstance(price, (int, float)) or not isinstance(size, (int, float)) or size <= 0:
+                continue
+            sgg = str(row.get("sggCd") or "")
+            region.append(region_codes.setdefault(sgg, len(region_codes)))
+            month.append((row.get("dealYear") or 0) * 100 + (row.get("dealMonth") or 0))
+            amount.append(price)
+            area.append(size)
+            build_year.append(row.get("buildYear") or 0)
+            floor.append(row.get("floor") or 0)
+        # 지역 코드 번호를 코드 문자열 순서로 다시 매겨 그룹 결과가 입력 순서와 상관없이 정렬되게 함
+        labels = np.array(list(region_codes), dtype=str)
+        order = np.argsort(labels)
+        rank = np.empty_like(order)
+        rank[order] = np.arange(len(order))
+        return cls(
+            rank[np.array(region, dtype=np.intp)] if region else np.zeros(0, dtype=np.intp),
+            labels[order],
+            np.array(month, dtype=np.int32),
+            np.array(amount, dtype=np.float64),
+            np.array(area, dtype=np.float64),
+            np.array(build_year, dtype=np.int32),
+            np.array(floor, dtype=np.int32),
+        )
+
+    def area_bucket(self) -> np.ndarray:
+        """행별 면적 구간 번호 (AREA_LABELS의 인덱스)."""
+        return np.digitize(self.area, AREA_BINS)
+
+    def build_year_bucket(self) -> np.ndarray:
+        """행별 건축연도 구간 번호 (BUILD_YEAR_LABELS의 인덱스, 연도 미상은 마지막 번호)."""
+        index = np.digitize(self.build_year, BUILD_YEAR_BINS)
+        return np.where(self.build_year > 0, index, len(BUILD_YEAR_LABELS))
+
+    def codes(self, key: str) -> Tuple[np.ndarray, np.ndarray]:
+        """그룹 기준 컬럼의 (행별 정수 코드, 코드별 표시 값). 문자열 비교 없이 정수로만 묶기 위함."""
+        if key == "region":
+            return self.region, self.region_labels
+        if key == "month":
+            labels, inverse = np.unique(self.month, return_inverse=True)
+            return inverse, labels
+        if key == "area_bucket":
+            return self.area_bucket(), np.asarray(AREA_LABELS)
+        if key == "build_year_bucket":
+            return self.build_year_bucket(), np.asarray(BUILD_YEAR_LABELS + ("미상",))
+        raise ValueError(f"그룹 기준은 {', '.join(GROUP_KEYS)} 중 하나입니다: {key}")
+
+
+def _group_ids(frame: TradeFrame, by: Sequence[str]) -> Tuple[np.ndarray, List[np.ndarray]]:
+    """여러 키를 하나의 그룹 번호로. (행별 그룹 번호, 그룹별 키 값 목록)"""
+    codes, labels = zip(*(frame.codes(key) for key in by))
+    shape = tuple(len(l) for l in labels)
+    combined = np.ravel_multi_index(codes, shape)
+    group_keys, group_ids = np.unique(combined, return_inverse=True)
+    key_codes = np.unravel_index(group_keys, shape)
+    return group_ids, [l[c] for l, c in zip(labels, key_codes)]
+
+
+def check_percentiles(percentiles: Sequence[float]) -> List[float]:
+    """백분위수 목록 검증: 비어 있지 않고 0~100 사이의 숫자여야 함. 중앙값(50)을 더해 정렬한 목록을 반환."""
+    if isinstance(percentiles, (str, bytes)) or not percentiles:
+        raise ValueError("percentiles는 0~100 사이 숫자의 목록이어야 합니다")
+    qs = set()
+    for q in percentiles:
+        if isinstance(q, bool) or not isinstance(q, (int, float)) or not 0 <= q <= 100:
+            raise ValueError(f"percentiles 값은 0~100 사이의 숫자여야 합니다: {q!r}")
+        qs.add(float(q))
+    return sorted(qs | {50.0})
+
+
+def _label(q: float) -> str:
+    # 소수 백분위수(p99.5 등)도 서로 다른 이름이 되도록 %g 형식
+    return f"p{q:g}"
+
+
+def grouped_percentiles(values: np.ndarray, groups: np.ndarray, n_groups: int, qs: Sequence[float]) -> np.ndarray:
+    """
+    그룹별 백분위수 (np.percentile 기본값과 같은 선형 보간). 그룹·값 기준으로 한 번 정렬한 뒤
+    각 그룹의 시작 위치에서 보간 위치를 계산하므로 그룹 수와 상관없이 벡터 연산으로 끝남.
+    반환: shape (len(qs), n_groups)
+    """
+    order = np.lexsort((values, groups))
+    sorted_values = values[order]
+    counts = np.bincount(groups, minlength=n_groups)
+    starts = np.cumsum(counts) - counts
+    out = np.empty((len(qs), n_groups), dtype=np.float64)
+    for i, q in enumerate(qs):
+        pos = starts + (counts - 1) * (q / 100.0)
+        lo = np.floor(pos).astype(np.intp)
+        hi = np.ceil(pos).astype(np.intp)
+        lo_values, hi_values = sorted_values[lo], sorted_values[hi]
+        out[i] = lo_values + (hi_values - lo_values) * (pos - lo)
+    return out
+
+
+def group_stats(
+    frame: TradeFrame,
+    by: Sequence[str] = ("region", "month"),
+    percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+) -> List[Dict[str, Any]]:
+    """그룹별 거래량, 가격 평균/중앙값/백분위수, ㎡당 가격 중앙값, 평균 면적. percentiles가 잘못되면 ValueError."""
+    qs = check_percentiles(percentiles)
+    if len(frame) == 0:
+        return []
+    groups, keys = _group_ids(frame, by)
+    n = len(keys[0]) if keys else 0
+    volume = np.bincount(groups, minlength=n)
+    mean_amount = np.bincount(groups, weights=frame.amount, minlength=n) / volume
+    mean_area = np.bincount(groups, weights=frame.area, minlength=n) / volume
+    amount_q = grouped_percentiles(frame.amount, groups, n, qs)
+    per_m2_q = grouped_percentiles(frame.price_per_m2, groups, n, (50,))
+    median_index = qs.index(50)
+
+    rows = []
+    for g in range(n):
+        row: Dict[str, Any] = {key: _plain(values[g]) for key, values in zip(by, keys)}
+        row.update({
+            "volume": int(volume[g]),
+            "mean_price": round(float(mean_amount[g]), 1),
+            "median_price": round(float(amount_q[median_index, g]), 1),
+            "percentiles": {_label(q): round(float(amount_q[i, g]), 1) for i, q in enumerate(qs)},
+            "median_price_per_m2": round(float(per_m2_q[0, g]), 1),
+            "mean_area": round(float(mean_area[g]), 2),
+        })
+        rows.append(row)
+    return rows
+
+
+def monthly_trend(frame: TradeFrame) -> List[Dict[str, Any]]:
+    """지역별 월 중앙값과 직전 거래월 대비 변화율(%)."""
+    rows = group_stats(frame, ("region", "month"), (50,))
+    if not rows:
+        return []
+    medians = np.array([r["median_price"] for r in rows])
+    regions = np.array([r["region"] for r in rows])
+    # group_stats 결과는 (지역, 월) 순으로 정렬돼 있으므로 같은 지역 안에서 바로 앞 행과 비교
+    prev = np.roll(medians, 1)
+    same_region = np.roll(regions, 1) == regions
+    same_region[0] = False
+    change = np.where(same_region & (prev > 0), (medians - prev) / np.where(prev > 0, prev, 1) * 100, np.nan)
+    return [
+        {
+            "region": r["region"],
+            "month": r["month"],
+            "volume": r["volume"],
+            "median_price": r["median_price"],
+            "change_pct": None if np.isnan(c) else round(float(c), 2),
+        }
+        for r, c in zip(rows, change)
+    ]
+
+
+def summarize(
+    rows: Iterable[Dict[str, Any]],
+    by: Sequence[str] = ("region", "month"),
+    percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+    frame: Optional[TradeFrame] = None,
+) -> Dict[str, Any]:
+    """전체 요약 + 그룹별 통계 + 지역별 월 추이. percentiles가 잘못되면 ValueError."""
+    qs = check_percentiles(percentiles)
+    frame = frame if frame is not None else TradeFrame.from_rows(rows)
+    if len(frame) == 0:
+        return {"count": 0, "overall": None, "groups": [], "trend": []}
+    overall_q = np.percentile(frame.amount, qs)
+    return {
+        "count": len(frame),
+        "overall": {
+            "volume": len(frame),
+            "mean_price": round(float(frame.amount.mean()), 1),
+            "median_price": round(float(np.median(frame.amount)), 1),
+            "percentiles": {_label(q): round(float(v), 1) for q, v in zip(qs, overall_q)},
+            "median_price_per_m2": round(float(np.median(frame.price_per_m2)), 1),
+        },
+        "group_by": list(by),
+        "groups": group_stats(frame, by, percentiles),
+        "trend": monthly_trend(frame),
+    }
+
+
+def _plain(value: Any) -> Any:
+    return value.item() if isinstance(value, np.generic) else value
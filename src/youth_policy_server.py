@@ -1,55 +1,146 @@
 # youth_policy_server.py — 청소년정책 MCP 서버
 import os
-import ssl
-from typing import Any, Dict, Optional, Tuple, Iterable
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
 
-import httpx
 from dotenv import load_dotenv
 from mcp.server.fastmcp import FastMCP
 
+import deadline
+import http_transport
+import mcp_common
+import pagination
+import policy_index
+import projection
+import quota
+import response_cache
+
 load_dotenv()
 
 mcp = FastMCP("youth-policy-mcp")
 
 # 청소년정책 API
 BASE_URL = (os.getenv("YOUTH_BASE_URL") or "https://www.youthcenter.go.kr/go/ythip/getPlcy").rstrip("/")
-API_KEY = (os.getenv("YOUTH_API_KEY") or "55930c52-9e2e-42ba-9aec-f562fc10cd09").strip()
+# YOUTH_API_KEY에 콤마로 여러 키를 넣으면 요청마다 돌아가며 사용
+_keys = quota.pool_from_env("youth_policy", "YOUTH_API_KEY", "YOUTH", default_key="55930c52-9e2e-42ba-9aec-f562fc10cd09")
+API_KEY = _keys.keys[0] if _keys.keys else ""
+
+def _try_get(url: str, params: Dict[str, Any]):
+    """공용 전송 계층(http_transport)으로 GET. 성공하면 (mode, response) 반환."""
+    return http_transport.get_transport().get(url, params)
 
-def _client_candidates() -> Iterable[Tuple[str, httpx.Client]]:
-    """TLS/SSL 환경에 따라 순차적으로 시도할 httpx.Client 후보들."""
-    # 1) 기본값
-    yield "default", httpx.Client(http2=False, timeout=20, trust_env=True)
 
-    # 2) TLS 1.2 이상 + 낮은 보안 레벨
+async def _try_get_async(url: str, params: Dict[str, Any]):
+    """_try_get의 비동기 버전 (공유 AsyncClient 사용)."""
+    return await http_transport.get_async_transport().get(url, params)
+
+
+def _build_params(
+    page_num: int,
+    page_size: int,
+    page_type: str,
+    return_type: str,
+    filters: Optional[Dict[str, Any]],
+) -> Dict[str, Any]:
+    params: Dict[str, Any] = {
+        "apiKeyNm": API_KEY,
+        "pageNum": page_num,
+        "pageSize": page_size,
+        "pageType": page_type,
+        "rtnType": return_type,
+    }
+    
+    if filters:
+        params.update(filters)
+    return params
+
+
+def _build_result(mode: str, resp) -> Dict[str, Any]:
+    req_url = str(resp.request.url)
+    status_code = resp.status_code
+    resp.raise_for_status()
+    
     try:
-        tls = ssl.create_default_context()
-        tls.minimum_version = ssl.TLSVersion.TLSv1_2
-        try:
-            tls.set_ciphers("DEFAULT:@SECLEVEL=1")
-        except Exception:
-            pass
-        yield "tls12_seclevel1", httpx.Client(verify=tls, http2=False, timeout=20, trust_env=True)
-    except Exception:
-        pass
+        json_data = resp.json()
+        
+        # 응답 데이터 정규화 (항상 policies와 total_count 추가)
+        result_section = json_data.get("result", {})
+        policies = result_section.get("youthPolicyList", [])
+        pagging_info = result_section.get("pagging", {})
+        total_count = pagging_info.get("totCount", 0)
+        
+        # API 응답 구조에 맞게 데이터 정규화
+        response = {
+            "status": "ok",
+            "ssl_mode": mode,
+            "circuit": http_transport.circuit_state(req_url),
+            "request_url": req_url,
+            "status_code": status_code,
+            "data": json_data,
+            "policies": policies,
+            "total_count": total_count,
+            "page_info": pagging_info
+        }
+        
+        # API 오류 체크
+        if json_data.get("resultCode") != 200:
+            response["api_error"] = json_data.get('resultMessage', 'Unknown API error')
+        
+        return response
+        
+    except Exception as parse_error:
+        return {
+            "status": "error",
+            "ssl_mode": mode,
+            "circuit": http_transport.circuit_state(req_url),
+            "request_url": req_url,
+            "status_code": status_code,
+            "text": resp.text,
+            "parse_error": str(parse_error)
+        }
 
-    # 3) 최후 수단: 인증서 검증 비활성화
-    yield "insecure", httpx.Client(verify=False, http2=False, timeout=20, trust_env=True)
 
+def _ttl_for(result: Dict[str, Any]) -> float:
+    """목록 안에서 가장 먼저 신청이 끝나는 정책(aplyYmd 종료일)에 맞춰 캐시 만료."""
+    return response_cache.ttl_until_earliest(
+        response_cache.apply_period_end(policy.get("aplyYmd"))
+        for policy in result.get("policies") or [] if isinstance(policy, dict)
+    )
 
-def _try_get(url: str, params: Dict[str, Any]):
-    """위의 후보 클라이언트들을 순서대로 시도. 성공하면 (mode, response) 반환."""
-    last_err: Optional[Exception] = None
-    for mode, client in _client_candidates():
-        try:
-            with client as c:
-                resp = c.get(url, params=params)
-                return mode, resp
-        except Exception as e:
-            last_err = e
-            continue
-    if last_err:
-        raise last_err
-    raise RuntimeError("No HTTP client candidates available")
+
+def _index_policies(result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    응답의 정책을 로컬 검색 색인에 반영하고 응답을 그대로 반환.
+    캐시 적중(디스크 캐시 포함) 응답도 반영해야 색인을 지우거나 새로 띄운 뒤에도 채워짐 (바뀌지 않은 정책은 건너뜀).
+    """
+    if pagination.is_ok(result):
+        policy_index.get_index().add_many(result.get("policies") or [])
+    return result
+
+
+def _fetch(url: str, params: Dict[str, Any], endpoint: str) -> Dict[str, Any]:
+    """키 풀에서 한도·속도 제한을 통과한 키를 골라 실제 상위 호출 (본문이 한도 초과면 다른 키로 다시)."""
+    try:
+        mode, resp = _keys.send(endpoint, lambda key: _try_get(url, {**params, "apiKeyNm": key}))
+    except quota.QuotaExhausted as e:
+        return mcp_common.quota_error(url, e)
+    return _build_result(mode, resp)
+
+
+async def _fetch_async(url: str, params: Dict[str, Any], endpoint: str) -> Dict[str, Any]:
+    """_fetch의 비동기 버전."""
+    try:
+        mode, resp = await _keys.send_async(endpoint, lambda key: _try_get_async(url, {**params, "apiKeyNm": key}))
+    except quota.QuotaExhausted as e:
+        return mcp_common.quota_error(url, e)
+    return _build_result(mode, resp)
+
+
+def _missing_key_error() -> Dict[str, Any]:
+    return {
+        "status": "error",
+        "message": "YOUTH_API_KEY is missing in .env",
+        "request_url": BASE_URL,
+    }
 
 
 def call_youth_api(
@@ -61,74 +152,112 @@ def call_youth_api(
 ):
     """청소년정책 API 호출"""
     if not API_KEY:
+        return _missing_key_error()
+
+    params = _build_params(page_num, page_size, page_type, return_type, filters)
+    try:
+        return _index_policies(response_cache.get_cache().cached_call(
+            response_cache.fingerprint(BASE_URL, params),
+            lambda: _fetch(BASE_URL, params, "getPlcy"),
+            _ttl_for,
+        ))
+    except deadline.DeadlineExceeded as e:
+        return mcp_common.deadline_error(BASE_URL, e)
+    except Exception as e:
         return {
             "status": "error",
-            "message": "YOUTH_API_KEY is missing in .env",
+            "message": str(e),
             "request_url": BASE_URL,
+            "circuit": http_transport.circuit_state(BASE_URL),
         }
 
-    params: Dict[str, Any] = {
-        "apiKeyNm": API_KEY,
-        "pageNum": page_num,
-        "pageSize": page_size,
-        "pageType": page_type,
-        "rtnType": return_type,
-    }
-    
-    if filters:
-        params.update(filters)
+
+async def call_youth_api_async(
+    page_num: int = 1,
+    page_size: int = 10,
+    page_type: str = "1",
+    return_type: str = "json",
+    filters: Optional[Dict[str, Any]] = None,
+):
+    """청소년정책 API 호출 (비동기 버전)"""
+    if not API_KEY:
+        return _missing_key_error()
+
+    params = _build_params(page_num, page_size, page_type, return_type, filters)
 
     try:
-        mode, resp = _try_get(BASE_URL, params)
-        req_url = str(resp.request.url)
-        status_code = resp.status_code
-        resp.raise_for_status()
-        
-        try:
-            json_data = resp.json()
-            
-            # 응답 데이터 정규화 (항상 policies와 total_count 추가)
-            result_section = json_data.get("result", {})
-            policies = result_section.get("youthPolicyList", [])
-            pagging_info = result_section.get("pagging", {})
-            total_count = pagging_info.get("totCount", 0)
-            
-            # API 응답 구조에 맞게 데이터 정규화
-            response = {
-                "status": "ok",
-                "ssl_mode": mode,
-                "request_url": req_url,
-                "status_code": status_code,
-                "data": json_data,
-                "policies": policies,
-                "total_count": total_count,
-                "page_info": pagging_info
-            }
-            
-            # API 오류 체크
-            if json_data.get("resultCode") != 200:
-                response["api_error"] = json_data.get('resultMessage', 'Unknown API error')
-            
-            return response
-            
-        except Exception as parse_error:
-            return {
-                "status": "error",
-                "ssl_mode": mode,
-                "request_url": req_url,
-                "status_code": status_code,
-                "text": resp.text,
-                "parse_error": str(parse_error)
-            }
+        return _index_policies(await response_cache.get_cache().cached_call_async(
+            response_cache.fingerprint(BASE_URL, params),
+            lambda: _fetch_async(BASE_URL, params, "getPlcy"),
+            _ttl_for,
+        ))
+    except deadline.DeadlineExceeded as e:
+        return mcp_common.deadline_error(BASE_URL, e)
     except Exception as e:
         return {
             "status": "error",
             "message": str(e),
             "request_url": BASE_URL,
+            "circuit": http_transport.circuit_state(BASE_URL),
         }
 
 
-@mcp.tool()
+def _with_extra_filters(filters: Dict[str, Any], kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    # 추가 kwargs 필터
+    for key, value in kwargs.items():
+        if value is not None:
+            filters[key] = value
+    return filters
+
+
+def _youth_policy_filters(
+    policyKeyword: Optional[str],
+    policyName: Optional[str],
+    regionCode: Optional[str],
+    largeCategoryName: Optional[str],
+    middleCategoryName: Optional[str],
+    policyExplanation: Optional[str],
+    kwargs: Dict[str, Any],
+) -> Dict[str, Any]:
+    filters = {}
+    
+    if policyKeyword:
+        filters["plcyKywdNm"] = policyKeyword
+    if policyName:
+        filters["plcyNm"] = policyName
+    if regionCode:
+        filters["zipCd"] = regionCode
+    if largeCategoryName:
+        filters["lclsfNm"] = largeCategoryName
+    if middleCategoryName:
+        filters["mclsfNm"] = middleCategoryName
+    if policyExplanation:
+        filters["plcyExplnCn"] = policyExplanation
+    
+    return _with_extra_filters(filters, kwargs)
+
+
+def _region_filters(regionCode: str, categories: Optional[str], kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    filters = {"zipCd": regionCode}
+    
+    if categories:
+        filters["lclsfNm"] = categories
+    
+    return _with_extra_filters(filters, kwargs)
+
+
+def _keyword_filters(keywords: str, regionCode: Optional[str], kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    filters = {"plcyKywdNm": keywords}
+    
+    if regionCode:
+        filters["zipCd"] = regionCode
+    
+    return _with_extra_filters(filters, kwargs)
+
+
+# 도구마다 요청 인자를 만드는 함수 하나로 동기 버전(오케스트레이터 등 프로세스 내부 호출용)과
+# 같은 이름의 비동기 MCP 도구를 함께 만듦 (mcp_common.twin_tool)
+@mcp_common.twin_tool(mcp, call_youth_api, call_youth_api_async)
 def searchYouthPolicies(
     pageNum: int = 1,
     pageSize: int = 10,
@@ -138,6 +267,8 @@ def searchYouthPolicies(
     largeCategoryName: Optional[str] = None,  # 정책대분류명
     middleCategoryName: Optional[str] = None,  # 정책중분류명
     policyExplanation: Optional[str] = None,  # 정책설명
+    fields: Optional[List[str]] = None,
+    compact: bool = False,
     **kwargs
 ):
     """
@@ -149,125 +280,170 @@ def searchYouthPolicies(
     - largeCategoryName: 정책대분류명 (콤마로 구분)
     - middleCategoryName: 정책중분류명 (콤마로 구분)
     - policyExplanation: 정책설명
+    - fields: 항목마다 남길 컬럼 목록, compact: 원문·전송 메타데이터를 뺀 축약 응답
     """
-    filters = {}
-    
-    if policyKeyword:
-        filters["plcyKywdNm"] = policyKeyword
-    if policyName:
-        filters["plcyNm"] = policyName
-    if regionCode:
-        filters["zipCd"] = regionCode
-    if largeCategoryName:
-        filters["lclsfNm"] = largeCategoryName
-    if middleCategoryName:
-        filters["mclsfNm"] = middleCategoryName
-    if policyExplanation:
-        filters["plcyExplnCn"] = policyExplanation
-    
-    # 추가 kwargs 필터
-    for key, value in kwargs.items():
-        if value is not None:
-            filters[key] = value
-    
-    return call_youth_api(
-        page_num=pageNum,
-        page_size=pageSize,
-        page_type="1",  # 목록
-        return_type="json",
-        filters=filters
+    filters = _youth_policy_filters(
+        policyKeyword, policyName, regionCode, largeCategoryName, middleCategoryName, policyExplanation, kwargs
     )
+    return dict(page_num=pageNum, page_size=pageSize, page_type="1", return_type="json", filters=filters)  # 목록
 
 
-@mcp.tool()
+@mcp_common.twin_tool(mcp, call_youth_api, call_youth_api_async)
 def getYouthPolicyDetail(
     policyNumber: str,
+    fields: Optional[List[str]] = None,
+    compact: bool = False,
     **kwargs
 ):
     """
     청소년정책 상세 조회
     - policyNumber: 정책번호 (필수)
+    - fields: 항목마다 남길 컬럼 목록, compact: 원문·전송 메타데이터를 뺀 축약 응답
     """
-    filters = {"plcyNo": policyNumber}
-    
-    # 추가 kwargs 필터
-    for key, value in kwargs.items():
-        if value is not None:
-            filters[key] = value
-    
-    return call_youth_api(
-        page_num=1,
-        page_size=1,
-        page_type="2",  # 상세
-        return_type="json",
-        filters=filters
-    )
+    filters = _with_extra_filters({"plcyNo": policyNumber}, kwargs)
+    return dict(page_num=1, page_size=1, page_type="2", return_type="json", filters=filters)  # 상세
 
 
-@mcp.tool()
+@mcp_common.twin_tool(mcp, call_youth_api, call_youth_api_async)
 def searchPoliciesByRegion(
     regionCode: str,
     pageNum: int = 1,
     pageSize: int = 20,
     categories: Optional[str] = None,  # 대분류명들 (콤마로 구분)
+    fields: Optional[List[str]] = None,
+    compact: bool = False,
     **kwargs
 ):
     """
     지역별 청소년정책 검색
     - regionCode: 법정시군구코드 5자리 (예: 11110 - 종로구)
     - categories: 관심 분야 (예: "일자리,주거,교육")
+    - fields: 항목마다 남길 컬럼 목록, compact: 원문·전송 메타데이터를 뺀 축약 응답
     """
-    filters = {"zipCd": regionCode}
-    
-    if categories:
-        filters["lclsfNm"] = categories
-    
-    # 추가 kwargs 필터
-    for key, value in kwargs.items():
-        if value is not None:
-            filters[key] = value
-    
-    return call_youth_api(
-        page_num=pageNum,
-        page_size=pageSize,
-        filters=filters
-    )
+    return dict(page_num=pageNum, page_size=pageSize, filters=_region_filters(regionCode, categories, kwargs))
 
 
-@mcp.tool()
+@mcp_common.twin_tool(mcp, call_youth_api, call_youth_api_async)
 def searchPoliciesByKeywords(
     keywords: str,  # 콤마로 구분된 키워드들
     pageNum: int = 1,
     pageSize: int = 20,
     regionCode: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+    compact: bool = False,
     **kwargs
 ):
     """
     키워드 기반 청소년정책 검색
     - keywords: 검색 키워드들 (콤마로 구분, 예: "취업,창업,주거지원")
     - regionCode: 선택적 지역 필터
+    - fields: 항목마다 남길 컬럼 목록, compact: 원문·전송 메타데이터를 뺀 축약 응답
     """
-    filters = {"plcyKywdNm": keywords}
-    
-    if regionCode:
-        filters["zipCd"] = regionCode
-    
-    # 추가 kwargs 필터
-    for key, value in kwargs.items():
-        if value is not None:
-            filters[key] = value
-    
-    return call_youth_api(
-        page_num=pageNum,
-        page_size=pageSize,
-        filters=filters
+    return dict(page_num=pageNum, page_size=pageSize, filters=_keyword_filters(keywords, regionCode, kwargs))
+
+
+def _policies(result: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return result.get("policies") or []
+
+
+def iter_youth_policies(filters: Optional[Dict[str, Any]] = None, pageSize: int = 100, maxRecords: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """청년정책 목록 전체 페이지를 돌며 정책을 하나씩 내보냄 (남은 페이지는 동시에 미리 받아 둠)."""
+    return pagination.iterate(
+        lambda page: call_youth_api(page_num=page, page_size=pageSize, filters=filters),
+        _policies,
+        pageSize,
+        maxRecords,
+    )
+
+
+def aiter_youth_policies(
+    filters: Optional[Dict[str, Any]] = None, pageSize: int = 100, maxRecords: Optional[int] = None
+) -> AsyncIterator[Dict[str, Any]]:
+    """iter_youth_policies의 비동기 버전."""
+    return pagination.aiterate(
+        lambda page: call_youth_api_async(page_num=page, page_size=pageSize, filters=filters),
+        _policies,
+        pageSize,
+        maxRecords,
     )
 
 
-@mcp.tool()
-def ping():
-    """헬스체크"""
-    return {"status": "ok", "message": "youth policy server pong"}
+def _collect_policies(filters: Dict[str, Any], pageSize: int, maxRecords: Optional[int]):
+    return pagination.collect(
+        lambda page: call_youth_api(page_num=page, page_size=pageSize, filters=filters),
+        _policies,
+        pageSize,
+        maxRecords,
+    )
+
+
+async def _collect_policies_async(filters: Dict[str, Any], pageSize: int, maxRecords: Optional[int]):
+    return await pagination.collect_async(
+        lambda page: call_youth_api_async(page_num=page, page_size=pageSize, filters=filters),
+        _policies,
+        pageSize,
+        maxRecords,
+    )
+
+
+@mcp_common.twin_tool(mcp, _collect_policies, _collect_policies_async)
+def searchAllYouthPolicies(
+    policyKeyword: Optional[str] = None,
+    policyName: Optional[str] = None,
+    regionCode: Optional[str] = None,
+    largeCategoryName: Optional[str] = None,
+    middleCategoryName: Optional[str] = None,
+    policyExplanation: Optional[str] = None,
+    pageSize: int = 100,
+    maxRecords: Optional[int] = None,
+    fields: Optional[List[str]] = None,
+    compact: bool = False,
+):
+    """
+    청소년정책 전체 검색 (모든 페이지)
+    - 검색 조건은 searchYouthPolicies와 같음
+    - pageSize: 페이지당 건수
+    - maxRecords: 최대 정책 수 (없으면 전체)
+    - fields: 항목마다 남길 컬럼 목록, compact: 원문·전송 메타데이터를 뺀 축약 응답
+    """
+    filters = _youth_policy_filters(
+        policyKeyword, policyName, regionCode, largeCategoryName, middleCategoryName, policyExplanation, {}
+    )
+    return dict(filters=filters, pageSize=pageSize, maxRecords=maxRecords)
+
+
+@mcp_common.threaded_tool(mcp)
+def searchPoliciesLocal(
+    query: str,
+    regionCode: Optional[str] = None,
+    limit: int = 20,
+    includeClosed: bool = False,
+    fields: Optional[List[str]] = None,
+    compact: bool = False,
+):
+    """
+    로컬 색인에서 청년정책 전문 검색 (BM25 순위, 상위 API 호출 없음)
+    - query: 검색어 (공백/콤마 구분, 예: "청년,취업,창업,주거지원") — 정책명·키워드·설명·지원내용에서 찾음
+    - regionCode: 선택적 지역 필터 (zipCd 앞자리 일치, 예: "51150")
+    - includeClosed: 신청 기간이 지난 정책도 포함
+    - fields: 항목마다 남길 컬럼 목록, compact: 원문·전송 메타데이터를 뺀 축약 응답
+    색인은 다른 정책 도구로 받아 온 정책으로 채워짐 (전체를 채우려면 searchAllYouthPolicies)
+    """
+    index = policy_index.get_index()
+    total, hits = index.search(query, limit, regionCode, includeClosed)
+    result = {
+        "status": "ok",
+        "total_count": total,
+        "count": len(hits),
+        "policies": [{**policy, "score": round(score, 4)} for score, policy in hits],
+        "indexed": len(index),
+    }
+    if not len(index):
+        result["message"] = "색인이 비어 있습니다. searchAllYouthPolicies 등으로 정책을 먼저 받아 오세요."
+    return projection.project(result, fields, compact)
+
+
+mcp_common.register_common_tools(mcp, _keys, "youth policy server pong")
 
 
 def main():
@@ -276,6 +452,10 @@ def main():
         print("[YOUTH POLICY SERVER] tools:", names, flush=True)
     except Exception:
         pass
+    # 디스크 캐시(RESPONSE_CACHE_DB)가 있으면 최근 항목을 메모리로 미리 읽어 둠
+    response_cache.get_cache()
+    # 첫 요청 전에 TCP+TLS 연결을 맺고 동작하는 TLS 모드를 학습
+    http_transport.prewarm([BASE_URL])
     mcp.run()
 
 
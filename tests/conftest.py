@@ -0,0 +1,10 @@
+# conftest.py — 테스트가 사용자 캐시 디렉터리(~/.cache/huss)의 한도·미러·색인 파일을 건드리지 않도록
+# 모듈을 읽기 전에 저장 경로를 임시 디렉터리로 돌림
+import os
+import tempfile
+
+_TMP = tempfile.mkdtemp(prefix="huss-tests-")
+os.environ.setdefault("API_QUOTA_DB", os.path.join(_TMP, "quota.sqlite"))
+os.environ.setdefault("RECRUITMENT_MIRROR_DB", os.path.join(_TMP, "recruitment.sqlite"))
+os.environ.setdefault("POLICY_INDEX_PATH", os.path.join(_TMP, "policy_index.bin"))
+os.environ.setdefault("RESPONSE_CACHE_DB", "")
@@ -0,0 +1,56 @@
+import pytest
+
+import realestate_server as realestate
+
+
+def test_month_range_spans_years():
+    assert realestate.month_range("202411", "202502") == ["202411", "202412", "202501", "202502"]
+    assert realestate.month_range("202503", "202503") == ["202503"]
+
+
+@pytest.mark.parametrize("start,end", [("202502", "202411"), ("2025", "202502"), ("202413", "202502")])
+def test_month_range_rejects_bad_input(start, end):
+    with pytest.raises(ValueError):
+        realestate.month_range(start, end)
+
+
+def test_month_range_limits_span(monkeypatch):
+    monkeypatch.setattr(realestate, "BULK_MAX_MONTHS", 3)
+    with pytest.raises(ValueError):
+        realestate.month_range("202401", "202404")
+
+
+def test_bulk_plan_dedupes_pairs():
+    endpoint, pairs = realestate._bulk_plan(["11110", " 11110 ", "", "11140"], "202412", "202501", "apartment")
+    assert endpoint == realestate.APT_TRADE_ENDPOINT
+    assert pairs == [("11110", "202412"), ("11110", "202501"), ("11140", "202412"), ("11140", "202501")]
+    with pytest.raises(ValueError):
+        realestate._bulk_plan(["11110"], "202501", "202501", "villa")
+
+
+def test_merge_trades_keeps_identical_rows():
+    row = {"sggCd": "11110", "dealYear": 2025, "dealMonth": 1, "dealDay": 5, "dealAmount": 100}
+    pairs = [("11110", "202501"), ("11140", "202501")]
+    results = [
+        {"status": "ok", "items": [row, dict(row)]},
+        {"status": "ok", "items": [{**row, "sggCd": "11140"}]},
+    ]
+    merged = realestate._merge_trades(pairs, results)
+    assert merged["status"] == "ok"
+    # 같은 날 같은 금액의 거래 두 건은 실제 두 건이므로 둘 다 남김
+    assert merged["count"] == 3
+    assert merged["by_pair"] == {"11110:202501": 2, "11140:202501": 1}
+
+
+def test_merge_trades_partial_and_timeout():
+    pairs = [("11110", "202501"), ("11110", "202502")]
+    merged = realestate._merge_trades(pairs, [
+        {"status": "ok", "items": [{"sggCd": "11110"}]},
+        {"status": "timeout", "items": [], "errors": [{"page": 1, "message": "late"}]},
+    ])
+    assert merged["status"] == "partial"
+    assert merged["timed_out"] is True
+    assert merged["errors"] == [{"lawdcd": "11110", "deal_ymd": "202502", "page": 1, "message": "late"}]
+
+    merged = realestate._merge_trades(pairs[:1], [{"status": "error", "items": [], "errors": [{"page": 1, "message": "x"}]}])
+    assert merged["status"] == "error"
@@ -0,0 +1,94 @@
+import asyncio
+import threading
+
+import pytest
+
+import final_chatbot
+
+
+@pytest.fixture
+def bot(monkeypatch):
+    monkeypatch.setattr(final_chatbot, "PREFETCH", True)
+    chatbot = final_chatbot.PerfectChatbot()
+    calls = []
+    release = threading.Event()
+
+    def call_tool(server_name, tool_name, arguments=None, deadline=None):
+        calls.append((server_name, tool_name, threading.current_thread().name, deadline))
+        release.wait(5)
+        return {"status": "success", "server": server_name, "tool": tool_name, "result": {"status": "ok", "items": []}}
+
+    chatbot.orchestrator.call_tool = call_tool
+    chatbot.calls, chatbot.release = calls, release
+    yield chatbot
+    release.set()
+    chatbot.shutdown()
+
+
+async def settle(bot, count):
+    while len(bot.calls) < count:
+        await asyncio.sleep(0.01)
+
+
+def test_prefetch_runs_on_its_own_pool(bot):
+    async def main():
+        bot.start_prefetch()
+        # 채용 조회는 미러 동기화도 같은 풀에서 시작함
+        await settle(bot, 2)
+        tools = {tool for _, tool, _, _ in bot.calls}
+        threads = {thread for _, _, thread, _ in bot.calls}
+        bot.release.set()
+        await asyncio.gather(*(task for task, _, _ in bot._prefetched.values()))
+        return tools, threads
+
+    tools, threads = asyncio.run(main())
+    assert len(bot._prefetched) == 3
+    assert tools <= {"syncRecruitmentMirror", "queryRecruitments", "getApartmentTrades", "searchAllYouthPolicies"}
+    assert all(thread.startswith("prefetch") for thread in threads)
+
+
+def test_changed_conditions_cancel_stale_prefetch(bot):
+    async def main():
+        bot.start_prefetch()
+        stale = dict(bot._prefetched)
+        bot.state["deal_ymd"] = "202505"
+        bot.start_prefetch()
+        await asyncio.sleep(0)
+        return stale
+
+    stale = asyncio.run(main())
+    dropped = [entry for key, entry in stale.items() if key not in bot._prefetched]
+    # /date만 바뀌면 부동산 조회만 다시 시작하고, 채용·정책 조회는 그대로 씀
+    assert len(dropped) == 1
+    task, _, deadline = dropped[0]
+    assert deadline.cancelled and deadline.expired
+    assert task.cancelled()
+
+
+def test_take_prefetched_uses_result_within_ttl(bot, monkeypatch):
+    async def take(ttl):
+        monkeypatch.setattr(final_chatbot, "PREFETCH_TTL", ttl)
+        bot.release.set()
+        bot.start_prefetch()
+        await asyncio.gather(*(task for task, _, _ in bot._prefetched.values()))
+        args = bot._policy_args(bot.state["region_code"])
+        return await bot._take_prefetched("youth_policy", "searchAllYouthPolicies", args, final_chatbot.Deadline(5))
+
+    assert asyncio.run(take(300))["status"] == "success"
+    bot._prefetched.clear()
+    assert asyncio.run(take(0)) is None
+
+
+def test_shutdown_stops_background_work(bot):
+    async def main():
+        bot.start_prefetch()
+        await settle(bot, 1)
+        entries = list(bot._prefetched.values())
+        sync_deadline = bot._mirror_sync[1]
+        bot.shutdown()
+        return entries, sync_deadline
+
+    entries, sync_deadline = asyncio.run(main())
+    assert bot._prefetched == {} and bot._mirror_sync is None
+    assert sync_deadline.cancelled
+    assert all(deadline.cancelled for _, _, deadline in entries)
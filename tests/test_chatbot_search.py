@@ -0,0 +1,72 @@
+import asyncio
+import time
+
+import pytest
+
+import final_chatbot
+
+
+@pytest.fixture
+def bot():
+    chatbot = final_chatbot.PerfectChatbot()
+    yield chatbot
+    chatbot.shutdown()
+
+
+def intent(jobs=True, realestate=True, policies=True):
+    return {"search_jobs": jobs, "search_realestate": realestate, "search_policies": policies, "filters": {}}
+
+
+def section(text, delay, result="texts"):
+    async def search(intent, region_code, region_name, deadline):
+        await asyncio.sleep(delay)
+        if result == "error":
+            raise RuntimeError("boom")
+        return None if result == "timeout" else [text]
+    return search
+
+
+def test_sections_stream_in_completion_order(bot):
+    bot._search_jobs = section("jobs", 0.3)
+    bot._search_realestate = section("homes", 0.1)
+    bot._search_policies = section("policies", 0.2)
+    shown = []
+    start = time.monotonic()
+    rest = asyncio.run(bot.handle_search(intent(), shown.append))
+    # 세 섹션을 동시에 조회하므로 가장 느린 섹션 시간만큼 걸림
+    assert time.monotonic() - start < 0.5
+    assert [text.strip().splitlines()[-1] for text in shown] == ["homes", "policies", "jobs"]
+    assert "검색 결과" in shown[0] and all("검색 결과" not in text for text in shown[1:])
+    assert rest == ""
+
+
+def test_without_callback_sections_keep_fixed_order(bot):
+    bot._search_jobs = section("jobs", 0.2)
+    bot._search_realestate = section("homes", 0)
+    bot._search_policies = section("policies", 0.1)
+    result = asyncio.run(bot.handle_search(intent()))
+    assert result.index("jobs") < result.index("homes") < result.index("policies")
+
+
+def test_timeouts_and_errors_stay_in_their_section(bot):
+    bot._search_jobs = section("jobs", 0, result="timeout")
+    bot._search_realestate = section("homes", 0, result="error")
+    bot._search_policies = section("policies", 0)
+    shown = []
+    rest = asyncio.run(bot.handle_search(intent(), shown.append))
+    assert any("policies" in text for text in shown)
+    assert any("부동산 검색 중 오류" in text and "boom" in text for text in shown)
+    assert "시간 초과" in rest and "채용정보" in rest
+
+
+def test_only_requested_sections_run(bot):
+    bot._search_jobs = section("jobs", 0)
+    bot._search_realestate = lambda *args: pytest.fail("realestate searched")
+    bot._search_policies = lambda *args: pytest.fail("policies searched")
+    result = asyncio.run(bot.handle_search(intent(realestate=False, policies=False)))
+    assert "jobs" in result
+
+
+def test_unknown_region_is_rejected(bot):
+    result = asyncio.run(bot.handle_search({**intent(), "region_mentioned": "99999"}))
+    assert result.startswith("❌ 지원하지 않는 지역")
@@ -0,0 +1,87 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+import deadline
+import http_transport
+import quota
+import server
+from deadline import Deadline, DeadlineExceeded
+
+URL = "https://api.example/list"
+
+
+def test_scope_sets_and_restores_current():
+    assert deadline.remaining(7) == 7
+    outer = Deadline(10)
+    with deadline.scope(outer):
+        with deadline.scope(None) as kept:
+            assert kept is outer
+        with deadline.scope(Deadline(1)):
+            assert deadline.remaining() <= 1
+        assert deadline.current() is outer
+    assert deadline.current() is None
+
+
+def test_cancel_and_expiry_raise():
+    dl = Deadline(0)
+    with pytest.raises(DeadlineExceeded, match="초과"):
+        dl.check()
+    dl = Deadline(10)
+    dl.cancel()
+    assert dl.expired
+    with pytest.raises(DeadlineExceeded, match="취소"):
+        dl.check("page 2")
+
+
+def test_meta_round_trip():
+    meta = deadline.to_meta(2.5)
+    assert meta == {deadline.META_KEY: 2.5}
+    assert deadline.from_meta(meta).remaining() == pytest.approx(2.5, abs=0.1)
+    assert deadline.from_meta(None) is None
+    assert deadline.from_meta({deadline.META_KEY: "soon"}) is None
+
+
+def test_deadline_reaches_worker_threads():
+    async def main():
+        with deadline.scope(Deadline(3)):
+            return await asyncio.to_thread(deadline.remaining)
+
+    assert 0 < asyncio.run(main()) <= 3
+
+
+def test_http_timeouts_are_capped_by_deadline():
+    assert http_transport._within_deadline(httpx.Timeout(20)).read == 20
+    with deadline.scope(Deadline(1)):
+        capped = http_transport._within_deadline(httpx.Timeout(20))
+    assert capped.read <= 1 and capped.connect <= 1
+    with deadline.scope(Deadline(0)):
+        with pytest.raises(DeadlineExceeded):
+            http_transport._within_deadline(httpx.Timeout(20))
+
+
+def test_timeout_after_deadline_is_not_a_circuit_failure(monkeypatch):
+    monkeypatch.setattr(http_transport, "RACE", False)
+
+    class Client:
+        def request(self, method, url, params=None, timeout=None):
+            time.sleep(0.06)
+            raise httpx.ReadTimeout("slow")
+
+    transport = http_transport.HttpTransport()
+    transport._clients = {mode: Client() for mode in http_transport.ENABLED_MODES}
+    with deadline.scope(Deadline(0.05)):
+        with pytest.raises(DeadlineExceeded):
+            transport.get(URL)
+    assert transport.breakers.state(URL) == "closed"
+
+
+def test_server_reports_timeout_when_budget_is_spent(monkeypatch, tmp_path):
+    store = quota.QuotaStore(str(tmp_path / "quota.sqlite"), flush_interval=0)
+    monkeypatch.setattr(server, "API_KEY", "key")
+    monkeypatch.setattr(server, "_keys", quota.KeyPool("recruitment", ["key"], 10, 100, 100, store=store))
+    with deadline.scope(Deadline(0)):
+        result = server.call_api("/getJobList", cached=False)
+    assert result["status"] == "timeout"
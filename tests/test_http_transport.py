@@ -0,0 +1,99 @@
+import threading
+
+import httpx
+import pytest
+
+import http_transport
+from http_transport import HttpTransport, TlsModeMemory
+
+
+class FakeClient:
+    """mode별 httpx.Client 대신: fail이면 연결 오류, 아니면 200 응답."""
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.calls = 0
+
+    def request(self, method, url, params=None, timeout=None):
+        self.calls += 1
+        if self.fail:
+            raise httpx.ConnectError("handshake failed")
+        return httpx.Response(200, request=httpx.Request(method, url), content=b"{}")
+
+
+@pytest.fixture
+def transport(monkeypatch):
+    monkeypatch.setattr(http_transport, "RACE", False)
+    monkeypatch.setattr(http_transport, "ENABLED_MODES", ("default", "tls12_seclevel1", "insecure"))
+    t = HttpTransport(memory=TlsModeMemory(reprobe_interval=600))
+    t._clients = {"default": FakeClient(fail=True), "tls12_seclevel1": FakeClient(), "insecure": FakeClient()}
+    return t
+
+
+def test_falls_back_and_remembers_mode(transport):
+    mode, resp = transport.request("GET", "https://api.example/list")
+    assert mode == "tls12_seclevel1"
+    assert resp.status_code == 200
+    assert transport.memory.snapshot() == {"api.example": "tls12_seclevel1"}
+
+    # 기억한 모드부터 시도하므로 실패하는 default는 다시 부르지 않음
+    mode, _ = transport.request("GET", "https://api.example/list")
+    assert mode == "tls12_seclevel1"
+    assert transport._clients["default"].calls == 1
+
+
+def test_all_modes_fail_forgets_host(transport):
+    transport.request("GET", "https://api.example/list")
+    for client in transport._clients.values():
+        client.fail = True
+    with pytest.raises(httpx.ConnectError):
+        transport.request("GET", "https://api.example/list")
+    assert transport.memory.snapshot() == {}
+
+
+def test_read_timeout_does_not_fall_back(transport):
+    class SlowClient(FakeClient):
+        def request(self, *args, **kwargs):
+            self.calls += 1
+            raise httpx.ReadTimeout("slow")
+
+    transport._clients["default"] = SlowClient()
+    with pytest.raises(httpx.ReadTimeout):
+        transport.request("GET", "https://api.example/list")
+    assert transport._clients["tls12_seclevel1"].calls == 0
+
+
+def test_reprobes_default_after_interval(monkeypatch):
+    monkeypatch.setattr(http_transport, "ENABLED_MODES", ("default", "tls12_seclevel1"))
+    memory = TlsModeMemory(reprobe_interval=0)
+    memory.remember("h", "tls12_seclevel1", probed=True)
+    assert memory.plan("h") == (["default", "tls12_seclevel1"], True)
+
+    memory = TlsModeMemory(reprobe_interval=600)
+    memory.remember("h", "tls12_seclevel1", probed=True)
+    assert memory.plan("h") == (["tls12_seclevel1", "default"], False)
+
+
+def test_race_closes_in_flight_loser(monkeypatch):
+    monkeypatch.setattr(http_transport, "RACE", True)
+    monkeypatch.setattr(http_transport, "RACE_STAGGER", 0)
+    monkeypatch.setattr(http_transport, "ENABLED_MODES", ("default", "tls12_seclevel1"))
+    release = threading.Event()
+    closed = threading.Event()
+
+    class Tracked(httpx.Response):
+        def close(self):
+            closed.set()
+            super().close()
+
+    class SlowClient(FakeClient):
+        def request(self, method, url, params=None, timeout=None):
+            release.wait(5)
+            return Tracked(200, request=httpx.Request(method, url), content=b"{}")
+
+    t = HttpTransport(memory=TlsModeMemory(reprobe_interval=600))
+    t._clients = {"default": SlowClient(), "tls12_seclevel1": FakeClient()}
+    mode, _ = t.request("GET", "https://api.example/list")
+    assert mode == "tls12_seclevel1"
+    release.set()
+    assert closed.wait(5)
@@ -0,0 +1,40 @@
+from keyword_matcher import KeywordMatcher, leftmost_longest
+
+
+def matcher(*keywords):
+    m = KeywordMatcher()
+    for keyword in keywords:
+        m.add(keyword, keyword)
+    return m
+
+
+def texts(text, matches):
+    return [text[start:end] for start, end, _ in matches]
+
+
+def test_find_all_reports_overlapping_matches():
+    text = "강원고성군"
+    found = matcher("강원", "고성", "고성군", "원고").find_all(text)
+    assert sorted(texts(text, found)) == ["강원", "고성", "고성군", "원고"]
+
+
+def test_leftmost_longest_prefers_longer_at_same_start():
+    text = "강원고성군 채용"
+    found = matcher("강원", "강원고성군", "고성", "채용").find_all(text)
+    assert texts(text, leftmost_longest(found)) == ["강원고성군", "채용"]
+
+
+def test_leftmost_longest_prefers_leftmost_over_longer_later():
+    text = "abcd"
+    found = matcher("ab", "bcd").find_all(text)
+    assert texts(text, leftmost_longest(found)) == ["ab"]
+
+
+def test_multiple_payloads_and_recompile():
+    m = KeywordMatcher()
+    m.add("주거", "policy")
+    m.add("주거", "realestate")
+    assert {payload for _, _, payload in m.find_all("주거 지원")} == {"policy", "realestate"}
+    m.add("지원", "policy")
+    assert len(m.find_all("주거 지원")) == 3
+    assert len(m) == 2
@@ -0,0 +1,77 @@
+import threading
+
+import httpx
+import pytest
+
+import http_transport
+import latency
+from latency import LatencyTracker, LatencyWindow
+
+URL = "https://api.example/list"
+
+
+def filled(tracker, seconds, n=latency.MIN_SAMPLES):
+    for _ in range(n):
+        tracker.record(URL, seconds)
+    return tracker
+
+
+def test_window_keeps_recent_samples_sorted():
+    window = LatencyWindow(size=4)
+    for seconds in (5.0, 1.0, 3.0, 2.0, 4.0):
+        window.add(seconds)
+    assert len(window) == 4
+    # 가장 오래된 5.0은 밀려남
+    assert window.percentile(0) == 1.0
+    assert window.percentile(99) == 4.0
+    assert LatencyWindow().percentile(50) is None
+
+
+def test_timeout_follows_observed_latency():
+    tracker = LatencyTracker()
+    assert tracker.timeout_for(URL).read == latency.MAX_TIMEOUT
+    filled(tracker, 3.0)
+    timeout = tracker.timeout_for(URL)
+    assert timeout.read == pytest.approx(3.0 * latency.READ_TIMEOUT_FACTOR)
+    assert timeout.connect == pytest.approx(4.5)
+    # 다른 엔드포인트는 따로 셈
+    assert tracker.timeout_for("https://api.example/other").read == latency.MAX_TIMEOUT
+
+
+def test_hedge_needs_samples_and_budget():
+    tracker = LatencyTracker(hedge=True, hedge_max_ratio=0.5)
+    assert tracker.hedge_delay(URL) is None
+    filled(tracker, 0.2)
+    assert tracker.hedge_delay(URL) == pytest.approx(0.2)
+    tracker.note_hedge()
+    assert tracker.hedge_delay(URL) == pytest.approx(0.2)
+    tracker.note_hedge()
+    # 요청 4회에 헤지 2회면 비율 상한(0.5)에 걸림
+    assert tracker.hedge_delay(URL) is None
+    assert LatencyTracker(hedge=False).hedge_delay(URL) is None
+
+
+def test_slow_request_is_hedged(monkeypatch):
+    monkeypatch.setattr(http_transport, "RACE", False)
+    release = threading.Event()
+    calls = []
+
+    class Client:
+        def request(self, method, url, params=None, timeout=None):
+            calls.append(1)
+            if len(calls) == 1:
+                release.wait(5)
+            return httpx.Response(200, request=httpx.Request(method, url), content=str(len(calls)).encode())
+
+    tracker = filled(LatencyTracker(hedge=True, hedge_max_ratio=1), 0.01)
+    transport = http_transport.HttpTransport(tracker=tracker)
+    transport._clients = {mode: Client() for mode in http_transport.ENABLED_MODES}
+    try:
+        with http_transport.count_sent() as sent:
+            _, resp = transport.get(URL)
+    finally:
+        release.set()
+    assert resp.content == b"2"
+    assert sent == [2]
+    snapshot = tracker.snapshot()
+    assert (snapshot["hedges"], snapshot["hedge_wins"]) == (1, 1)
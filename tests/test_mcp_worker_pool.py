@@ -0,0 +1,113 @@
+import os
+import textwrap
+
+import pytest
+from mcp.shared.exceptions import McpError
+from mcp.types import CallToolResult, ErrorData, TextContent
+
+import deadline
+import mcp_worker_pool
+from mcp_worker_pool import WorkerError, WorkerPool
+
+SRC = os.path.join(os.path.dirname(__file__), os.pardir, "src")
+
+FAKE_SERVER = textwrap.dedent("""
+    import os
+    import time
+
+    from mcp.server.fastmcp import FastMCP
+
+    import deadline
+    import mcp_common
+
+    mcp = FastMCP("fake")
+
+    @mcp.tool()
+    def echo(value: str) -> dict:
+        return {"value": value, "pid": os.getpid()}
+
+    @mcp.tool()
+    def budget() -> dict:
+        dl = mcp_common.request_deadline(mcp)
+        return {"remaining": None if dl is None else dl.remaining()}
+
+    @mcp.tool()
+    def slow(seconds: float) -> dict:
+        time.sleep(seconds)
+        return {"slept": seconds}
+
+    @mcp.tool()
+    def die() -> dict:
+        os._exit(3)
+
+    mcp.run()
+""")
+
+
+@pytest.fixture(scope="module")
+def pool(tmp_path_factory):
+    script = tmp_path_factory.mktemp("workers") / "fake_server.py"
+    script.write_text(FAKE_SERVER)
+    old = os.environ.get("PYTHONPATH")
+    os.environ["PYTHONPATH"] = os.path.abspath(SRC)
+    worker_pool = WorkerPool(servers={"fake": str(script)}, workers=2)
+    try:
+        worker_pool.list_tools("fake")
+        yield worker_pool
+    finally:
+        worker_pool.close()
+        if old is None:
+            os.environ.pop("PYTHONPATH", None)
+        else:
+            os.environ["PYTHONPATH"] = old
+
+
+def test_decode_prefers_structured_content():
+    structured = CallToolResult(content=[], structuredContent={"a": 1})
+    assert mcp_worker_pool._decode(structured) == {"a": 1}
+    text = CallToolResult(content=[TextContent(type="text", text='{"b": 2}')])
+    assert mcp_worker_pool._decode(text) == {"b": 2}
+    error = CallToolResult(content=[TextContent(type="text", text="boom")], isError=True)
+    with pytest.raises(RuntimeError, match="boom"):
+        mcp_worker_pool._decode(error)
+
+
+def test_fit_arguments_moves_extras_into_kwargs():
+    assert mcp_worker_pool._fit_arguments({"a", "kwargs"}, {"a": 1, "b": 2}) == {"a": 1, "kwargs": {"b": 2}}
+    assert mcp_worker_pool._fit_arguments({"a"}, {"a": 1, "b": 2}) == {"a": 1, "b": 2}
+
+
+def test_request_timeout_code_maps_to_deadline():
+    job = mcp_worker_pool._Job("slow", {}, 0.0, None)
+    timeout = McpError(ErrorData(code=mcp_worker_pool.REQUEST_TIMEOUT_CODE, message="timed out"))
+    assert isinstance(mcp_worker_pool._job_error("fake", job, timeout), deadline.DeadlineExceeded)
+    other = McpError(ErrorData(code=-32602, message="bad params"))
+    assert not isinstance(mcp_worker_pool._job_error("fake", job, other), deadline.DeadlineExceeded)
+
+
+def test_calls_run_in_worker_processes(pool):
+    assert {name for name, _ in pool.list_tools("fake")} == {"echo", "budget", "slow", "die"}
+    result = pool.call("fake", "echo", {"value": "hi"})
+    assert result["value"] == "hi" and result["pid"] != os.getpid()
+
+
+def test_deadline_travels_in_request_meta(pool):
+    with deadline.scope(deadline.Deadline(5)):
+        remaining = pool.call("fake", "budget")["remaining"]
+    assert remaining is not None and remaining <= 5 - mcp_worker_pool.DEADLINE_MARGIN
+    assert pool.call("fake", "budget")["remaining"] is not None
+
+
+def test_slow_call_times_out_without_killing_the_worker(pool):
+    with deadline.scope(deadline.Deadline(0.5)):
+        with pytest.raises(deadline.DeadlineExceeded):
+            pool.call("fake", "slow", {"seconds": 2})
+    assert pool.call("fake", "echo", {"value": "still up"})["value"] == "still up"
+
+
+def test_crashing_worker_is_restarted(pool):
+    restarts = pool.stats()["restarts"]["fake"]
+    with pytest.raises(WorkerError):
+        pool.call("fake", "die")
+    assert pool.stats()["restarts"]["fake"] > restarts
+    assert pool.call("fake", "echo", {"value": "back"})["value"] == "back"
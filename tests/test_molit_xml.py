@@ -0,0 +1,44 @@
+import xml.etree.ElementTree as ET
+
+import pytest
+
+import molit_xml
+
+TRADES_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<response>
+  <header><resultCode>000</resultCode><resultMsg>OK</resultMsg></header>
+  <body>
+    <items>
+      <item><aptNm>래미안</aptNm><dealAmount>  12,500</dealAmount><excluUseAr>84.97</excluUseAr>
+        <floor>7</floor><dealYear>2025</dealYear><dealMonth>3</dealMonth><dealDay>2</dealDay><sggCd>11110</sggCd></item>
+      <item><aptNm>자이</aptNm><dealAmount>9,800</dealAmount><excluUseAr></excluUseAr>
+        <floor>-1</floor><dealYear>2025</dealYear><dealMonth>3</dealMonth><dealDay>15</dealDay><sggCd>11110</sggCd></item>
+    </items>
+    <numOfRows>10</numOfRows><pageNo>1</pageNo><totalCount>2</totalCount>
+  </body>
+</response>""".encode("utf-8")
+
+
+def test_trade_parser_types_rows():
+    parsed = molit_xml.parse_trades([TRADES_XML])
+    assert parsed.total_count == 2
+    assert parsed.api_error is None
+    assert parsed.items[0] == {
+        "aptNm": "래미안", "dealAmount": 12500, "excluUseAr": 84.97, "floor": 7,
+        "dealYear": 2025, "dealMonth": 3, "dealDay": 2, "sggCd": "11110",
+    }
+    assert parsed.items[1]["excluUseAr"] is None
+    assert parsed.items[1]["floor"] == -1
+
+
+def test_trade_parser_accepts_split_chunks():
+    chunks = [TRADES_XML[i:i + 7] for i in range(0, len(TRADES_XML), 7)]
+    assert molit_xml.parse_trades(chunks).items == molit_xml.parse_trades([TRADES_XML]).items
+
+
+def test_trade_parser_reports_gateway_errors():
+    body = (b"<OpenAPI_ServiceResponse><cmmMsgHeader><errMsg>SERVICE ERROR</errMsg>"
+            b"<returnAuthMsg>SERVICE_KEY_IS_NOT_REGISTERED_ERROR</returnAuthMsg></cmmMsgHeader></OpenAPI_ServiceResponse>")
+    assert molit_xml.parse_trades([body]).api_error == "SERVICE_KEY_IS_NOT_REGISTERED_ERROR"
+    with pytest.raises(ET.ParseError):
+        molit_xml.parse_trades([b'{"error": "not xml"}'])
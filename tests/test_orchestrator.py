@@ -0,0 +1,135 @@
+import time
+import types
+
+import pytest
+from mcp.server.fastmcp import FastMCP
+
+import deadline
+import enhanced_orchestrator
+import mcp_common
+from enhanced_orchestrator import EnhancedOrchestrator, ToolEntry
+
+
+def entry(fn):
+    return ToolEntry(fn, False, fn.__name__)
+
+
+def quota_tool(exhausted=(), delay=0.0):
+    def quotaStatus():
+        time.sleep(delay)
+        return {"status": "ok", "quota": {"exhausted_endpoints": list(exhausted)}}
+    return entry(quotaStatus)
+
+
+def sleeper(seconds, seen=None):
+    def slow(**arguments):
+        if seen is not None:
+            seen.append(deadline.remaining())
+        time.sleep(seconds)
+        return {"status": "ok", "arguments": arguments}
+    return entry(slow)
+
+
+@pytest.fixture
+def orchestrator(monkeypatch):
+    orch = EnhancedOrchestrator(mode="inprocess")
+    # 가짜 디스패치 표만 쓰고 실제 서버 모듈은 읽지 않음
+    monkeypatch.setattr(orch, "server_module", lambda name: pytest.fail(f"imported {name}"))
+    orch._tools = {name: {} for name in orch.servers}
+    return orch
+
+
+def test_fan_out_budget_starts_at_worker_pickup(orchestrator):
+    seen = []
+    orchestrator._tools["recruitment"]["slow"] = sleeper(0.3, seen)
+    calls = [("recruitment", "slow", {"i": i}) for i in range(2 * enhanced_orchestrator.FANOUT_WORKERS)]
+    start = time.monotonic()
+    results = orchestrator.call_many(calls, call_timeout=0.5)
+    assert [r["status"] for r in results] == ["success"] * len(calls)
+    # 뒤에 집어 든 조회도 기다린 시간을 빼지 않은 상한을 받음
+    assert min(seen) > 0.4
+    assert time.monotonic() - start < 1.0
+
+
+def test_slow_domain_times_out_alone(orchestrator, monkeypatch):
+    monkeypatch.setattr(enhanced_orchestrator, "FANOUT_GRACE", 0.05)
+    orchestrator._tools["recruitment"]["slow"] = sleeper(0.6)
+    orchestrator._tools["realestate"]["fast"] = sleeper(0)
+    slow, fast = orchestrator.call_many(
+        [("recruitment", "slow", {}), ("realestate", "fast", {})], call_timeout=0.2
+    )
+    assert slow["status"] == "timeout"
+    assert fast["status"] == "success"
+
+
+def test_region_analysis_checks_quota_concurrently_and_skips_exhausted(orchestrator):
+    orchestrator._tools["recruitment"].update(quotaStatus=quota_tool(delay=0.2), listRecruitments=sleeper(0))
+    orchestrator._tools["realestate"].update(
+        quotaStatus=quota_tool([enhanced_orchestrator.APT_TRADE_ENDPOINT], delay=0.2),
+        getApartmentTrades=sleeper(0),
+    )
+    orchestrator._tools["youth_policy"].update(
+        quotaStatus=quota_tool(delay=0.2), searchPoliciesByRegion=sleeper(0), searchPoliciesByKeywords=sleeper(0)
+    )
+    start = time.monotonic()
+    results = orchestrator.comprehensive_region_analysis("11110", deadline=deadline.Deadline(5))
+    assert time.monotonic() - start < 0.5
+    assert results["apartment_trades"]["status"] == "skipped"
+    assert {results[k]["status"] for k in ("recruitment", "youth_policies", "youth_specific_policies")} == {"success"}
+
+
+def test_build_dispatch_prefers_sync_twin():
+    mcp = FastMCP("fake")
+    calls = []
+
+    def call(**kwargs):
+        calls.append(kwargs)
+        return {"status": "ok", "items": [kwargs]}
+
+    async def call_async(**kwargs):
+        raise AssertionError("async path used")
+
+    @mcp_common.twin_tool(mcp, call, call_async)
+    def lookup(code: str):
+        """코드 조회
+        - code: 코드
+        """
+        return dict(code=code)
+
+    @mcp_common.threaded_tool(mcp)
+    def local(q: str):
+        """로컬 검색"""
+        return {"status": "ok", "q": q}
+
+    dispatch = enhanced_orchestrator.build_dispatch(types.SimpleNamespace(mcp=mcp))
+    assert list(dispatch) == ["lookup", "local"]
+    assert dispatch["lookup"].description == "코드 조회"
+    assert dispatch["lookup"](code="A")["items"] == [{"code": "A"}]
+    assert dispatch["local"](q="x") == {"status": "ok", "q": "x"}
+    assert calls == [{"code": "A"}]
+
+
+def test_call_many_dedupes_and_keeps_order(orchestrator):
+    counted = []
+
+    def echo(**arguments):
+        counted.append(arguments)
+        return {"status": "ok", **arguments}
+
+    orchestrator._tools["recruitment"]["echo"] = entry(echo)
+    results = orchestrator.call_many([
+        ("recruitment", "echo", {"a": 1, "b": 2}),
+        {"server": None, "tool": "echo", "arguments": {"b": 2, "a": 1}},
+        ("recruitment", "echo", {"a": 3}),
+    ])
+    assert [r["result"]["a"] for r in results] == [1, 1, 3]
+    assert len(counted) == 2
+
+
+def test_unknown_and_ambiguous_tools(orchestrator):
+    for name in orchestrator.servers:
+        orchestrator._tools[name]["ping"] = sleeper(0)
+    ambiguous, unknown = orchestrator.call_many([(None, "ping", {}), ("realestate", "nope", {})])
+    assert ambiguous["status"] == "error" and "서버를 지정" in ambiguous["message"]
+    assert unknown["status"] == "error" and "알 수 없는 도구" in unknown["message"]
+    assert orchestrator.call_tool("realestate", "ping")["status"] == "success"
@@ -0,0 +1,88 @@
+import asyncio
+
+import pagination
+from pagination import PageStats
+
+
+def source(total, page_size, report_total=True, fail=()):
+    """1..total 번호를 page_size씩 나눠 주는 목록 API 흉내."""
+    calls = []
+
+    def page_result(page):
+        calls.append(page)
+        if page in fail:
+            return {"status": "error", "message": f"page {page} failed"}
+        start = (page - 1) * page_size
+        items = list(range(start + 1, min(total, start + page_size) + 1))
+        result = {"status": "ok", "items": items}
+        if report_total:
+            result["total_count"] = total
+        return result
+
+    return page_result, calls
+
+
+def extract(result):
+    return result["items"]
+
+
+def test_iterate_yields_every_record_in_page_order():
+    fetch, calls = source(23, 5)
+    stats = PageStats()
+    assert list(pagination.iterate(fetch, extract, 5, stats=stats)) == list(range(1, 24))
+    assert sorted(calls) == [1, 2, 3, 4, 5]
+    assert (stats.total_count, stats.pages, stats.records) == (23, 5, 23)
+    assert stats.complete
+
+
+def test_iterate_without_total_stops_at_short_page():
+    fetch, calls = source(12, 5, report_total=False)
+    stats = PageStats()
+    assert list(pagination.iterate(fetch, extract, 5, stats=stats)) == list(range(1, 13))
+    assert calls == [1, 2, 3]
+    assert stats.complete
+
+
+def test_iterate_stops_at_max_records():
+    fetch, _ = source(100, 10)
+    stats = PageStats()
+    assert list(pagination.iterate(fetch, extract, 10, max_records=15, stats=stats)) == list(range(1, 16))
+    assert stats.records == 15
+    assert not stats.complete
+
+
+def test_failed_page_is_skipped_and_reported():
+    fetch, _ = source(20, 5, fail={3})
+    result = pagination.collect(fetch, extract, 5)
+    assert result["status"] == "partial"
+    assert result["items"] == [*range(1, 11), *range(16, 21)]
+    assert result["errors"] == [{"page": 3, "message": "page 3 failed"}]
+    assert not result["complete"]
+
+
+def test_max_pages_truncates(monkeypatch):
+    monkeypatch.setattr(pagination, "MAX_PAGES", 2)
+    fetch, calls = source(50, 10)
+    result = pagination.collect(fetch, extract, 10)
+    assert result["status"] == "partial" and result["truncated"]
+    assert result["items"] == list(range(1, 21))
+    assert sorted(calls) == [1, 2]
+
+
+def test_aiterate_matches_iterate():
+    fetch, _ = source(23, 5)
+
+    async def fetch_async(page):
+        await asyncio.sleep(0)
+        return fetch(page)
+
+    result = asyncio.run(pagination.collect_async(fetch_async, extract, 5))
+    assert result["status"] == "ok" and result["complete"]
+    assert result["items"] == list(range(1, 24))
+
+
+def test_total_count_sources():
+    assert pagination.total_count({"total_count": "7"}) == 7
+    assert pagination.total_count({"data": {"result": {"pagging": {"totCount": 4}}}}) == 4
+    assert pagination.total_count({"text": "<totalCount> 12 </totalCount>"}) == 12
+    assert pagination.total_count({"data": {"totalCount": ""}}) is None
@@ -0,0 +1,63 @@
+import policy_index
+from policy_index import PolicyIndex
+
+
+def policy(no, name, keywords="", body="", zip_cd="", apply_period=""):
+    return {"plcyNo": no, "plcyNm": name, "plcyKywdNm": keywords, "plcyExplnCn": body,
+            "zipCd": zip_cd, "aplyYmd": apply_period}
+
+
+def test_tokenize_bigrams():
+    assert policy_index.tokenize("청년 월세지원") == ["청년", "월세", "세지", "지원"]
+    assert policy_index.tokenize("IT, 창업") == ["it", "창업"]
+
+
+def test_title_match_ranks_above_body_match():
+    index = PolicyIndex(path=None)
+    index.add_many([
+        policy("1", "청년 월세 지원", body="주거비를 돕습니다"),
+        policy("2", "창업 자금", body="월세 부담이 있는 청년 창업가"),
+        policy("3", "문화 바우처", body="공연 관람"),
+    ])
+    total, hits = index.search("월세", today="20250101")
+    assert total == 2
+    assert [p["plcyNo"] for _, p in hits] == ["1", "2"]
+    assert hits[0][0] > hits[1][0]
+
+
+def test_rare_terms_weigh_more():
+    index = PolicyIndex(path=None)
+    index.add_many([policy(str(i), f"청년 지원 {i}") for i in range(5)] + [policy("x", "청년 귀농 지원")])
+    _, hits = index.search("청년 귀농", today="20250101")
+    assert hits[0][1]["plcyNo"] == "x"
+
+
+def test_region_and_closed_filters():
+    index = PolicyIndex(path=None)
+    index.add_many([
+        policy("1", "청년 주거", zip_cd="51150,51170", apply_period="20250101 ~ 20251231"),
+        policy("2", "청년 주거", zip_cd="11110", apply_period="20240101 ~ 20240301"),
+    ])
+    assert index.search("주거", region_code="51150", today="20250601")[0] == 1
+    assert index.search("주거", today="20250601")[0] == 1
+    assert index.search("주거", today="20250601", include_closed=True)[0] == 2
+
+
+def test_readding_changed_policy_replaces_terms():
+    index = PolicyIndex(path=None)
+    assert index.add(policy("1", "청년 월세"))
+    assert not index.add(policy("1", "청년 월세"))
+    assert index.add(policy("1", "청년 창업"))
+    assert len(index) == 1
+    assert index.search("월세", today="20250101")[0] == 0
+    assert index.search("창업", today="20250101")[0] == 1
+
+
+def test_save_and_load_round_trip(tmp_path):
+    path = str(tmp_path / "index.bin")
+    index = PolicyIndex(path=path)
+    index.add_many([policy("1", "청년 월세 지원")])
+    index.save()
+    loaded = PolicyIndex(path=path)
+    assert len(loaded) == 1
+    assert loaded.search("월세", today="20250101")[1][0][1]["plcyNm"] == "청년 월세 지원"
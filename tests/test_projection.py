@@ -0,0 +1,59 @@
+import json
+
+import projection
+
+RESULT = {
+    "status": "ok",
+    "request_url": "https://api.example/list",
+    "ssl_mode": "default",
+    "total_count": 2,
+    "items": [{"aptNm": "a", "dealAmount": 1, "floor": 3}, {"aptNm": "b", "dealAmount": 2, "floor": 4}],
+}
+
+
+def test_no_options_returns_result_unchanged():
+    assert projection.project(RESULT) is RESULT
+
+
+def test_fields_keep_only_requested_columns():
+    shaped = projection.project(RESULT, fields=["aptNm", "missing"])
+    assert shaped["items"] == [{"aptNm": "a"}, {"aptNm": "b"}]
+    assert shaped["request_url"] == RESULT["request_url"]
+
+
+def test_compact_drops_transport_metadata():
+    shaped = projection.project(RESULT, compact=True)
+    assert shaped == {"status": "ok", "total_count": 2, "items": RESULT["items"]}
+
+
+def test_errors_are_not_shaped():
+    error = {"status": "error", "message": "x", "items": []}
+    assert projection.project(error, fields=["a"], compact=True) is error
+
+
+def test_policies_fields_drop_raw_duplicate_only_when_shaping():
+    policies = [{"plcyNo": "1", "plcyNm": "n", "plcyExplnCn": "long"}]
+    result = {
+        "status": "ok",
+        "policies": policies,
+        "data": {"resultCode": 200, "result": {"pagging": {"totCount": 1}, "youthPolicyList": policies}},
+    }
+    assert projection.project(result) is result
+    shaped = projection.project(result, fields=["plcyNm"])
+    assert shaped["policies"] == [{"plcyNm": "n"}]
+    assert shaped["data"]["result"] == {"pagging": {"totCount": 1}}
+    assert result["data"]["result"]["youthPolicyList"] is policies
+
+    compact = projection.project(result, compact=True)
+    assert compact["items"] == policies and compact["total_count"] == 1
+
+
+def test_raw_data_result_list_is_located():
+    result = {"status": "ok", "data": {"totalCount": 1, "result": [{"a": 1, "b": 2}]}}
+    assert projection.project(result, fields=["a"])["data"]["result"] == [{"a": 1}]
+
+
+def test_for_mcp_compact_is_json_text():
+    text = projection.for_mcp(RESULT, fields=["aptNm"], compact=True)
+    assert json.loads(text) == {"status": "ok", "total_count": 2, "items": [{"aptNm": "a"}, {"aptNm": "b"}]}
+    assert " " not in text
@@ -0,0 +1,124 @@
+import httpx
+import pytest
+
+import http_transport
+import mcp_common
+import quota
+from quota import KeyPool, QuotaExhausted, QuotaStore, RateLimited, TokenBucket
+
+
+class Resp:
+    def __init__(self, content: bytes):
+        self.content = content
+
+
+@pytest.fixture
+def store(tmp_path):
+    return QuotaStore(str(tmp_path / "quota.sqlite"), flush_interval=0)
+
+
+def pool(store, keys=("k1", "k2"), daily_quota=100, rate=1000.0):
+    return KeyPool("svc", list(keys), daily_quota, rate_per_key=rate, rate_per_endpoint=rate, store=store)
+
+
+def test_token_bucket_burst_and_refund(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(quota.time, "monotonic", lambda: now[0])
+    bucket = TokenBucket(rate=2, burst=2)
+    assert bucket.take() and bucket.take()
+    assert not bucket.take()
+    assert bucket.delay() == pytest.approx(0.5)
+    now[0] += 0.5
+    assert bucket.take()
+    bucket.refund()
+    assert bucket.take()
+
+
+def test_keys_rotate_round_robin(store):
+    keys = pool(store)
+    picked = [keys.acquire("list") for _ in range(4)]
+    assert sorted(picked) == ["k1", "k1", "k2", "k2"]
+    usage = store.usage("svc", quota.today())
+    assert usage[(quota.key_id("k1"), "list")] == 2
+
+
+def test_exhausted_key_is_skipped(store):
+    keys = pool(store)
+    keys.mark_exhausted("k1", "list")
+    assert {keys.acquire("list") for _ in range(3)} == {"k2"}
+    keys.mark_exhausted("k2", "list")
+    with pytest.raises(QuotaExhausted):
+        keys.acquire("list")
+    assert keys.status()["exhausted_endpoints"] == ["list"]
+
+
+def test_send_retries_on_in_body_quota_error(store):
+    keys = pool(store)
+    seen = []
+
+    def request(key):
+        seen.append(key)
+        if len(seen) == 1:
+            return "default", Resp(b"<returnAuthMsg>LIMITED_NUMBER_OF_SERVICE_REQUESTS_EXCEEDS_ERROR</returnAuthMsg>")
+        return "default", Resp(b"ok")
+
+    mode, resp = keys.send("list", request)
+    assert resp.content == b"ok"
+    assert len(seen) == 2 and seen[0] != seen[1]
+    assert keys.status()["exhausted_endpoints"] == []
+
+
+def test_send_gives_up_when_every_key_is_exhausted(store):
+    keys = pool(store)
+    with pytest.raises(QuotaExhausted):
+        keys.send("list", lambda key: ("default", Resp(b"LIMITED NUMBER OF SERVICE REQUESTS")))
+
+
+def test_rate_limit_without_tokens(store):
+    keys = pool(store, keys=("k1",), rate=0.001)
+    keys.acquire("list")
+    with pytest.raises(RateLimited) as info:
+        keys.acquire("list", max_wait=0.01)
+    error = mcp_common.quota_error("https://api.example/list", info.value)
+    assert error["rate_limited"] and "quota_exhausted" not in error
+    assert keys.status()["exhausted_endpoints"] == []
+
+
+def test_send_counts_retries_as_calls(store, monkeypatch):
+    statuses = [503, 503, 200]
+
+    class FlakyClient:
+        def request(self, method, url, params=None, timeout=None):
+            return httpx.Response(statuses.pop(0), request=httpx.Request(method, url), content=b"{}")
+
+    monkeypatch.setattr(http_transport, "RACE", False)
+    monkeypatch.setattr(http_transport.resilience, "backoff_delay", lambda attempt: 0)
+    transport = http_transport.HttpTransport(retries=2)
+    transport._clients = {mode: FlakyClient() for mode in http_transport.ENABLED_MODES}
+    keys = pool(store, keys=("k1",))
+    _, resp = keys.send("list", lambda key: transport.get("https://api.example/list"))
+    assert resp.status_code == 200
+    assert store.usage("svc", quota.today()) == {(quota.key_id("k1"), "list"): 3}
+
+
+def test_store_opens_on_first_acquire(monkeypatch, tmp_path):
+    opened = []
+
+    def get_store():
+        opened.append(1)
+        return QuotaStore(str(tmp_path / "lazy.sqlite"), flush_interval=0)
+
+    monkeypatch.setattr(quota, "get_store", get_store)
+    keys = KeyPool("svc", ["k1"], 10, rate_per_key=100, rate_per_endpoint=100)
+    assert opened == []
+    keys.acquire("list")
+    assert opened == [1]
+
+
+def test_flush_persists_counts(tmp_path):
+    path = str(tmp_path / "quota.sqlite")
+    first = QuotaStore(path, flush_interval=0)
+    first.add("svc", "kid", "list", "20250101", 3)
+    first.flush()
+    second = QuotaStore(path, flush_interval=0)
+    assert second.usage("svc", "20250101") == {("kid", "list"): 3}
@@ -0,0 +1,117 @@
+import pytest
+
+import pagination
+import recruitment_mirror
+from recruitment_mirror import RecruitmentMirror
+
+
+def posting(sn, end="29991231", bgng="20250101", **extra):
+    return {
+        "recrutPblntSn": sn, "recrutPbancTtl": f"공고 {sn}", "instNm": "기관",
+        "pbancBgngYmd": bgng, "pbancEndYmd": end, "workRgnLst": "R3010", "hireTypeLst": "R1010", **extra,
+    }
+
+
+def lister(postings, page_errors=()):
+    """목록 API 흉내: 총 건수와 페이지 단위 결과. page_errors의 페이지는 오류."""
+    requested = []
+
+    def list_page(page, num_rows, filters):
+        requested.append((page, dict(filters)))
+        if page in page_errors:
+            return {"status": "error", "message": "upstream down"}
+        start = (page - 1) * num_rows
+        return {"status": "ok", "data": {"totalCount": len(postings), "result": postings[start:start + num_rows]}}
+
+    list_page.requested = requested
+    return list_page
+
+
+def records(result):
+    return result["data"]["result"]
+
+
+@pytest.fixture
+def mirror(tmp_path, monkeypatch):
+    monkeypatch.setattr(recruitment_mirror, "SYNC_PAGE_ROWS", 2)
+    return RecruitmentMirror(str(tmp_path / "mirror.sqlite"))
+
+
+def test_full_sync_then_unchanged(mirror):
+    postings = [posting(str(i)) for i in range(5)]
+    result = mirror.sync(lister(postings), records, full=True)
+    assert result["status"] == "ok"
+    assert (result["inserted"], result["pages"]) == (5, 3)
+
+    result = mirror.sync(lister(postings), records, full=True, force=True)
+    assert (result["inserted"], result["updated"], result["unchanged"]) == (0, 0, 5)
+
+
+def test_recent_sync_is_skipped(mirror):
+    mirror.sync(lister([posting("1")]), records, full=True)
+    assert mirror.sync(lister([posting("1")]), records)["skipped"] is True
+
+
+def test_delta_sync_asks_only_for_recent_postings(mirror, monkeypatch):
+    mirror.sync(lister([posting("1", bgng="20250110")]), records, full=True)
+    list_page = lister([posting("1", bgng="20250110"), posting("2", bgng="20250111")])
+    result = mirror.sync(list_page, records, force=True)
+    assert result["mode"] == "delta"
+    assert result["since"] == "20250107"
+    assert list_page.requested[0][1][recruitment_mirror.SINCE_PARAM] == "20250107"
+    assert result["inserted"] == 1
+
+
+def test_invalid_start_date_falls_back_to_full_sync(mirror):
+    mirror.sync(lister([posting("1", bgng="20251399")]), records, full=True)
+    assert mirror.plan() == (True, None)
+    result = mirror.sync(lister([posting("1", bgng="20251399")]), records, force=True)
+    assert result["status"] == "ok"
+    assert result["mode"] == "full"
+
+
+def test_complete_full_sync_prunes_missing(mirror):
+    mirror.sync(lister([posting(str(i)) for i in range(4)]), records, full=True)
+    result = mirror.sync(lister([posting("0"), posting("1")]), records, full=True, force=True)
+    assert result["removed"] == 2
+    assert mirror.stats()["postings"] == 2
+
+
+def test_failed_page_does_not_prune(mirror):
+    mirror.sync(lister([posting(str(i)) for i in range(4)]), records, full=True)
+    result = mirror.sync(lister([posting(str(i)) for i in range(4)], page_errors={2}), records, full=True, force=True)
+    assert result["status"] == "partial"
+    assert result["removed"] == 0
+    assert mirror.stats()["postings"] == 4
+
+
+def test_truncated_walk_does_not_prune(mirror, monkeypatch):
+    mirror.sync(lister([posting(str(i)) for i in range(6)]), records, full=True)
+    monkeypatch.setattr(pagination, "MAX_PAGES", 1)
+    result = mirror.sync(lister([posting(str(i)) for i in range(6)]), records, full=True, force=True)
+    assert result["status"] == "partial"
+    assert result["truncated"] is True
+    assert result["removed"] == 0
+    assert mirror.stats()["postings"] == 6
+
+
+def test_expired_postings_are_dropped(mirror):
+    result = mirror.sync(lister([posting("old", end="20000101"), posting("new")]), records, full=True)
+    assert result["expired"] == 1
+    assert mirror.stats()["postings"] == 1
+
+
+def test_query_filters_by_codes_and_keyword(mirror):
+    mirror.sync(lister([
+        posting("1", workRgnLst="R3010,R3018"),
+        posting("2", workRgnLst="R3011", hireTypeLst="R1040"),
+        posting("3", recrutPbancTtl="연구원 채용"),
+    ]), records, full=True)
+    total, rows = mirror.query({"workRgnLst": "R3018,R3011"})
+    assert total == 2 and {r["recrutPblntSn"] for r in rows} == {"1", "2"}
+    total, _ = mirror.query({"workRgnLst": "R3010", "hireTypeLst": "R1040"})
+    assert total == 0
+    total, rows = mirror.query(keyword="연구원")
+    assert [r["recrutPblntSn"] for r in rows] == ["3"]
+    with pytest.raises(ValueError):
+        mirror.query({"unknown": "x"})
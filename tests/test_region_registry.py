@@ -0,0 +1,40 @@
+import pytest
+
+import region_registry
+
+
+@pytest.fixture(scope="module")
+def registry():
+    return region_registry.get_registry()
+
+
+def test_resolve_by_code_and_name(registry):
+    assert registry.resolve("51150").code == "51150"
+    assert registry.resolve("강릉").code == "51150"
+    assert registry.resolve("강릉시").code == "51150"
+
+
+def test_same_name_needs_sido(registry):
+    assert registry.resolve("고성") is None
+    assert [r.code for r in registry.candidates("고성")] == ["48820", "51820"]
+    assert registry.resolve("강원 고성").code == "51820"
+    assert registry.resolve("경남고성군").code == "48820"
+    assert registry.get("48820").label == "경상남도 고성군"
+
+
+def test_find_in_text_guards_common_words(registry):
+    assert registry.find_in_text("강릉시 통신 일자리") == "51150"
+    assert registry.find_in_text("충남 예산 주거 지원") == "44810"
+    # '예산 지원'의 예산은 지역이 아님
+    assert registry.find_in_text("예산 지원 정책") is None
+
+
+def test_city_children(registry):
+    assert registry.get("41111").parent == "41110"
+    assert "41111" in registry.children("41110")
+
+
+def test_relevance_ranks(registry):
+    assert registry.relevance("51150", ["강릉시"]) == region_registry.RANK_SIGUNGU
+    assert registry.relevance("51150", ["강원특별자치도"]) == region_registry.RANK_SIDO
+    assert registry.relevance("51150", ["서울특별시"]) == region_registry.NO_MATCH
@@ -0,0 +1,63 @@
+import pytest
+
+from resilience import CLOSED, HALF_OPEN, OPEN, BreakerRegistry, CircuitBreaker, CircuitOpenError
+
+
+def test_opens_after_threshold_failures():
+    breaker = CircuitBreaker("t", failure_threshold=2, reset_timeout=60)
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_success_resets_failure_count():
+    breaker = CircuitBreaker("t", failure_threshold=2, reset_timeout=60)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+
+
+def test_half_open_allows_limited_probes():
+    breaker = CircuitBreaker("t", failure_threshold=1, reset_timeout=0, half_open_probes=1)
+    breaker.record_failure()
+    assert breaker.state == HALF_OPEN
+    breaker.before_call()
+    # probe 자리는 하나뿐
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_half_open_probe_result_closes_or_reopens():
+    breaker = CircuitBreaker("t", failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+
+    breaker = CircuitBreaker("t", failure_threshold=5, reset_timeout=60)
+    for _ in range(5):
+        breaker.record_failure()
+    breaker.reset_timeout = 0
+    breaker.before_call()
+    breaker.reset_timeout = 60
+    breaker.record_failure()
+    assert breaker.state == OPEN
+
+
+def test_release_returns_probe_slot():
+    breaker = CircuitBreaker("t", failure_threshold=1, reset_timeout=0, half_open_probes=1)
+    breaker.record_failure()
+    breaker.before_call()
+    breaker.release()
+    breaker.before_call()
+
+
+def test_registry_is_per_host_and_path():
+    registry = BreakerRegistry()
+    assert registry.get("https://a.example/list?x=1") is registry.get("https://a.example/list/")
+    assert registry.get("https://a.example/list") is not registry.get("https://a.example/detail")
+    assert registry.get("https://a.example/list") is not registry.get("https://b.example/list")
@@ -0,0 +1,90 @@
+from datetime import date, datetime
+
+import response_cache
+from response_cache import ResponseCache
+
+
+def test_fingerprint_ignores_keys_order_and_none():
+    a = response_cache.fingerprint("https://api.example/list/", {"pageNo": 1, "serviceKey": "k1", "x": None})
+    b = response_cache.fingerprint("https://api.example/list", {"apiKeyNm": "k2", "pageNo": "1"})
+    assert a == b
+    assert a != response_cache.fingerprint("https://api.example/list", {"pageNo": 2})
+
+
+def test_closed_month_after_report_grace():
+    assert response_cache.is_closed_month("202501", today=date(2025, 3, 3))
+    assert not response_cache.is_closed_month("202501", today=date(2025, 3, 2))
+    assert not response_cache.is_closed_month("202513")
+    assert not response_cache.is_closed_month("2025")
+
+
+def test_month_ttl(monkeypatch):
+    assert response_cache.month_ttl("200001") == response_cache.CLOSED_MONTH_TTL
+    assert response_cache.month_ttl("200001", closed_ttl=None) is None
+    assert response_cache.month_ttl(date.today().strftime("%Y%m")) == response_cache.OPEN_MONTH_TTL
+
+
+def test_ttl_until_earliest_skips_past_dates():
+    today = datetime.now().strftime("%Y%m%d")
+    ttl = response_cache.ttl_until_earliest(["19990101", today, None], default_ttl=10 ** 9)
+    assert 0 < ttl <= 24 * 3600
+    assert response_cache.ttl_until_earliest(["19990101"], default_ttl=42) == 42
+
+
+def test_apply_period_end():
+    assert response_cache.apply_period_end("20250101 ~ 20251231") == "20251231"
+    assert response_cache.apply_period_end("") is None
+
+
+def test_entries_expire(monkeypatch):
+    cache = ResponseCache()
+    now = [1000.0]
+    monkeypatch.setattr(response_cache.time, "time", lambda: now[0])
+    cache.set("k", {"status": "ok"}, ttl=10)
+    assert cache.get("k") == {"status": "ok"}
+    now[0] += 11
+    assert cache.get("k") is None
+    assert cache.expirations == 1
+
+
+def test_lru_eviction_and_no_store():
+    cache = ResponseCache(max_entries=2)
+    cache.set("a", {"v": 1}, ttl=None)
+    cache.set("b", {"v": 2}, ttl=None)
+    cache.get("a")
+    cache.set("c", {"v": 3}, ttl=None)
+    assert cache.get("b") is None
+    assert cache.get("a") == {"v": 1}
+    cache.set("d", {"v": 4}, ttl=0)
+    assert cache.get("d") is None
+
+
+def test_cached_call_skips_errors_and_quota():
+    cache = ResponseCache()
+    calls = []
+
+    def fetch(result):
+        def _fetch():
+            calls.append(result)
+            return result
+        return _fetch
+
+    for result in ({"status": "error"}, {"status": "ok", "quota_exhausted": True}, {"status": "ok", "api_error": "x"}):
+        cache.cached_call("k", fetch(result), lambda r: 60)
+        cache.cached_call("k", fetch(result), lambda r: 60)
+    assert len(calls) == 6
+
+    cache.cached_call("ok", fetch({"status": "ok"}), lambda r: 60)
+    assert cache.cached_call("ok", fetch({"status": "ok"}), lambda r: 60)["cache"] == "hit"
+
+
+def test_callers_cannot_corrupt_cached_entries():
+    cache = ResponseCache()
+    fetched = {"status": "ok", "items": [{"v": 2}, {"v": 1}]}
+    first = cache.cached_call("k", lambda: fetched, lambda r: 60)
+    first["items"].sort(key=lambda r: r["v"])
+    fetched["items"].clear()
+    hit = cache.cached_call("k", lambda: fetched, lambda r: 60)
+    assert hit["items"] == [{"v": 2}, {"v": 1}]
+    hit["items"].pop()
+    assert cache.cached_call("k", lambda: fetched, lambda r: 60)["items"] == [{"v": 2}, {"v": 1}]
@@ -0,0 +1,179 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+import deadline
+from singleflight import SingleFlight
+
+
+def test_concurrent_calls_share_one_fetch():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def fn():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return {"v": 1}
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.do("k", fn)))
+    leader.start()
+    started.wait(5)
+    followers = [threading.Thread(target=lambda: results.append(flight.do("k", fn))) for _ in range(3)]
+    for t in followers:
+        t.start()
+    while flight.stats()["coalesced"] < 3:
+        time.sleep(0.01)
+    release.set()
+    for t in [leader, *followers]:
+        t.join(5)
+
+    assert len(calls) == 1
+    assert sorted(shared for _, shared in results) == [False, True, True, True]
+    assert all(value == {"v": 1} for value, _ in results)
+    assert flight.stats() == {"in_flight": 0, "leaders": 1, "coalesced": 3}
+
+
+def test_exception_reaches_followers():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+
+    def fn():
+        started.set()
+        release.wait(5)
+        raise ValueError("boom")
+
+    errors = []
+
+    def call():
+        try:
+            flight.do("k", fn)
+        except ValueError as e:
+            errors.append(str(e))
+
+    threads = [threading.Thread(target=call)]
+    threads[0].start()
+    started.wait(5)
+    threads.append(threading.Thread(target=call))
+    threads[1].start()
+    while flight.stats()["coalesced"] < 1:
+        time.sleep(0.01)
+    release.set()
+    for t in threads:
+        t.join(5)
+    assert errors == ["boom", "boom"]
+
+
+def test_follower_gives_up_at_deadline():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+
+    def fn():
+        started.set()
+        release.wait(5)
+        return 1
+
+    leader = threading.Thread(target=flight.do, args=("k", fn))
+    leader.start()
+    started.wait(5)
+    try:
+        with deadline.scope(deadline.Deadline(0.05)):
+            with pytest.raises(deadline.DeadlineExceeded):
+                flight.do("k", fn)
+    finally:
+        release.set()
+        leader.join(5)
+
+
+def test_async_calls_share_one_task():
+    flight = SingleFlight()
+    calls = []
+
+    async def fn():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "v"
+
+    async def main():
+        return await asyncio.gather(*(flight.do_async("k", fn) for _ in range(4)))
+
+    results = asyncio.run(main())
+    assert len(calls) == 1
+    assert [value for value, _ in results] == ["v"] * 4
+    assert sorted(shared for _, shared in results) == [False, True, True, True]
+
+
+def test_follower_retries_when_leader_ran_out_of_time():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def fn():
+        calls.append(1)
+        if len(calls) == 1:
+            started.set()
+            release.wait(5)
+            raise deadline.DeadlineExceeded("leader budget")
+        return "fresh"
+
+    errors = []
+
+    def lead():
+        with deadline.scope(deadline.Deadline(0.01)):
+            try:
+                flight.do("k", fn)
+            except deadline.DeadlineExceeded as e:
+                errors.append(str(e))
+
+    leader = threading.Thread(target=lead)
+    leader.start()
+    started.wait(5)
+    results = []
+    follower = threading.Thread(target=lambda: results.append(flight.do("k", fn)))
+    follower.start()
+    while flight.stats()["coalesced"] < 1:
+        time.sleep(0.01)
+    release.set()
+    leader.join(5)
+    follower.join(5)
+
+    assert errors == ["leader budget"]
+    assert results == [("fresh", False)]
+    assert len(calls) == 2
+
+
+def test_async_follower_retries_when_leader_ran_out_of_time():
+    flight = SingleFlight()
+    calls = []
+
+    async def fn():
+        calls.append(1)
+        if len(calls) == 1:
+            await asyncio.sleep(0.05)
+            raise deadline.DeadlineExceeded("leader budget")
+        return "fresh"
+
+    async def lead():
+        with deadline.scope(deadline.Deadline(0.01)):
+            with pytest.raises(deadline.DeadlineExceeded):
+                await flight.do_async("k", fn)
+
+    async def follow():
+        await asyncio.sleep(0)
+        with deadline.scope(deadline.Deadline(5)):
+            return await flight.do_async("k", fn)
+
+    async def main():
+        _, followed = await asyncio.gather(lead(), follow())
+        return followed
+
+    assert asyncio.run(main()) == ("fresh", False)
+    assert len(calls) == 2
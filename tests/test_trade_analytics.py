@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+import realestate_server as realestate
+import trade_analytics
+from trade_analytics import TradeFrame
+
+
+def trade(sgg, month, amount, area=84.0, build_year=2015):
+    return {
+        "sggCd": sgg, "dealYear": 2025, "dealMonth": month, "dealAmount": amount,
+        "excluUseAr": area, "buildYear": build_year, "floor": 3,
+    }
+
+
+ROWS = [
+    trade("11140", 1, 100000),
+    trade("11110", 1, 80000, area=59.0),
+    trade("11110", 1, 120000),
+    trade("11110", 2, 90000, build_year=1995),
+    {"sggCd": "11110", "dealYear": 2025, "dealMonth": 2, "dealAmount": None, "excluUseAr": 84.0},
+]
+
+
+def test_frame_skips_rows_without_price_or_area():
+    frame = TradeFrame.from_rows(ROWS)
+    assert len(frame) == 4
+    assert list(frame.region_labels) == ["11110", "11140"]
+
+
+def test_grouped_percentiles_match_numpy():
+    rng = np.random.default_rng(0)
+    values = rng.random(200)
+    groups = rng.integers(0, 5, 200)
+    out = trade_analytics.grouped_percentiles(values, groups, 5, (10, 50, 97.5))
+    for g in range(5):
+        np.testing.assert_allclose(out[:, g], np.percentile(values[groups == g], (10, 50, 97.5)))
+
+
+def test_group_stats_by_region_and_month():
+    groups = trade_analytics.group_stats(TradeFrame.from_rows(ROWS))
+    assert [(g["region"], g["month"], g["volume"]) for g in groups] == [
+        ("11110", 202501, 2), ("11110", 202502, 1), ("11140", 202501, 1),
+    ]
+    assert groups[0]["median_price"] == 100000.0
+    assert groups[0]["percentiles"] == {"p25": 90000.0, "p50": 100000.0, "p75": 110000.0}
+
+
+def test_trend_compares_previous_month_in_same_region():
+    trend = trade_analytics.monthly_trend(TradeFrame.from_rows(ROWS))
+    assert [t["change_pct"] for t in trend] == [None, -10.0, None]
+
+
+def test_fractional_percentile_labels_do_not_collide():
+    summary = trade_analytics.summarize(ROWS, percentiles=[99, 99.5])
+    assert list(summary["overall"]["percentiles"]) == ["p50", "p99", "p99.5"]
+
+
+@pytest.mark.parametrize("bad", [[], [101], [-1], ["50"], [True], "50"])
+def test_bad_percentiles_are_rejected(bad):
+    with pytest.raises(ValueError):
+        trade_analytics.summarize(ROWS, percentiles=bad)
+
+
+def test_statistics_tool_validates_before_fetching(monkeypatch):
+    monkeypatch.setattr(realestate, "_bulk_fetch", lambda *a: pytest.fail("fetched with bad percentiles"))
+    result = realestate._statistics(["11110"], "202501", "202501", "region", "apartment", [150], 100)
+    assert result["status"] == "error"
+    assert "percentiles" in result["message"]